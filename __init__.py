@@ -1,11 +0,0 @@
-from .backtest import *
-from .utils import *
-from .data import *
-from .dataloader import *
-from .plots import *
-from .portfolio_allocation import *
-from .stats import *
-from .models import *
-from .logger import *
-from .screener import *
-from .display import *
\ No newline at end of file
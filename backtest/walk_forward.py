@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from stats.price_stats import getPricestats
+from portfolio_allocation.allocator import optimal_weights
+from logger._logger import logger, get_exception_line_no
+
+logger_walk = logger.getLogger("walk_forward")
+
+
+def rebalance_points(dates:pd.DatetimeIndex, schedule:str="M", start:int=0) -> np.ndarray:
+    """
+    Row positions of the first trading day of every period of the schedule ("D", "W", "M", "Q" or "Y"),
+    from row ``start`` on.
+    """
+    periods = dates.to_period(schedule)
+    first = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    return first[first >= start]
+
+
+def walk_forward_backtest(prices:pd.DataFrame, opt_method:str, frequency:str="D", use_method:str="ledoit_wolf", cash:float=1e6,
+                          rebalance:str="M", train_window:int=252, cost:float=0.001, weights_fn=optimal_weights) -> dict:
+    """
+    Backtest an allocation method walking forward through daily prices.
+
+    On the first trading day of every rebalance period the weights are re-optimised on the trailing
+    ``train_window`` rows (resampled to ``frequency``, as for ``asset_allocation``), turned into whole shares
+    at that day's prices and traded, paying ``cost`` on the traded value. Between rebalances the holdings are
+    fixed, so the equity of each holding period is a single matrix-vector product over the price array.
+
+    :param prices: Daily prices, indexed by date with one column per asset. Dates with a missing price are dropped.
+    :type prices: pd.DataFrame
+
+    :param opt_method: The optimization method ("max_sharpe", "min_vol", "kelly", "HRP", or "EQ").
+    :type opt_method: str
+
+    :param frequency: The frequency the training data is resampled to (e.g., "W" for weekly).
+    :type frequency: str, optional
+
+    :param use_method: The method for calculating the covariance matrix (default: "ledoit_wolf").
+    :type use_method: str, optional
+
+    :param cash: The initial amount of cash.
+    :type cash: float, optional
+
+    :param rebalance: The rebalance schedule ("D", "W", "M", "Q" or "Y").
+    :type rebalance: str, optional
+
+    :param train_window: The number of trading days the weights are optimised on.
+    :type train_window: int, optional
+
+    :param cost: The transaction cost as a fraction of the traded value.
+    :type cost: float, optional
+
+    :param weights_fn: The weights function, with the signature of ``optimal_weights``.
+    :type weights_fn: callable, optional
+
+    :return: A dictionary with the daily 'equity' Series, the target 'weights' and the 'shares' held after every
+             rebalance (DataFrames indexed by rebalance date), the 'turnover' (traded value / equity) and 'costs'
+             Series per rebalance, and the 'stats' tuple of ``getPricestats`` on the equity curve. None if no
+             rebalance produced weights.
+    :rtype: dict
+    """
+    try:
+        prices = prices.dropna()
+        tickers = list(prices.columns)
+        values = prices.to_numpy(dtype=np.float64)
+        points = rebalance_points(prices.index, schedule=rebalance, start=train_window)
+        if len(points) == 0:
+            raise ValueError(f"not enough prices for a training window of {train_window} days")
+
+        equity = np.full(len(values), np.nan)
+        holdings, balance = np.zeros(len(tickers)), cash
+        weights_rows, shares_rows, turnover, costs = [], [], [], []
+
+        for number, row in enumerate(points):
+            price = values[row]
+            wealth = balance + holdings @ price
+
+            train = prices.iloc[row - train_window:row]
+            if frequency != "D":
+                train = train.resample(frequency).last().dropna()
+            weights, _ = weights_fn(train, opt_method=opt_method, frequency=frequency, use_method=use_method)
+
+            if weights is not None:
+                target_weights = np.array([weights.get(ticker, 0.0) for ticker in tickers], dtype=np.float64)
+
+                # budget net of the expected costs, then whole shares
+                expected_cost = cost * np.abs(target_weights * wealth - holdings * price).sum()
+                target = np.floor(target_weights * (wealth - expected_cost) / price)
+
+                traded = np.abs(target - holdings) @ price
+                balance = wealth - target @ price - cost * traded
+                holdings = target
+
+                weights_rows.append(target_weights)
+                turnover.append(traded / wealth)
+                costs.append(cost * traded)
+            else:
+                logger_walk.info(f"No weights on {prices.index[row].date()}, holdings kept, method = {opt_method}")
+                weights_rows.append(np.full(len(tickers), np.nan))
+                turnover.append(0.0)
+                costs.append(0.0)
+            shares_rows.append(holdings)
+
+            # holdings are fixed until the next rebalance
+            stop = points[number + 1] if number + 1 < len(points) else len(values)
+            equity[row:stop] = balance + values[row:stop] @ holdings
+
+        # a backtest that never traded is a failed optimisation, not a flat cash portfolio
+        if len(weights_rows) == 0 or np.isnan(np.array(weights_rows)).all():
+            raise ValueError(f"no rebalance produced weights, method = {opt_method}, estimator = {use_method}")
+
+        dates = prices.index[points]
+        curve = pd.Series(equity[points[0]:], index=pd.DatetimeIndex(prices.index[points[0]:], name="Date"), name="Equity")
+        resampled = curve.resample(frequency).last().dropna() if frequency != "D" else curve
+
+        return {'equity': curve,
+                'weights': pd.DataFrame(weights_rows, index=dates, columns=tickers),
+                'shares': pd.DataFrame(shares_rows, index=dates, columns=tickers),
+                'turnover': pd.Series(turnover, index=dates, name="Turnover"),
+                'costs': pd.Series(costs, index=dates, name="Costs"),
+                'stats': getPricestats(df=resampled.reset_index(), frequency=frequency, date_col="Date", price_col="Equity")}
+    except Exception as e:
+        logger_walk.info(f"problem {e} in walk_forward_backtest() at line no.={get_exception_line_no()}")
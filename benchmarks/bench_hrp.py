@@ -0,0 +1,56 @@
+"""
+HRP over a whole synthetic index: first allocation (building the cached linkage tree), allocations over
+random subsets pruned from it, and pypfopt's ``HRPOpt`` rebuilding the clustering of the same subsets.
+
+Run from the repository root:
+
+    >>> python -m benchmarks.bench_hrp --tickers 500 2000 --days 750 --subset 50 --repeat 5
+"""
+import time
+import argparse
+import numpy as np
+from pypfopt.hierarchical_portfolio import HRPOpt
+from benchmarks.synthetic import SyntheticMarket
+from portfolio_allocation.risk_model import RiskModelCache
+from portfolio_allocation.hrp import hrp_weights
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--days", type=int, default=750)
+    parser.add_argument("--subset", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random = np.random.default_rng(0)
+    for tickers in args.tickers:
+        prices = SyntheticMarket(tickers, args.days, gap_prob=0, missing_prob=0).wide_frame()
+        cache = RiskModelCache()
+
+        started = time.perf_counter()
+        hrp_weights(prices, cache=cache)
+        universe = time.perf_counter() - started
+
+        subsets = [list(random.choice(prices.columns, size=args.subset, replace=False)) for _ in range(args.repeat)]
+
+        started = time.perf_counter()
+        for subset in subsets:
+            hrp_weights(prices, tickers=subset, cache=cache)
+        pruned = (time.perf_counter() - started) / args.repeat
+
+        started = time.perf_counter()
+        for subset in subsets:
+            HRPOpt(prices[subset].pct_change().dropna()).optimize()
+        rebuilt = (time.perf_counter() - started) / args.repeat
+
+        started = time.perf_counter()
+        HRPOpt(prices.pct_change().dropna()).optimize()
+        full = time.perf_counter() - started
+
+        print(f"{tickers:5d} tickers  universe: {universe:7.3f}s (HRPOpt {full:7.3f}s)  "
+              f"subset of {args.subset}: pruned {pruned * 1000:7.1f}ms, HRPOpt {rebuilt * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
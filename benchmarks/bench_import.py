@@ -0,0 +1,84 @@
+"""
+Startup guard: import time of the modules ``main.py`` imports before its first prompt, measured with
+``python -X importtime`` in a fresh interpreter. Fails (exit code 1) if a heavy dependency that should only
+load on first use is imported at startup, or if the startup import time goes over the budget.
+
+Run from the repository root:
+
+    >>> python -m benchmarks.bench_import --budget 1.5 --top 10
+"""
+import os
+import re
+import ast
+import sys
+import argparse
+import tempfile
+import subprocess
+
+# dependencies only loaded by the features using them
+LAZY_MODULES = ["yfinance", "yahoo_fin", "pypfopt", "cvxpy", "scipy.stats", "scipy.optimize", "scipy.cluster", "sklearn"]
+
+
+def startup_modules(path:str="main.py") -> list:
+    """
+    The modules imported at the top level of a script.
+    """
+    with open(path) as file:
+        tree = ast.parse(file.read())
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_times(modules:list, repeat:int=3) -> dict:
+    """
+    Cumulative import time in seconds of every module imported with ``modules`` (best of ``repeat`` fresh runs).
+    """
+    best = {}
+    env = dict(os.environ, PYTHONPATH=os.getcwd(), ALPHA_TRACKER_LOG_PATH=os.path.join(tempfile.gettempdir(), "alpha_tracker_logs"))
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+                                capture_output=True, text=True, env=env)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+        times = {}
+        for line in result.stderr.splitlines():
+            found = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+            if found:
+                times[found.group(3)] = int(found.group(1)) / 1e6
+        best = {module: min(seconds, best.get(module, seconds)) for module, seconds in times.items()}
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", default="main.py")
+    parser.add_argument("--budget", type=float, default=1.5, help="maximum startup import time in seconds")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    modules = startup_modules(args.script)
+    times = import_times(modules)
+    total = sum(times.get(module, 0.0) for module in modules)
+
+    print(f"startup imports of {args.script}: {', '.join(modules)}")
+    for module, seconds in sorted(times.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{seconds:8.3f}s  {module}")
+
+    eager = [module for module in LAZY_MODULES if module in times]
+    print(f"total {total:.3f}s (budget {args.budget:.3f}s)")
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+    if total > args.budget:
+        print("FAIL: over the startup budget")
+    return 1 if eager or total > args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
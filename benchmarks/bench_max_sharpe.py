@@ -0,0 +1,60 @@
+"""
+Convex max-Sharpe solve against the previous ``nonconvex_objective`` (SLSQP) path, by basket size, with
+the unconstrained (long-short) closed form tangency portfolio for reference.
+
+Run from the repository root:
+
+    >>> python -m benchmarks.bench_max_sharpe --assets 10 50 200 --days 750
+"""
+import time
+import argparse
+from pypfopt import EfficientFrontier, objective_functions
+from pypfopt.base_optimizer import portfolio_performance
+from benchmarks.synthetic import SyntheticMarket
+from portfolio_allocation.risk_model import RiskModelCache
+from portfolio_allocation.frontier import max_sharpe_weights
+
+
+def nonconvex(mu, cov) -> dict:
+    """
+    The max_sharpe branch of ``optimal_weights`` before the convex reformulation.
+    """
+    ef = EfficientFrontier(mu, cov)
+    return ef.nonconvex_objective(objective_functions.sharpe_ratio, objective_args=(ef.expected_returns, ef.cov_matrix),
+                                  weights_sum_to_one=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--days", type=int, default=750)
+    parser.add_argument("--use-method", default="sample_cov")
+    args = parser.parse_args()
+
+    market = SyntheticMarket(max(args.assets), args.days, gap_prob=0, missing_prob=0)
+    prices = market.wide_frame().dropna()
+
+    print(f"{'assets':>6}  {'nonconvex':>10}  {'sharpe':>7}  {'convex':>10}  {'sharpe':>7}  {'long-short':>10}  {'sharpe':>7}")
+    for assets in args.assets:
+        df = prices.iloc[:, :assets]
+        cache = RiskModelCache()
+        mu, cov = cache.expected_returns(df, frequency="D"), cache.covariance(df, use_method=args.use_method)
+
+        row = [f"{assets:6d}"]
+        for solve in (lambda: nonconvex(mu, cov),
+                      lambda: max_sharpe_weights(df, frequency="D", mu=mu, cov=cov),
+                      lambda: max_sharpe_weights(df, frequency="D", weight_bounds=None, mu=mu, cov=cov)):
+            started = time.perf_counter()
+            try:
+                weights = solve()
+            except ValueError:
+                row.append(f"{'-':>10}  {'-':>7}")
+                continue
+            elapsed = time.perf_counter() - started
+            sharpe = portfolio_performance(weights, mu, cov)[2]
+            row.append(f"{elapsed:9.3f}s  {sharpe:7.3f}")
+        print("  ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Scaling benchmark of the index-wide stats across worker processes.
+
+Run from the repository root:
+
+    >>> python -m benchmarks.bench_parallel --tickers 2000 --days 750 --workers 1 2 4 8
+"""
+import time
+import argparse
+from benchmarks.synthetic import SyntheticMarket
+from stats.parallel import parallel_cross_sectional_stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=750)
+    parser.add_argument("--frequency", default="D")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    market = SyntheticMarket(args.tickers, args.days)
+    daily = market.wide_frame()
+    baseline = market.prices("^NSEI")['Adj Close']
+    prices = daily.resample(args.frequency).last().dropna(how="all")
+
+    print(f"universe: {args.tickers} tickers x {args.days} days, frequency = {args.frequency}")
+    baseline_time = None
+    for workers in args.workers:
+        started = time.perf_counter()
+        parallel_cross_sectional_stats(prices, frequency=args.frequency, daily_prices=daily, baseline=baseline, workers=workers)
+        elapsed = time.perf_counter() - started
+        baseline_time = baseline_time or elapsed
+        print(f"workers = {workers:2d}  {elapsed:8.3f}s  speedup = {baseline_time / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
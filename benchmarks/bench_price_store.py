@@ -0,0 +1,58 @@
+"""
+Benchmark of the Parquet price store against the date-stamped ALLDATA CSV cache.
+
+Run from the repository root:
+
+    >>> python -m benchmarks.bench_price_store --tickers 2000 --days 750
+"""
+import os
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticMarket
+from dataloader.price_store import PriceStore
+
+
+def dir_size(path:str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def timed(fn) -> tuple:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=750)
+    args = parser.parse_args()
+
+    market = SyntheticMarket(args.tickers, args.days)
+    data = market.long_frame()
+    subset = market.tickers[::max(1, args.tickers // 10)]
+
+    with tempfile.TemporaryDirectory() as root:
+        csv_path = os.path.join(root, "ALLDATABENCH.csv")
+        store = PriceStore(index="BENCH", root=root)
+
+        csv_write, _ = timed(lambda: data.to_csv(csv_path))
+        store_write, _ = timed(lambda: store.write(data))
+        csv_read, _ = timed(lambda: pd.read_csv(csv_path, index_col=0, parse_dates=True))
+        store_read, _ = timed(lambda: store.read())
+        csv_subset, _ = timed(lambda: (lambda df: df[df['TIC'].isin(subset)])(pd.read_csv(csv_path, index_col=0, parse_dates=True)))
+        store_subset, _ = timed(lambda: store.read(tickers=subset))
+
+        print(f"universe: {args.tickers} tickers x {args.days} days = {len(data)} rows, subset = {len(subset)} tickers")
+        print(f"{'':14s}{'CSV':>12s}{'Parquet':>12s}")
+        print(f"{'size (MB)':14s}{os.path.getsize(csv_path) / 1e6:12.1f}{dir_size(store._path) / 1e6:12.1f}")
+        print(f"{'write (s)':14s}{csv_write:12.2f}{store_write:12.2f}")
+        print(f"{'read all (s)':14s}{csv_read:12.2f}{store_read:12.2f}")
+        print(f"{'read subset':14s}{csv_subset:12.2f}{store_subset:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Load test of the HTTP API on a synthetic index: a cold burst of identical requests (coalesced into one
+computation), then keep-alive clients hammering the warm endpoints.
+
+Run from the repository root:
+
+    >>> python -m benchmarks.bench_server --tickers 500 --days 750 --clients 32 --duration 10
+"""
+import os
+import time
+import asyncio
+import tempfile
+import argparse
+from urllib.parse import quote
+from benchmarks.synthetic import SyntheticMarket
+from screener.investor import MarketScreener
+from screener.session_cache import SessionCache
+from server import ScreenerService
+
+
+async def get(reader:asyncio.StreamReader, writer:asyncio.StreamWriter, target:str) -> int:
+    """
+    One keep-alive GET; returns the status.
+    """
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port:int, targets:list, stop:float, counts:dict) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    number = 0
+    while time.perf_counter() < stop:
+        status = await get(reader, writer, targets[number % len(targets)])
+        counts[status] = counts.get(status, 0) + 1
+        number += 1
+    writer.close()
+
+
+async def burst(port:int, target:str, clients:int) -> list:
+    async def once() -> int:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        status = await get(reader, writer, target)
+        writer.close()
+        return status
+    return await asyncio.gather(*(once() for _ in range(clients)))
+
+
+async def main(args:argparse.Namespace) -> None:
+    market = SyntheticMarket(args.tickers, args.days)
+    tickers = ",".join(market.tickers[:5])
+
+    service = ScreenerService(lookback=args.days, loader=lambda index, lookback: _load(market, index, lookback))
+    server = await service.serve("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    started = time.perf_counter()
+    statuses = await burst(port, f"/all-stats?index=NIFTY_50&frequency={args.frequency}", args.clients)
+    print(f"cold burst: {len(statuses)} identical /all-stats requests ({statuses.count(200)} OK) -> {service.computations} computations "
+          f"(load + stats) in {time.perf_counter() - started:.2f}s")
+
+    targets = [f"/baseline?index=NIFTY_50&frequency={args.frequency}",
+               f"/all-stats?index=NIFTY_50&frequency={args.frequency}",
+               f"/screen?index=NIFTY_50&frequency={args.frequency}&filter={quote('AV < 40 AND SR > 0 top 20 by SR')}",
+               f"/corr?index=NIFTY_50&frequency={args.frequency}&tickers={tickers}",
+               f"/allocate?index=NIFTY_50&frequency={args.frequency}&cash=100000&method=min_vol&estimator=sample_cov&tickers={tickers}"]
+
+    for target in targets:
+        counts, computations = {}, service.computations
+        stop = time.perf_counter() + args.duration / len(targets)
+        await asyncio.gather(*(client(port, [target], stop, counts) for _ in range(args.clients)))
+        total = sum(counts.values())
+        print(f"{target.split('?')[0]:11s} {total / (args.duration / len(targets)):9.1f} req/s  statuses = {counts}  "
+              f"computations = {service.computations - computations}")
+
+    server.close()
+    await server.wait_closed()
+
+
+def _load(market:SyntheticMarket, index:str, lookback:int) -> MarketScreener:
+    investor = MarketScreener(index, lookback=lookback, cache=SessionCache(), fetch_fn=market, tickers=market.tickers)
+    investor._select_index()
+    return investor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=750)
+    parser.add_argument("--frequency", default="W")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    # the screener writes to ./data, keep the synthetic prices out of the working tree
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            asyncio.run(main(args))
+        finally:
+            os.chdir(cwd)
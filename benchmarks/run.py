@@ -0,0 +1,151 @@
+"""
+Benchmark suite of the screener pipeline on a synthetic market, fully offline.
+
+Every scenario is timed (best wall time of ``--repeat`` runs) and then run once more under tracemalloc for its
+peak memory. Results can be saved and later compared against, failing when a scenario got slower:
+
+    >>> python -m benchmarks.run --tickers 500 --days 750 --save baseline.json
+    >>> python -m benchmarks.run --tickers 500 --days 750 --compare baseline.json --tolerance 1.5
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from contextlib import redirect_stdout
+from rich.console import Console
+from benchmarks.synthetic import SyntheticMarket
+from dataloader.data_loader import Dataloader
+from screener.investor import MarketScreener
+from display.display import displayDf
+from display.pager import TablePager
+from utils.utils import filter_database
+
+
+def measure(fn, repeat:int=3) -> dict:
+    """
+    Best wall time of ``repeat`` runs of ``fn`` and the peak memory of one extra traced run.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_mb': peak / 1024 ** 2}
+
+
+def scenarios(market:SyntheticMarket, lookback:int, frequency:str, basket:int) -> dict:
+    """
+    The timed scenarios, in pipeline order. Each is a no-argument callable.
+    """
+    index = "NSE/BSE"
+    start, end = market.dates[0], market.dates[-1] + market.dates.freq
+
+    def load_data():
+        # cold start: the price store is emptied first so the whole universe is "downloaded"
+        loader = Dataloader(index=index, start_date=start, end_date=end, fetch_fn=market, tickers=market.tickers)
+        loader._store.write(market.long_frame(market.tickers[:1]))
+        loader.load_baseline()
+        loader.load_all_index_tickers()
+        loader.load_data()
+
+    load_data()
+    screener = MarketScreener(index, lookback=lookback, fetch_fn=market, tickers=market.tickers)
+    screener._select_index()
+
+    def index_stocks_stats():
+        # drop the memoized matrices and tables so every run recomputes them
+        screener._daily_prices, screener._resampled, screener._stats = {}, {}, {}
+        screener._index_stocks_stats(frequency)
+
+    index_stocks_stats()
+    visual_data, filter_data = screener.getAllDetails(frequency)
+    # the longest listed tickers, so the allocation and correlation baskets have full histories
+    periods = [column for column in filter_data.columns if column.startswith("Period (")][0]
+    stocks = list(filter_data.sort_values(periods, ascending=False).index[:basket])
+
+    def display_df():
+        with redirect_stdout(io.StringIO()):
+            displayDf(visual_data)
+
+    def display_page():
+        # what an interactive terminal shows first: one sorted page
+        pager = TablePager(visual_data, page_size=25, console=Console(file=io.StringIO()))
+        pager.sort('Sharpe Ratio', ascending=False)
+        pager.show()
+
+    return {'load_data': load_data,
+            '_index_stocks_stats': index_stocks_stats,
+            'filter_database': lambda: filter_database(filter_data, "AR > 0 AND (SR >= 0.5 OR BETA < 1) top 50 by SR", frequency),
+            'asset_allocation': lambda: screener.assetAllocation(cash=1e6, opt_method="max_sharpe", use_method="sample_cov",
+                                                                 frequency=frequency, value_col="Adj Close", stock_list=stocks),
+            'correlation_matrix': lambda: screener.correlation_matrix(stocks, frequency=frequency, value_col="Adj Close"),
+            'displayDf': display_df,
+            'displayDf_page': display_page}
+
+
+def compare(results:dict, baseline:dict, tolerance:float) -> list:
+    """
+    The scenarios whose wall time exceeds ``tolerance`` times the saved one.
+    """
+    return [name for name, result in results.items() if name in baseline and result['seconds'] > tolerance * baseline[name]['seconds']]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=750, help="business days of synthetic history")
+    parser.add_argument("--frequency", default="M")
+    parser.add_argument("--basket", type=int, default=20, help="tickers used by the allocation and correlation scenarios")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="run only these scenarios")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor before --compare fails")
+    args = parser.parse_args()
+
+    market = SyntheticMarket(args.tickers, args.days)
+    lookback = (market.dates[-1] - market.dates[0]).days
+    save = os.path.abspath(args.save) if args.save else None
+    baseline = json.load(open(args.compare)) if args.compare else {}
+
+    # the screener writes to ./data, keep it out of the working tree
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            results = {}
+            print(f"universe: {args.tickers} tickers x {args.days} days, frequency = {args.frequency}")
+            for name, fn in scenarios(market, lookback, args.frequency, args.basket).items():
+                if args.only and name not in args.only:
+                    continue
+                results[name] = measure(fn, repeat=args.repeat)
+                saved = f"  (saved {baseline[name]['seconds']:.3f}s)" if name in baseline else ""
+                print(f"{name:22s} {results[name]['seconds']:9.3f}s {results[name]['peak_mb']:9.1f} MB{saved}")
+        finally:
+            os.chdir(cwd)
+
+    if save:
+        with open(save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"regressions (> {args.tolerance}x): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Deterministic synthetic OHLCV market used by the benchmarks in place of Yahoo Finance.
+
+A ``SyntheticMarket`` is a callable with the ``fetch_fn(tickers, start_date, end_date)`` signature expected by
+``Dataloader`` / ``BatchDownloader``, so it can be injected anywhere a live download would happen:
+
+    >>> market = SyntheticMarket(tickers=500, days=750)
+    >>> screener = MarketScreener("NSE/BSE", lookback=1000, fetch_fn=market, tickers=market.tickers)
+"""
+import os
+import time
+import zlib
+import tempfile
+import numpy as np
+import pandas as pd
+
+# benchmark runs log to a temporary directory, set before the first import of the logger
+os.environ.setdefault("ALPHA_TRACKER_LOG_PATH", os.path.join(tempfile.gettempdir(), "alpha_tracker_logs"))
+
+from dataloader.downloader import PRICE_COLUMNS
+
+
+class SyntheticMarket:
+
+    def __init__(self, tickers=500, days:int=750, end_date=None, gap_prob:float=0.1, missing_prob:float=0.01,
+                 latency:float=0.0, fail_every:int=0, seed:int=0) -> None:
+        """
+        Initialize a SyntheticMarket instance.
+
+        Every ticker gets a geometric random walk over a business-day calendar ending at ``end_date``, seeded by
+        the ticker name so the same ticker always gets the same prices whatever subset or window is requested.
+
+        :param tickers: The number of tickers (named T0.NS, T1.NS, ...) or the ticker names.
+        :type tickers: int | list, optional
+
+        :param days: The number of business days in the calendar.
+        :type days: int, optional
+
+        :param end_date: The last day of the calendar (default: today).
+        :type end_date: str | datetime, optional
+
+        :param gap_prob: The probability that a ticker starts trading late (listed part-way through the calendar).
+        :type gap_prob: float, optional
+
+        :param missing_prob: The probability that any single bar of a ticker is missing.
+        :type missing_prob: float, optional
+
+        :param latency: Seconds slept on every fetch, to mimic a remote provider.
+        :type latency: float, optional
+
+        :param fail_every: Raise on the first fetch of a request holding one of every n tickers (0 disables failures).
+        :type fail_every: int, optional
+
+        :param seed: The seed of the whole market.
+        :type seed: int, optional
+
+        :return: None
+        """
+        self.tickers = list(tickers) if not isinstance(tickers, int) else [f"T{i}.NS" for i in range(tickers)]
+        self.dates = pd.bdate_range(end=pd.Timestamp(end_date or pd.Timestamp.today()).normalize(), periods=days, name="Date")
+        self._gap_prob = gap_prob
+        self._missing_prob = missing_prob
+        self._latency = latency
+        self._fail_every = fail_every
+        self._seed = seed
+        self._cache = {}
+        self._failed = set()
+
+
+    def prices(self, ticker:str) -> pd.DataFrame:
+        """
+        The full OHLCV history of a ticker.
+        """
+        if ticker not in self._cache:
+            rng = np.random.default_rng([self._seed, zlib.crc32(ticker.encode())])
+            days = len(self.dates)
+
+            close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, days)))
+            spread = np.abs(rng.normal(0, 0.01, days))
+            data = pd.DataFrame({'Open': close * (1 + rng.normal(0, 0.005, days)), 'High': close * (1 + spread), 'Low': close * (1 - spread),
+                                 'Close': close, 'Adj Close': close, 'Volume': rng.integers(1e4, 1e7, days)}, index=self.dates)[PRICE_COLUMNS]
+
+            keep = rng.random(days) >= self._missing_prob
+            if not ticker.startswith("^") and rng.random() < self._gap_prob:
+                keep[:rng.integers(1, days // 2)] = False
+            self._cache[ticker] = data[keep]
+
+        return self._cache[ticker]
+
+
+    def __call__(self, tickers:list, start_date, end_date) -> dict:
+        """
+        Fetch function: the prices of ``tickers`` over [start_date, end_date).
+        """
+        if self._latency:
+            time.sleep(self._latency)
+
+        # a transient error fails the whole request, as a dropped connection would
+        failing = {ticker for ticker in tickers if self._fail_every and zlib.crc32(ticker.encode()) % self._fail_every == 0} - self._failed
+        if len(failing) > 0:
+            self._failed.update(failing)
+            raise ConnectionError(f"synthetic failure fetching {sorted(failing)}")
+
+        frames = {}
+        for ticker in tickers:
+            data = self.prices(ticker)
+            frames[ticker] = data[(data.index >= pd.Timestamp(start_date).normalize()) & (data.index < pd.Timestamp(end_date))]
+
+        return frames
+
+
+    def long_frame(self, tickers:list=None) -> pd.DataFrame:
+        """
+        The prices of all (or the given) tickers in the long layout of ``Dataloader.getAllindexdata``.
+        """
+        return pd.concat([self.prices(ticker).assign(TIC=ticker) for ticker in (tickers or self.tickers)])
+
+
+    def wide_frame(self, value_col:str="Adj Close", tickers:list=None) -> pd.DataFrame:
+        """
+        The ``value_col`` of all (or the given) tickers as a dates x tickers matrix.
+        """
+        return pd.DataFrame({ticker: self.prices(ticker)[value_col] for ticker in (tickers or self.tickers)}).reindex(self.dates)
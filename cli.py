@@ -0,0 +1,209 @@
+"""
+Headless AlphaTracker: run a screener command on one or more indexes without prompts and write the results to files.
+
+Every index is screened in its own process, so a nightly job can cover all the indexes at once:
+
+    >>> python cli.py screen --index all --lookback 365 --frequency W --filter "AV < 30 AND SR > 1" --output results
+    >>> python cli.py all-stats --index NIFTY_50 SP500 --frequency M
+    >>> python cli.py allocate --index NIFTY_50 --method min_vol --estimator sample_cov --cash 100000 --tickers TCS.NS INFY.NS
+    >>> python cli.py single --index SP500 --ticker AAPL
+    >>> python cli.py corr --index NIFTY_50 --tickers TCS.NS INFY.NS WIPRO.NS
+    >>> python cli.py trending --index NIFTY_50 --metric beta --window 60 --periods 60
+    >>> python cli.py regression --index NIFTY_50 --frequency W
+    >>> python cli.py backtest --index NIFTY_50 --method min_vol --cash 100000 --rebalance M --tickers TCS.NS INFY.NS WIPRO.NS
+    >>> python cli.py sweep --index NIFTY_50 --frequency W --lookbacks 52 104 --tickers TCS.NS INFY.NS WIPRO.NS
+
+The exit code is 1 if any index failed.
+"""
+import os
+import sys
+import datetime
+import argparse
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from logger._logger import logger, get_exception_line_no
+from screener.investor import MarketScreener
+from screener.session_cache import session_cache
+from utils.global_variables import INDEXES, CURRENCIES
+
+logger_cli = logger.getLogger("cli")
+
+# rolling metrics of the trending command and the column of MarketScreener.rolling_analytics they refer to
+ROLLING_METRICS = {'volatility': 'Annual Volatility', 'sharpe': 'Sharpe Ratio', 'drawdown': 'Maximum Drawdown', 'beta': 'Beta'}
+
+
+def run_command(command:str, investor:MarketScreener, options:dict) -> pd.DataFrame:
+    """
+    The result of a command on a loaded screener.
+    """
+    frequency = options['frequency']
+    if command == "baseline":
+        return investor.get_baseline_stats(frequency)
+    elif command == "all-stats":
+        return investor.getAllDetails(frequency)[0]
+    elif command == "screen":
+        return investor.filterDatabase(options['filter'], frequency)
+    elif command == "allocate":
+        if options['method'] == "HRP" and not options['tickers']:
+            return investor.hrpAllocation(cash=options['cash'], frequency=frequency, value_col="Adj Close")
+        return investor.assetAllocation(cash=options['cash'], opt_method=options['method'], use_method=options['estimator'],
+                                        frequency=frequency, value_col="Adj Close", stock_list=options['tickers'])
+    elif command == "single":
+        return investor.individual_details(options['ticker'], frequency=frequency)
+    elif command == "corr":
+        return investor.correlation_matrix(stock_list=options['tickers'], frequency=frequency, value_col="Adj Close")
+    elif command == "trending":
+        return investor.trending_stocks(ROLLING_METRICS[options['metric']], frequency=frequency, window=options['window'],
+                                        lookback=options['periods'], falling=options['falling'])
+    elif command == "regression":
+        return investor.baseline_regression(frequency)
+    elif command == "backtest":
+        return investor.backtestAllocation(cash=options['cash'], opt_method=options['method'], use_method=options['estimator'], frequency=frequency,
+                                           value_col="Adj Close", stock_list=options['tickers'], rebalance=options['rebalance'],
+                                           train_window=options['train_window'], cost=options['cost'])[0]
+    elif command == "sweep":
+        return investor.allocationSweep(frequency=frequency, value_col="Adj Close", stock_list=options['tickers'], lookbacks=options['lookbacks'] or None,
+                                        workers=options['sweep_workers'])
+    raise ValueError(f"unknown command {command}")
+
+
+def write_result(df:pd.DataFrame, command:str, index:str, output:str, file_format:str="csv") -> str:
+    """
+    Write a result to ``<output>/<index>_<command>_<date>.<format>`` and return the path.
+    """
+    os.makedirs(output, exist_ok=True)
+    path = os.path.join(output, f"{''.join(index.split('/'))}_{command}_{datetime.datetime.now().date().strftime('%d%b%Y')}.{file_format}")
+    if file_format == "json":
+        df.reset_index().to_json(path, orient="records", indent=2, date_format="iso")
+    else:
+        df.to_csv(path)
+    return path
+
+
+def run_index(command:str, index:str, options:dict) -> str:
+    """
+    Load an index, run a command on it and write the result. Returns the path of the file written.
+
+    :param command: The subcommand (baseline, all-stats, screen, allocate, single, corr, trending, regression, backtest or sweep).
+    :type command: str
+
+    :param index: The index to screen.
+    :type index: str
+
+    :param options: The parsed command line options.
+    :type options: dict
+
+    :return: The path of the result file.
+    :rtype: str
+    """
+    investor = MarketScreener(indexes=index, lookback=options['lookback'], currency=CURRENCIES.get(index, '₹'), cache=session_cache,
+                              workers=options['stats_workers'])
+    investor._select_index()
+
+    df = run_command(command, investor, options)
+    if df is None:
+        raise ValueError(f"{command} returned no result, see the logs")
+    return write_result(df, command, index, output=options['output'], file_format=options['format'])
+
+
+def parse_args(argv:list=None) -> argparse.Namespace:
+    """
+    Parse the command line.
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--index", nargs="+", default=["NIFTY_50"], choices=INDEXES + ["all"], help="indexes to run on, or all")
+    common.add_argument("--lookback", type=int, default=365, help="lookback period in days")
+    common.add_argument("--frequency", default="D", choices=["D", "W", "M", "Q", "Y"])
+    common.add_argument("--output", default=os.path.join("data", "results"), help="directory of the result files")
+    common.add_argument("--format", default="csv", choices=["csv", "json"])
+    common.add_argument("--workers", type=int, default=None, help="indexes run in parallel (default: one process per index)")
+    common.add_argument("--stats-workers", type=int, default=1, help="processes per index for the index-wide stats")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("baseline", parents=[common], help="performance of the index itself")
+    commands.add_parser("all-stats", parents=[common], help="performance of every stock of the index")
+
+    screen = commands.add_parser("screen", parents=[common], help="screen the stocks of the index")
+    screen.add_argument("--filter", required=True, help='screening criteria, e.g. "AV < 30 AND SR > 1 top 20 by SR"')
+
+    allocate = commands.add_parser("allocate", parents=[common], help="allocate cash over a basket")
+    allocate.add_argument("--cash", type=float, required=True)
+    allocate.add_argument("--method", default="max_sharpe", choices=["max_sharpe", "min_vol", "kelly", "HRP", "EQ"])
+    allocate.add_argument("--estimator", default="ledoit_wolf", choices=["ledoit_wolf", "semicovariance", "sample_cov", "exp_cov"])
+    allocate.add_argument("--tickers", nargs="*", default=[], help="the basket (HRP without tickers allocates over the whole index)")
+
+    single = commands.add_parser("single", parents=[common], help="performance of a single stock")
+    single.add_argument("--ticker", required=True)
+
+    corr = commands.add_parser("corr", parents=[common], help="correlation matrix of a basket")
+    corr.add_argument("--tickers", nargs="+", required=True)
+
+    trending = commands.add_parser("trending", parents=[common], help="stocks whose rolling metric rose (or fell) the most")
+    trending.add_argument("--metric", default="beta", choices=list(ROLLING_METRICS))
+    trending.add_argument("--window", type=int, default=60, help="periods in the rolling window")
+    trending.add_argument("--periods", type=int, default=20, help="periods the metric is compared over")
+    trending.add_argument("--falling", action="store_true", help="stocks whose metric fell instead")
+
+    commands.add_parser("regression", parents=[common], help="beta, alpha, R-squared and tracking error of every stock against the index")
+
+    backtest = commands.add_parser("backtest", parents=[common], help="walk forward backtest of an allocation method over a basket")
+    backtest.add_argument("--cash", type=float, required=True)
+    backtest.add_argument("--method", default="max_sharpe", choices=["max_sharpe", "min_vol", "kelly", "HRP", "EQ"])
+    backtest.add_argument("--estimator", default="ledoit_wolf", choices=["ledoit_wolf", "semicovariance", "sample_cov", "exp_cov"])
+    backtest.add_argument("--tickers", nargs="+", required=True)
+    backtest.add_argument("--rebalance", default="M", choices=["D", "W", "M", "Q", "Y"], help="rebalance schedule")
+    backtest.add_argument("--train-window", type=int, default=252, help="trading days the weights are optimised on")
+    backtest.add_argument("--cost", type=float, default=0.001, help="transaction cost as a fraction of the traded value")
+
+    sweep = commands.add_parser("sweep", parents=[common], help="compare every allocation method and covariance estimator on a basket")
+    sweep.add_argument("--tickers", nargs="+", required=True)
+    sweep.add_argument("--lookbacks", type=int, nargs="*", default=[], help="most recent periods to compare (default: the whole lookback)")
+    sweep.add_argument("--sweep-workers", type=int, default=None, help="processes of the sweep (default: one per CPU)")
+
+    args = parser.parse_args(argv)
+    args.index = INDEXES if "all" in args.index else list(dict.fromkeys(args.index))
+    if hasattr(args, 'tickers'):
+        args.tickers = [ticker.upper() for ticker in args.tickers]
+    if hasattr(args, 'ticker'):
+        args.ticker = args.ticker.upper()
+    return args
+
+
+def report(runs) -> list:
+    """
+    Print the file written (or the error) of every (index, result function) pair as it completes; returns the failed indexes.
+    """
+    failed = []
+    for index, result in runs:
+        try:
+            print(f"{index}: {result()}", flush=True)
+        except Exception as e:
+            logger_cli.info(f"problem {e} in report() at line no.={get_exception_line_no()}, index = {index}")
+            print(f"{index}: failed ({e})", file=sys.stderr, flush=True)
+            failed.append(index)
+    return failed
+
+
+def main(argv:list=None) -> int:
+    """
+    Run a command on every requested index, one process per index, and report the files written.
+    """
+    args = parse_args(argv)
+    options = vars(args)
+    workers = min(args.workers or len(args.index), len(args.index))
+
+    if workers <= 1:
+        failed = report((index, lambda index=index: run_index(args.command, index, options)) for index in args.index)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_index, args.command, index, options): index for index in args.index}
+            failed = report((futures[future], future.result) for future in as_completed(futures))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,14 @@
-import datetime
 import warnings
 warnings.filterwarnings("ignore")
 warnings.filterwarnings("ignore", category=DeprecationWarning) 
 
-import os
-import glob
 import pandas as pd
-import yfinance as yf
 import logging as log
 
-from yahoo_fin import stock_info as sf
+from dataloader.price_store import PriceStore
+from dataloader.price_panel import PricePanel
+from dataloader.updater import IncrementalUpdater
+from dataloader.downloader import BatchDownloader, yahoo_fetch
 from utils.utils import check_market, make_ticker_nse_bse, make_ticker_nse
 from logger._logger import logger, get_exception_line_no
 
@@ -19,7 +18,7 @@ logger_data = logger.getLogger("DataLoader")
 
 class Dataloader:
 
-    def __init__(self, index:str, start_date:str, end_date:str) -> None:
+    def __init__(self, index:str, start_date:str, end_date:str, fetch_fn=None, batch_size:int=50, max_workers:int=8, tickers:list=None) -> None:
         """
         Initialize a Dataloader instance.
 
@@ -35,11 +34,35 @@ class Dataloader:
         :param end_date: The end date for retrieving financial data.
         :type end_date: str
 
+        :param fetch_fn: Callable ``fetch_fn(tickers, start_date, end_date) -> {ticker: DataFrame}`` used to download
+                         the index constituents, the baseline and single instruments (default: Yahoo Finance).
+                         Injecting a local provider lets the loader run offline (e.g. in benchmarks).
+        :type fetch_fn: callable, optional
+
+        :param batch_size: The number of tickers fetched per batch.
+        :type batch_size: int, optional
+
+        :param max_workers: The maximum number of batches downloaded concurrently.
+        :type max_workers: int, optional
+
+        :param tickers: The constituents of the index, instead of looking them up (optional).
+        :type tickers: list, optional
+
         :return: None
         """
         self._index = index
         self._start_date = start_date
         self._end_date = end_date
+        self._failed_tickers = {}
+        self._fetch_fn = fetch_fn
+        self._given_tickers = tickers
+
+        # columnar on-disk cache of the index universe
+        self._store = PriceStore(index=self._index, root="data")
+
+        # concurrent downloader for the index constituents, refreshing the store incrementally
+        self._downloader = BatchDownloader(fetch_fn=fetch_fn or yahoo_fetch, batch_size=batch_size, max_workers=max_workers)
+        self._updater = IncrementalUpdater(store=self._store, downloader=self._downloader)
 
         # Index Name Dictionary
         self._index_dictionary = {'NIFTY_50':('^NSEI', 'sf.tickers_nifty50()'), 'NIFTY_BANK':('^NSEBANK', 'sf.tickers_niftybank()'),
@@ -77,6 +100,11 @@ class Dataloader:
             >>> data = load_single_instrument('AAPL')
         """
         try:
+            if self._fetch_fn is not None:
+                return self._fetch_fn([stock_name.upper()], self._start_date, self._end_date)[stock_name.upper()]
+
+            import yfinance as yf  # slow to import, only loaded when Yahoo Finance is used
+
             data = yf.download(stock_name.upper(), start=self._start_date, end=self._end_date, progress=False)
             return data
         except Exception as e:
@@ -100,10 +128,17 @@ class Dataloader:
                     is caught, and an error message is logged with details about the problem.
 
         Note:
-            This function uses the Yahoo Finance API (yfinance) to download historical stock price data
-            for multiple instruments, excluding 'MM.NS', which is checked for separately. The data is
-            concatenated into a single DataFrame named `self._all_data`, making it easy to work with
-            the combined data.
+            The instruments (excluding 'MM.NS', which is checked for separately) are fetched in batches
+            on a bounded thread pool by `BatchDownloader`, using the `fetch_fn` given to the constructor.
+            Batches whose fetch raises are retried with backoff. Tickers that still fail, or that come back
+            without data, are reported through `getFailedtickers()`.
+
+            The combined data is cached in a Parquet `PriceStore` partitioned by ticker. On later calls
+            the `IncrementalUpdater` only downloads the bars added since the last stored bar of every
+            ticker, appends them to the store and returns the data trimmed to the requested lookback.
+
+            In memory the data is held as a `PricePanel` (one float32 dates x tickers matrix per field),
+            available through `getPricepanel()`.
 
         Example:
             To load historical data for a list of equities within a specified date range and combine
@@ -112,19 +147,13 @@ class Dataloader:
             >>> load_data()
         """
         try:
-            self._all_data = pd.DataFrame()
+            self._panel = PricePanel(dates=pd.DatetimeIndex([]), tickers=[], fields={})
 
-            if len(glob.glob(os.path.join("data", f"ALLDATA{''.join(self._index.split('/'))}_{datetime.datetime.now().date().strftime('%d%b%Y')}.csv"))) > 0:
-                self._all_data = pd.read_csv(f"data/ALLDATA{''.join(self._index.split('/'))}_{datetime.datetime.now().date().strftime('%d%b%Y')}.csv", index_col=0, parse_dates=True)[['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume', 'TIC']]
-            else:
-                for equity in self._tickers:
-                    if equity != "MM.NS":
-                        data = yf.download(equity, start=self._start_date, end=self._end_date, progress=False).dropna()
-                        data['TIC'] = equity
-                        self._all_data = pd.concat([self._all_data, data])
-                        logger.info(f"Equity Downloading = {equity}, len = {len(self._all_data)}")
-                # save the all data 
-                self.save_file()
+            # only the bars missing from the price store are downloaded
+            equities = [equity for equity in self._tickers if equity != "MM.NS"]
+            self._panel = PricePanel.from_long(self._updater.refresh(equities, start_date=self._start_date, end_date=self._end_date))
+            self._failed_tickers = self._updater.getFailures()
+            logger_data.info(f"Equities Loaded = {len(self._panel.tickers)}, failed = {len(self._failed_tickers)}, size = {self._panel.memory_usage()} bytes")
         except Exception as e:
             logger_data.info(f"problem {e} in load_data() at line no.={get_exception_line_no()}")
 
@@ -142,7 +171,13 @@ class Dataloader:
         """
         try:
             # loading the baseline data
-            self._baseline = yf.download(tickers=self._index_dictionary[self.getIndex()][0], start=self._start_date, end=self._end_date, progress=False)
+            baseline_ticker = self._index_dictionary[self.getIndex()][0]
+            if self._fetch_fn is not None:
+                self._baseline = self._fetch_fn([baseline_ticker], self._start_date, self._end_date)[baseline_ticker]
+            else:
+                import yfinance as yf  # slow to import, only loaded when Yahoo Finance is used
+
+                self._baseline = yf.download(tickers=baseline_ticker, start=self._start_date, end=self._end_date, progress=False)
         except Exception as e:
             logger_data.info(f"problem {e} in load_baseline() at line no.={get_exception_line_no()}")
 
@@ -155,6 +190,8 @@ class Dataloader:
         It can obtain tickers in different ways based on the availability of data sources
         and market information.
 
+        If tickers were given to the constructor, those are used as they are.
+
         If a valid expression is provided for the index in the '_index_dictionary' and the
         market is checked to be valid using 'check_market', the method attempts to load
         tickers using the 'make_ticker_nse' function on the evaluated expression.
@@ -171,7 +208,12 @@ class Dataloader:
         """
         try:
             # load all tickers inside a given index
-            if eval(self._index_dictionary[self.getIndex()][1]) != None and check_market(self._index):
+            if self._given_tickers is None:
+                from yahoo_fin import stock_info as sf  # slow to import, only loaded to look the tickers up (used by the eval below)
+
+            if self._given_tickers is not None:
+                self._tickers = list(self._given_tickers)
+            elif eval(self._index_dictionary[self.getIndex()][1]) != None and check_market(self._index):
                 self._tickers = make_ticker_nse(eval(self._index_dictionary[self.getIndex()][1]))
             elif eval(self._index_dictionary[self.getIndex()][1]) == None and check_market(self._index):
                 self._tickers = make_ticker_nse_bse(pd.read_csv('datastore/NSE_BSE_LIST.csv'))
@@ -279,24 +321,68 @@ class Dataloader:
             logger_data.info(f"problem {e} in getAllindextickers() at line no.={get_exception_line_no()}")
 
 
+    def setData(self, baseline:pd.DataFrame, tickers:list, panel:PricePanel) -> None:
+        """
+        Set already loaded data (e.g. from a session cache) instead of loading it.
+
+        :param baseline: The baseline index data.
+        :type baseline: pd.DataFrame
+
+        :param tickers: The tickers of the index.
+        :type tickers: list
+
+        :param panel: The price panel of all tickers.
+        :type panel: PricePanel
+
+        :return: None
+        """
+        self._baseline = baseline
+        self._tickers = tickers
+        self._panel = panel
+
+
+    def getFailedtickers(self) -> dict:
+        """
+        Get the tickers that could not be downloaded by the last call to ``load_data``.
+
+        :return: A dictionary mapping each failed ticker to the reason of the failure.
+        :rtype: dict
+        """
+        return self._failed_tickers
+
+
     def getAllindexdata(self) -> pd.DataFrame:
         """
         Get all financial data associated with the object's financial index.
 
         This method retrieves and returns all financial data associated with the financial index
-        represented by the object. The data is returned as a Pandas DataFrame.
+        represented by the object. The data is returned as a Pandas DataFrame, built from the price panel
+        on every call; prefer `getPricepanel()` for repeated access.
 
         :return: A Pandas DataFrame containing all financial data for the financial index.
         :rtype: pd.DataFrame
         """
         try:
-            return self._all_data
+            return self._panel.to_long()
         except Exception as e:
             logger_data.info(f"problem {e} in getAllindexdata() at line no.={get_exception_line_no()}")
 
+
+    def getPricepanel(self) -> PricePanel:
+        """
+        Get the price panel of the object's financial index.
+
+        :return: The prices of all tickers as one dates x tickers matrix per field.
+        :rtype: PricePanel
+        """
+        try:
+            return self._panel
+        except Exception as e:
+            logger_data.info(f"problem {e} in getPricepanel() at line no.={get_exception_line_no()}")
+
     
     def save_file(self) -> None:
         """
-        Saves the all data file.
+        Saves the all data file to the Parquet price store.
         """
-        self._all_data.to_csv(f"data/ALLDATA{''.join(self._index.split('/'))}_{datetime.datetime.now().date().strftime('%d%b%Y')}.csv")
+        self._store.write(self._panel.to_long())
@@ -0,0 +1,157 @@
+import time
+import pandas as pd
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from logger._logger import logger, get_exception_line_no
+
+logger_download = logger.getLogger("Downloader")
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+
+def yahoo_fetch(tickers:list, start_date, end_date) -> dict:
+    """
+    Fetch daily price history for a batch of tickers from Yahoo Finance.
+
+    ``yf.download`` keeps its results in module level state and is not safe to call from several
+    threads at once, so each ticker is fetched through its own ``yf.Ticker`` instead.
+
+    :param tickers: The ticker symbols to fetch.
+    :type tickers: list
+
+    :param start_date: The start date of the history.
+    :type start_date: str | datetime
+
+    :param end_date: The end date of the history.
+    :type end_date: str | datetime
+
+    :return: A dictionary mapping each ticker to its price DataFrame (tickers without data or that raised are left out).
+    :rtype: dict
+    """
+    import yfinance as yf  # slow to import, only loaded when Yahoo Finance is used
+
+    frames = {}
+    for ticker in tickers:
+        # one delisted or bad symbol must not discard the rest of the batch
+        try:
+            data = yf.Ticker(ticker).history(start=start_date, end=end_date, auto_adjust=False, actions=False, raise_errors=True)
+            data.index = data.index.tz_localize(None)
+            data.index.name = "Date"
+            frames[ticker] = data[PRICE_COLUMNS]
+        except Exception as e:
+            logger_download.info(f"problem {e} in yahoo_fetch() at line no.={get_exception_line_no()}, ticker = {ticker}")
+
+    return frames
+
+
+class BatchDownloader:
+
+    def __init__(self, fetch_fn=yahoo_fetch, batch_size:int=50, max_workers:int=8, retries:int=3, backoff:float=1.0) -> None:
+        """
+        Initialize a BatchDownloader instance.
+
+        Tickers are split into batches of ``batch_size`` and the batches are fetched on a bounded thread pool.
+        A batch whose fetch raises is retried with exponential backoff before its tickers are reported as failed.
+        Tickers missing or empty in a successful fetch (delisted, or no new bar in the window) are reported as
+        having no data straight away, without retrying.
+
+        :param fetch_fn: Callable ``fetch_fn(tickers, start_date, end_date) -> {ticker: DataFrame}`` used to fetch a batch.
+        :type fetch_fn: callable, optional
+
+        :param batch_size: The number of tickers handed to ``fetch_fn`` at once.
+        :type batch_size: int, optional
+
+        :param max_workers: The maximum number of batches fetched concurrently.
+        :type max_workers: int, optional
+
+        :param retries: The number of times a batch whose fetch raised is retried.
+        :type retries: int, optional
+
+        :param backoff: The delay in seconds before the first retry, doubled on every further retry.
+        :type backoff: float, optional
+
+        :return: None
+        """
+        self._fetch_fn = fetch_fn
+        self._batch_size = max(1, batch_size)
+        self._max_workers = max(1, max_workers)
+        self._retries = retries
+        self._backoff = backoff
+        self._failures = {}
+
+
+    def _fetch_batch(self, batch:list, start_date, end_date) -> tuple:
+        """
+        Fetch one batch, retrying it while the fetch raises. Returns the frames and the failures of the batch.
+        """
+        frames, failures = {}, {}
+
+        for attempt in range(self._retries + 1):
+            if attempt > 0:
+                time.sleep(self._backoff * 2 ** (attempt - 1))
+
+            try:
+                result = self._fetch_fn(batch, start_date, end_date)
+            except Exception as e:
+                # transport level errors of fetch_fn fail the whole batch and are worth retrying
+                failures = {ticker: f"{type(e).__name__}: {e}" for ticker in batch}
+                continue
+
+            # an empty answer is an answer, asking again would only return it again
+            failures = {}
+            for ticker in batch:
+                data = result.get(ticker)
+                if data is None or data.dropna().empty:
+                    failures[ticker] = "no data returned"
+                else:
+                    frames[ticker] = data.dropna()
+            break
+
+        return frames, failures
+
+
+    def download(self, tickers:list, start_date, end_date) -> pd.DataFrame:
+        """
+        Download the price history of all tickers and combine it into a single long DataFrame.
+
+        :param tickers: The ticker symbols to download.
+        :type tickers: list
+
+        :param start_date: The start date of the history.
+        :type start_date: str | datetime
+
+        :param end_date: The end date of the history.
+        :type end_date: str | datetime
+
+        :return: A DataFrame indexed by date with the price columns and a 'TIC' column, in the order of ``tickers``.
+        :rtype: pd.DataFrame
+        """
+        try:
+            batches = [tickers[i:i + self._batch_size] for i in range(0, len(tickers), self._batch_size)]
+            frames, self._failures = {}, {}
+
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = [executor.submit(self._fetch_batch, batch, start_date, end_date) for batch in batches]
+                for future in as_completed(futures):
+                    batch_frames, batch_failures = future.result()
+                    frames.update(batch_frames)
+                    self._failures.update(batch_failures)
+                    logger_download.info(f"Batch Downloaded, ok = {len(batch_frames)}, failed = {len(batch_failures)}, total = {len(frames)}")
+
+            for ticker, reason in self._failures.items():
+                logger_download.info(f"Equity Download Failed = {ticker}, reason = {reason}")
+
+            # single concatenation at the end
+            ordered = [frames[ticker].assign(TIC=ticker) for ticker in tickers if ticker in frames]
+            if len(ordered) == 0:
+                return pd.DataFrame(columns=PRICE_COLUMNS + ['TIC'])
+            return pd.concat(ordered)
+        except Exception as e:
+            logger_download.info(f"problem {e} in download() at line no.={get_exception_line_no()}")
+
+
+    def getFailures(self) -> dict:
+        """
+        Get the tickers that could not be downloaded by the last call to ``download``, with the reason.
+        """
+        return self._failures
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+from dataloader.price_store import PRICE_DTYPES
+from logger._logger import logger, get_exception_line_no
+
+logger_panel = logger.getLogger("PricePanel")
+
+# fields held by a panel, in the order of the long price frames
+PANEL_FIELDS = list(PRICE_DTYPES)
+
+
+class PricePanel:
+
+    def __init__(self, dates:pd.DatetimeIndex, tickers:list, fields:dict) -> None:
+        """
+        Initialize a PricePanel instance.
+
+        A panel holds the prices of a whole index universe as one dates x tickers float32 matrix per field
+        (Open, High, Low, Close, Adj Close and Volume) sharing a single date index and a ticker -> column map,
+        instead of a long frame repeating the date and ticker on every row. The matrices are column-major, so
+        the history of a ticker is contiguous and ``column``/``frame`` hand out views without copying.
+
+        Volume is kept as float32 too; it is exact up to 2 ** 24 shares per bar and only approximate above.
+
+        :param dates: The sorted dates of the universe.
+        :type dates: pd.DatetimeIndex
+
+        :param tickers: The tickers of the universe, one per matrix column.
+        :type tickers: list
+
+        :param fields: A dictionary mapping each field to its (dates x tickers) matrix, NaN where there is no bar.
+        :type fields: dict
+
+        :return: None
+        """
+        self.dates = pd.DatetimeIndex(dates, name="Date")
+        self.tickers = list(tickers)
+        self._columns = {ticker: position for position, ticker in enumerate(self.tickers)}
+        self._fields = {field: values if values.dtype == np.float32 else np.asfortranarray(values, dtype=np.float32)
+                        for field, values in fields.items()}
+
+
+    @classmethod
+    def from_long(cls, df:pd.DataFrame, tic_col:str="TIC") -> "PricePanel":
+        """
+        Build a panel from a long price DataFrame (indexed by date, with a ticker column), e.g. ``PriceStore.read``.
+
+        :param df: The long prices.
+        :type df: pd.DataFrame
+
+        :param tic_col: The ticker column.
+        :type tic_col: str, optional
+
+        :return: The panel of the prices.
+        :rtype: PricePanel
+        """
+        try:
+            dates, rows = np.unique(pd.DatetimeIndex(df.index).values, return_inverse=True)
+            tic = df[tic_col].astype('category').cat.remove_unused_categories()
+            columns, valid = tic.cat.codes.to_numpy(), tic.notna().to_numpy()
+            tickers = [str(ticker) for ticker in tic.cat.categories]
+
+            # scatter every row into its (date, ticker) cell
+            fields = {}
+            for field in [field for field in PANEL_FIELDS if field in df.columns]:
+                values = np.full((len(dates), len(tickers)), np.nan, dtype=np.float32, order="F")
+                values[rows[valid], columns[valid]] = df[field].to_numpy(dtype=np.float32)[valid]
+                fields[field] = values
+
+            return cls(dates=dates, tickers=tickers, fields=fields)
+        except Exception as e:
+            logger_panel.info(f"problem {e} in from_long() at line no.={get_exception_line_no()}")
+
+
+    def column(self, field:str, ticker:str) -> np.ndarray:
+        """
+        The ``field`` history of a ticker as a zero-copy 1-D view (NaN where the ticker has no bar).
+        """
+        return self._fields[field][:, self._columns[ticker]]
+
+
+    def frame(self, field:str="Adj Close", tickers:list=None) -> pd.DataFrame:
+        """
+        The ``field`` of all (or the given) tickers as a dates x tickers DataFrame.
+
+        The whole universe is a zero-copy view of the panel; a subset of tickers only copies its own columns.
+        """
+        if tickers is None:
+            return pd.DataFrame(self._fields[field], index=self.dates, columns=self.tickers, copy=False)
+
+        positions = [self._columns[ticker] for ticker in tickers]
+        return pd.DataFrame(self._fields[field][:, positions], index=self.dates, columns=list(tickers), copy=False)
+
+
+    def history(self, ticker:str) -> pd.DataFrame:
+        """
+        All fields of a ticker, over the dates it has bars on.
+        """
+        data = pd.DataFrame({field: self.column(field, ticker) for field in self._fields}, index=self.dates)
+        return data.dropna(how="all")
+
+
+    def slice(self, start_date=None, end_date=None) -> "PricePanel":
+        """
+        The panel restricted to the dates in [start_date, end_date]. The matrices of the slice are views.
+        """
+        start = self.dates.searchsorted(pd.Timestamp(start_date)) if start_date is not None else 0
+        stop = self.dates.searchsorted(pd.Timestamp(end_date), side="right") if end_date is not None else len(self.dates)
+        return PricePanel(dates=self.dates[start:stop], tickers=self.tickers,
+                          fields={field: values[start:stop] for field, values in self._fields.items()})
+
+
+    def to_long(self) -> pd.DataFrame:
+        """
+        The panel as a long DataFrame in the layout of ``PriceStore.read`` (one row per ticker and date with a bar).
+        """
+        try:
+            present = np.zeros((len(self.dates), len(self.tickers)), dtype=bool)
+            for values in self._fields.values():
+                present |= ~np.isnan(values)
+
+            # ticker by ticker, dates ascending
+            columns, rows = np.nonzero(present.T)
+            data = pd.DataFrame({field: values[rows, columns] for field, values in self._fields.items()},
+                                index=pd.DatetimeIndex(self.dates[rows], name="Date"))
+            if 'Volume' in data.columns:
+                data['Volume'] = np.nan_to_num(data['Volume'].to_numpy()).astype(PRICE_DTYPES['Volume'])
+            data['TIC'] = pd.Categorical.from_codes(columns, categories=self.tickers)
+
+            return data
+        except Exception as e:
+            logger_panel.info(f"problem {e} in to_long() at line no.={get_exception_line_no()}")
+
+
+    def memory_usage(self) -> int:
+        """
+        The memory held by the panel in bytes.
+        """
+        return sum(values.nbytes for values in self._fields.values()) + int(self.dates.nbytes) + \
+               sum(len(ticker) for ticker in self.tickers)
@@ -0,0 +1,160 @@
+import os
+import json
+import shutil
+import datetime
+import numpy as np
+import pandas as pd
+
+from logger._logger import logger, get_exception_line_no
+
+logger_store = logger.getLogger("PriceStore")
+
+# on-disk types of the price columns
+PRICE_DTYPES = {'Open': np.float32, 'High': np.float32, 'Low': np.float32, 'Close': np.float32, 'Adj Close': np.float32, 'Volume': np.int64}
+
+
+class PriceStore:
+
+    def __init__(self, index:str, root:str="data") -> None:
+        """
+        Initialize a PriceStore instance.
+
+        The store keeps the price history of an index universe as a Parquet dataset partitioned by ticker
+        (``<root>/ALLDATA<index>/TIC=<ticker>/part-0.parquet``), so a single ticker or a subset of tickers can
+        be read without loading the whole universe. A small ``_manifest.json`` next to the partitions records
+        when the store was refreshed, the date range it covers and the first and last stored bar of every ticker.
+
+        :param index: The financial index whose universe is stored.
+        :type index: str
+
+        :param root: The directory holding the stores.
+        :type root: str, optional
+
+        :return: None
+        """
+        self._index = index
+        self._path = os.path.join(root, f"ALLDATA{''.join(index.split('/'))}")
+        self._manifest_path = os.path.join(self._path, "_manifest.json")
+
+
+    def exists(self) -> bool:
+        """
+        True if the store has been written.
+        """
+        return os.path.exists(self._manifest_path)
+
+
+    def manifest(self) -> dict:
+        """
+        Get the manifest of the store.
+
+        :return: A dictionary with the date the store was last refreshed ('updated'), the earliest date the whole
+                 universe has been fetched from ('start') and the first and last stored date of every ticker
+                 ('tickers': {ticker: [first, last]}).
+        :rtype: dict
+        """
+        try:
+            with open(self._manifest_path) as file:
+                return json.load(file)
+        except Exception as e:
+            logger_store.info(f"problem {e} in manifest() at line no.={get_exception_line_no()}, index = {self._index}")
+            return {'updated': None, 'start': None, 'tickers': {}}
+
+
+    def write(self, df:pd.DataFrame, tickers:list=None) -> None:
+        """
+        Write a long price DataFrame (indexed by date, with a 'TIC' column) to the store.
+
+        :param df: The prices to store.
+        :type df: pd.DataFrame
+
+        :param tickers: Only replace the partitions of these tickers and keep the rest of the store (optional).
+                        By default the whole store is replaced.
+        :type tickers: list, optional
+
+        :return: None
+        """
+        try:
+            frame = df[list(PRICE_DTYPES) + ['TIC']].astype(PRICE_DTYPES)
+            frame['TIC'] = frame['TIC'].astype(str)
+            frame.index = pd.DatetimeIndex(frame.index, name="Date")
+
+            manifest = self.manifest() if tickers is not None and self.exists() else {'start': None, 'tickers': {}}
+            if tickers is None and os.path.exists(self._path):
+                shutil.rmtree(self._path)
+
+            if len(frame) > 0:
+                frame.to_parquet(self._path, engine="pyarrow", partition_cols=['TIC'], basename_template="part-{i}.parquet",
+                                 existing_data_behavior="delete_matching")
+
+            # first and last bar of every written ticker
+            bounds = frame.reset_index().groupby('TIC')['Date'].agg(['min', 'max'])
+            for ticker, (first, last) in bounds.iterrows():
+                manifest['tickers'][ticker] = [first.date().isoformat(), last.date().isoformat()]
+            manifest['updated'] = datetime.datetime.now().date().isoformat()
+
+            os.makedirs(self._path, exist_ok=True)
+            with open(self._manifest_path, "w") as file:
+                json.dump(manifest, file)
+        except Exception as e:
+            logger_store.info(f"problem {e} in write() at line no.={get_exception_line_no()}, index = {self._index}")
+
+
+    def mark_refreshed(self, start_date=None) -> None:
+        """
+        Record that the store was refreshed today and, optionally, the earliest date it now covers for every ticker.
+
+        :param start_date: The start date the whole universe has been fetched from (optional).
+        :type start_date: str | datetime, optional
+
+        :return: None
+        """
+        try:
+            manifest = self.manifest()
+            manifest['updated'] = datetime.datetime.now().date().isoformat()
+            if start_date is not None:
+                start = pd.Timestamp(start_date).date().isoformat()
+                manifest['start'] = min(start, manifest['start']) if manifest.get('start') else start
+
+            os.makedirs(self._path, exist_ok=True)
+            with open(self._manifest_path, "w") as file:
+                json.dump(manifest, file)
+        except Exception as e:
+            logger_store.info(f"problem {e} in mark_refreshed() at line no.={get_exception_line_no()}, index = {self._index}")
+
+
+    def read(self, tickers:list=None, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Read prices from the store.
+
+        :param tickers: Only read these tickers (optional). Partitions of other tickers are not opened.
+        :type tickers: list, optional
+
+        :param start_date: Drop bars before this date (optional).
+        :type start_date: str | datetime, optional
+
+        :param end_date: Drop bars after this date (optional).
+        :type end_date: str | datetime, optional
+
+        :return: A DataFrame indexed by date with float32 price columns, an int64 'Volume' and a categorical 'TIC'.
+        :rtype: pd.DataFrame
+        """
+        try:
+            if not os.path.isdir(self._path) or all(name.startswith('_') for name in os.listdir(self._path)):
+                return pd.DataFrame(columns=list(PRICE_DTYPES) + ['TIC'], index=pd.DatetimeIndex([], name="Date")).astype(PRICE_DTYPES)
+
+            # filters are pushed down to the dataset, so only the requested partitions and row groups are read
+            filters = []
+            if tickers is not None:
+                filters.append(('TIC', 'in', list(tickers)))
+            if start_date is not None:
+                filters.append(('Date', '>=', pd.Timestamp(start_date)))
+            if end_date is not None:
+                filters.append(('Date', '<=', pd.Timestamp(end_date)))
+
+            data = pd.read_parquet(self._path, engine="pyarrow", filters=filters or None)
+            data['TIC'] = data['TIC'].astype('category').cat.remove_unused_categories()
+
+            return data[list(PRICE_DTYPES) + ['TIC']]
+        except Exception as e:
+            logger_store.info(f"problem {e} in read() at line no.={get_exception_line_no()}, index = {self._index}")
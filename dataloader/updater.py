@@ -0,0 +1,190 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+from logger._logger import logger, get_exception_line_no
+
+logger_update = logger.getLogger("Updater")
+
+# relative difference between a stored and a re-fetched adjusted close treated as a restated history
+RESTATEMENT_TOLERANCE = 1e-4
+
+
+def plan_refresh(manifest:dict, tickers:list, start_date, end_date) -> dict:
+    """
+    Work out which date range has to be fetched for every ticker to bring the store up to ``end_date``.
+
+    Tickers the store has never seen, or every ticker when the requested start lies before the range the
+    store covers, are fetched in full. Stored tickers are fetched from their last stored bar (inclusive, so
+    a partial bar saved during the trading day is replaced) unless the store was already refreshed today.
+
+    :param manifest: The manifest of the price store.
+    :type manifest: dict
+
+    :param tickers: The tickers of the universe.
+    :type tickers: list
+
+    :param start_date: The start of the requested lookback.
+    :type start_date: str | datetime
+
+    :param end_date: The end of the requested lookback.
+    :type end_date: str | datetime
+
+    :return: A dictionary mapping each (fetch start, fetch end) window to the tickers to fetch over it.
+    :rtype: dict
+    """
+    start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date)
+    stored = manifest.get('tickers', {})
+    covered = manifest.get('start') is not None and pd.Timestamp(manifest['start']) <= start
+    refreshed_today = manifest.get('updated') == datetime.datetime.now().date().isoformat()
+
+    windows = {}
+    for ticker in tickers:
+        if ticker not in stored or not covered:
+            window = (start, end)
+        elif refreshed_today:
+            continue
+        else:
+            window = (max(pd.Timestamp(stored[ticker][1]), start), end)
+
+        windows.setdefault(window, []).append(ticker)
+
+    return windows
+
+
+def find_restated(stored:pd.DataFrame, fresh:pd.DataFrame, column:str="Adj Close", tolerance:float=RESTATEMENT_TOLERANCE) -> list:
+    """
+    Find the tickers whose re-fetched bars disagree with the stored ones.
+
+    After a split or a dividend the provider restates the whole adjusted history of a ticker, so the bars
+    fetched again (the overlap with the last stored bar) no longer match the store. Appending the new bars to
+    the old history would then put a false jump in the series at the overlap.
+
+    :param stored: The stored prices, a long DataFrame indexed by date with a 'TIC' column.
+    :type stored: pd.DataFrame
+
+    :param fresh: The fetched prices, in the same layout.
+    :type fresh: pd.DataFrame
+
+    :param column: The price column compared on the dates present in both.
+    :type column: str, optional
+
+    :param tolerance: The largest relative difference still treated as the same price.
+    :type tolerance: float, optional
+
+    :return: The tickers with at least one overlapping bar that differs.
+    :rtype: list
+    """
+    def _bars(df):
+        bars = df.reset_index()[['Date', 'TIC', column]]
+        return bars.astype({'TIC': str})
+
+    overlap = pd.merge(_bars(stored), _bars(fresh), on=['Date', 'TIC'], suffixes=('_stored', '_fresh'))
+    differs = ~np.isclose(overlap[f'{column}_fresh'].to_numpy(dtype=np.float64), overlap[f'{column}_stored'].to_numpy(dtype=np.float64),
+                          rtol=tolerance, atol=0, equal_nan=True)
+    return list(overlap.loc[differs, 'TIC'].unique())
+
+
+class IncrementalUpdater:
+
+    def __init__(self, store, downloader) -> None:
+        """
+        Initialize an IncrementalUpdater instance.
+
+        The updater keeps a ``PriceStore`` current by downloading only the bars missing since the last stored
+        bar of every ticker and replacing just the partitions of the tickers that received new data. A ticker
+        whose re-fetched bars no longer match the store (its history was restated after a split or dividend)
+        is fetched again over its whole stored range and its partition is overwritten.
+
+        :param store: The price store to keep up to date.
+        :type store: PriceStore
+
+        :param downloader: The downloader used to fetch the missing bars.
+        :type downloader: BatchDownloader
+
+        :return: None
+        """
+        self._store = store
+        self._downloader = downloader
+        self._failures = {}
+
+
+    def refresh(self, tickers:list, start_date, end_date) -> pd.DataFrame:
+        """
+        Bring the store up to date for ``tickers`` and return their prices over [start_date, end_date].
+
+        :param tickers: The tickers of the universe.
+        :type tickers: list
+
+        :param start_date: The start of the requested lookback.
+        :type start_date: str | datetime
+
+        :param end_date: The end of the requested lookback.
+        :type end_date: str | datetime
+
+        :return: A long DataFrame indexed by date with the price columns and a 'TIC' column.
+        :rtype: pd.DataFrame
+        """
+        try:
+            manifest = self._store.manifest()
+            windows = plan_refresh(manifest, tickers, start_date, end_date)
+            frames, self._failures = [], {}
+
+            # fetch the missing bars, one batched download per date window
+            for (window_start, window_end), group in windows.items():
+                frames.append(self._downloader.download(group, start_date=window_start, end_date=window_end))
+                self._failures.update(self._downloader.getFailures())
+                logger_update.info(f"Refreshed {len(group)} tickers from {window_start.date()} to {window_end.date()}, failed = {len(self._downloader.getFailures())}")
+
+            fresh = pd.concat(frames) if len(frames) > 0 else pd.DataFrame()
+            if len(fresh) > 0:
+                changed = list(fresh['TIC'].unique())
+                stored = [ticker for ticker in changed if ticker in manifest.get('tickers', {})]
+                history = self._store.read(tickers=stored) if len(stored) > 0 else fresh.iloc[:0]
+
+                # a restated history is fetched again in full instead of appending to the old one
+                restated = find_restated(history, fresh) if len(stored) > 0 else []
+                if len(restated) > 0:
+                    fresh, history, changed = self._refetch(restated, manifest, fresh, history, changed, start_date, end_date)
+
+                # append to the stored history; re-fetched bars replace the stored ones
+                merged = pd.concat([history, fresh]) if len(history) > 0 else fresh
+                merged = merged.reset_index().drop_duplicates(subset=['Date', 'TIC'], keep='last').set_index('Date').sort_index()
+                self._store.write(merged, tickers=changed)
+
+            # the whole universe is now covered from start_date if it was fetched from there in one window
+            full_refresh = any(window[0] == pd.Timestamp(start_date).normalize() and len(group) == len(tickers) for window, group in windows.items())
+            self._store.mark_refreshed(start_date=start_date if full_refresh else None)
+
+            return self._store.read(tickers=tickers, start_date=pd.Timestamp(start_date).normalize(), end_date=end_date)
+        except Exception as e:
+            logger_update.info(f"problem {e} in refresh() at line no.={get_exception_line_no()}")
+
+
+    def _refetch(self, restated:list, manifest:dict, fresh:pd.DataFrame, history:pd.DataFrame, changed:list, start_date, end_date) -> tuple:
+        """
+        Fetch the restated tickers over their whole stored range and drop their old history.
+
+        A restated ticker that cannot be fetched again is left out of the write, so its partition keeps the old
+        consistent history and the overlap is checked again on the next refresh. Returns the fresh bars, the
+        stored history and the tickers to write.
+        """
+        first = min(pd.Timestamp(manifest['tickers'][ticker][0]) for ticker in restated)
+        window_start = min(first, pd.Timestamp(start_date).normalize())
+        logger_update.info(f"Restated history, refetching {len(restated)} tickers from {window_start.date()}: {restated}")
+
+        full = self._downloader.download(restated, start_date=window_start, end_date=end_date)
+        self._failures.update(self._downloader.getFailures())
+        refetched = set(full['TIC'].astype(str)) if len(full) > 0 else set()
+
+        fresh = pd.concat([fresh[~fresh['TIC'].isin(restated)], full])
+        history = history[~history['TIC'].astype(str).isin(restated)]
+        changed = [ticker for ticker in changed if ticker not in restated or ticker in refetched]
+        return fresh, history, changed
+
+
+    def getFailures(self) -> dict:
+        """
+        Get the tickers that could not be refreshed by the last call to ``refresh``, with the reason.
+        """
+        return self._failures
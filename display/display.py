@@ -1,3 +1,5 @@
+import sys
+
 from rich import box
 from rich.style import Style
 from rich.layout import Layout
@@ -10,27 +12,41 @@ from rich.markdown import Markdown, Heading
 
 from pandas import DataFrame
 from utils.utils import df_to_table
+from display.pager import TablePager
 
 
-def displayDf(df: DataFrame) -> None:
+def displayDf(df: DataFrame, page_size: int = 25) -> None:
     """
     Display a Pandas DataFrame as a rich table.
 
-    This function takes a Pandas DataFrame and displays it as a rich table using the Rich library.
+    This function takes a Pandas DataFrame and displays it as a rich table using the Rich library. Tables longer
+    than a page are shown with a ``TablePager``: in a terminal one page at a time with next / previous / go to
+    page and sorting by a column, otherwise streamed page by page without prompting.
 
     :param df: The DataFrame to display.
     :type df: DataFrame
 
+    :param page_size: The number of rows per page.
+    :type page_size: int, optional
+
     :return: None
     """
     # Show Rich Tables
     console = Console()
+    print("\n")
+
+    if df is not None and len(df) > page_size:
+        pager = TablePager(df, page_size=page_size, console=console)
+        if console.is_terminal and sys.stdin.isatty():
+            pager.browse()
+        else:
+            pager.stream()
+        return
+
     table = Table(show_header=True, header_style="bold magenta")
     viewTable = df_to_table(df, table)
     table.box = box.HEAVY
 
-    print("\n")
-
     console.print(viewTable)
 
 
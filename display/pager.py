@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+
+from rich import box
+from rich.table import Table
+from rich.console import Console
+from rich.prompt import Prompt
+from logger._logger import logger, get_exception_line_no
+
+logger_pager = logger.getLogger("pager")
+
+
+class TablePager:
+
+    def __init__(self, df:pd.DataFrame, page_size:int=25, console:Console=None) -> None:
+        """
+        Initialize a TablePager instance.
+
+        The pager shows a DataFrame one page of rows at a time. Only the rows of the visible page are turned into
+        strings, and every formatted row is cached by position, so paging back and forth or re-sorting only ever
+        formats rows not seen before. Sorting reorders an array of row positions; the sort key of a column is
+        computed once (formatted cells such as ``12.5%`` or ``₹ 1021.3`` are sorted by their number).
+
+        :param df: The DataFrame to show.
+        :type df: pd.DataFrame
+
+        :param page_size: The number of rows per page.
+        :type page_size: int, optional
+
+        :param console: The rich console to print on.
+        :type console: Console, optional
+
+        :return: None
+        """
+        self._df = df
+        self._page_size = max(page_size, 1)
+        self._console = console or Console()
+        self._order = np.arange(len(df))
+        self._rows = {}
+        self._keys = {}
+        self.page = 0
+        self.sorted_by = None
+
+
+    @property
+    def pages(self) -> int:
+        return max(-(-len(self._df) // self._page_size), 1)
+
+
+    def _formatted(self, positions:np.ndarray) -> list:
+        """
+        The formatted (index + cells) rows at the given positions, formatting only the rows not cached yet.
+        """
+        missing = [position for position in positions if position not in self._rows]
+        if len(missing) > 0:
+            block = self._df.iloc[missing]
+            for position, index, values in zip(missing, block.index.to_list(), block.values.tolist()):
+                self._rows[position] = [str(index)] + [str(value) for value in values]
+        return [self._rows[position] for position in positions]
+
+
+    def _sort_key(self, column) -> pd.Series:
+        """
+        Sort key of a column: its numbers, parsed out of formatted strings when needed, else the strings.
+        """
+        if column not in self._keys:
+            values = self._df[column]
+            if pd.api.types.is_numeric_dtype(values):
+                key = values
+            else:
+                text = values.astype(str)
+                key = pd.to_numeric(text.str.replace(r"[^0-9eE.+-]", "", regex=True), errors="coerce")
+                if key.notna().sum() < 0.5 * values.notna().sum():
+                    key = text
+            self._keys[column] = pd.Series(key.to_numpy())
+        return self._keys[column]
+
+
+    def column(self, name:str):
+        """
+        The column matching a name, a case-insensitive prefix of it, or its 1-based number. None if there is none.
+        """
+        columns = list(self._df.columns)
+        if name.isdigit() and 1 <= int(name) <= len(columns):
+            return columns[int(name) - 1]
+        matches = [column for column in columns if str(column).lower() == name.lower()] or \
+                  [column for column in columns if str(column).lower().startswith(name.lower())]
+        return matches[0] if len(matches) > 0 else None
+
+
+    def sort(self, column, ascending:bool=True) -> None:
+        """
+        Sort the rows by a column (missing values last) and go back to the first page.
+        """
+        self._order = self._sort_key(column).sort_values(ascending=ascending, na_position="last", kind="stable").index.to_numpy()
+        self.sorted_by = (column, ascending)
+        self.page = 0
+
+
+    def goto(self, page:int) -> None:
+        self.page = min(max(page, 0), self.pages - 1)
+
+
+    def next(self) -> bool:
+        """
+        Move to the next page; False if already on the last one.
+        """
+        if self.page + 1 >= self.pages:
+            return False
+        self.page += 1
+        return True
+
+
+    def prev(self) -> bool:
+        """
+        Move to the previous page; False if already on the first one.
+        """
+        if self.page == 0:
+            return False
+        self.page -= 1
+        return True
+
+
+    def table(self) -> Table:
+        """
+        The rich Table of the current page.
+        """
+        start = self.page * self._page_size
+        positions = self._order[start:start + self._page_size]
+
+        caption = f"Page {self.page + 1}/{self.pages} - rows {start + 1 if len(positions) else 0}-{start + len(positions)} of {len(self._df)}"
+        if self.sorted_by is not None:
+            caption += f" - sorted by {self.sorted_by[0]} ({'ascending' if self.sorted_by[1] else 'descending'})"
+
+        table = Table(show_header=True, header_style="bold magenta", box=box.HEAVY, caption=caption)
+        table.add_column("")
+        for column in self._df.columns:
+            table.add_column(str(column), justify="right", style="cyan")
+        for row in self._formatted(positions):
+            table.add_row(*row)
+        return table
+
+
+    def show(self) -> None:
+        self._console.print(self.table())
+
+
+    def stream(self) -> None:
+        """
+        Print every page in order, one table per page, without holding the formatted table of all rows.
+        """
+        self.goto(0)
+        self.show()
+        while self.next():
+            self._rows.clear()
+            self.show()
+
+
+    def browse(self) -> None:
+        """
+        Page through the table interactively until the user quits.
+        """
+        help_text = "[bold blue]Enter/n next, p previous, g <page>, s <column name or number> \\[desc], q quit[/]"
+        self.show()
+        while True:
+            try:
+                command = Prompt.ask(help_text, default="n", show_default=False, console=self._console).strip().split()
+            except (EOFError, KeyboardInterrupt):
+                break
+            action, arguments = (command[0].lower(), command[1:]) if command else ("n", [])
+            try:
+                if action == "q" or (action == "n" and not self.next()):
+                    break
+                elif action == "p":
+                    self.prev()
+                elif action == "g" and arguments:
+                    self.goto(int(arguments[0]) - 1)
+                elif action == "s" and arguments:
+                    descending = arguments[-1].lower() in ("desc", "d")
+                    column = self.column(" ".join(arguments[:-1] if descending else arguments))
+                    if column is None:
+                        self._console.print("[bold red]Not a valid column[/]")
+                        continue
+                    self.sort(column, ascending=not descending)
+                elif action != "n":
+                    self._console.print("[bold red]Not a valid response[/]")
+                    continue
+                self.show()
+            except Exception as e:
+                logger_pager.info(f"problem {e} in browse() at line no.={get_exception_line_no()}")
+                self._console.print("[bold red]Not a valid response[/]")
@@ -1,8 +1,12 @@
 # Import Statements
 
+import pandas as pd
+
 from logger._logger import logger, get_exception_line_no
 from screener.investor import MarketScreener
+from screener.session_cache import session_cache
 from display.display import displayDf, displayString, rules, panelShow
+from utils.global_variables import INDEXES, CURRENCIES
 
 
 logger_main = logger.getLogger("main")
@@ -18,7 +22,7 @@ while not Done:
         manager = {"y":True, "n":False}
 
         # Show the options
-        indexes = ['NIFTY_50', 'NIFTY_BANK', 'NASDAQ', 'SP500', 'FTSE250', 'FTSE100', 'DOW', 'IBOVESPA', 'NSE/BSE']
+        indexes = INDEXES
         index = indexes[int(displayString("\n\nChoose the Index:\n\n1. Nifty 50\n2. Bank Nifty\n3. Nasdaq\n4. S&P500\n5. FTSE250\n6. FTSE100\n7. DOW\n8. IBOVESPA\n9. NSE/BSE\n\nEnter Index Code", 
                                         style="bold magenta")) - 1]
 
@@ -28,51 +32,49 @@ while not Done:
         # New Section
         rules(text="Functionalities")
 
-        # currency sign
-        if index in ['NASDQ', 'DOW', 'SP500']:
-            currency = '$'
-        elif index in ['FTSE100', 'FTSE250', 'SP500']:
-            currency = '£'
-        elif index in ['IBOVESPA']:
-            currency = 'R$'
-        else:
-            currency = '₹' # default Indian currency
-
-        # create the investor
-        investor = MarketScreener(indexes=index, lookback=lookback, currency=currency)
+        # create the investor, with the currency sign of the index (default Indian currency)
+        investor = MarketScreener(indexes=index, lookback=lookback, currency=CURRENCIES.get(index, '₹'), cache=session_cache)
 
         state = True
         initialised = False
 
         while state:
             # show all options
-            option = displayString("\n1. Baseline Performance\n2. All Stock Performance\n3. Screen Stocks\n4. Asset Allocation\n5. Single Stock Analysis\n6. Correlation Matrix\n\nEnter Code", style="bold magenta")
+            option = displayString("\n1. Baseline Performance\n2. All Stock Performance\n3. Screen Stocks\n4. Asset Allocation\n5. Single Stock Analysis\n6. Correlation Matrix\n7. Correlation Explorer\n8. Efficient Frontier\n9. Trending Stocks\n10. Baseline Regression\n11. Backtest Allocation\n12. Allocation Sweep\n\nEnter Code", style="bold magenta")
             frequency = displayString("\n\nEnter Frequency of Investing (D/W/M/Y)", style="bold blue").upper()
 
-            # initialise everything at beginning once
+            # initialise everything at beginning once, stats are computed lazily once per frequency
             if not initialised:
                 investor._select_index()
-                investor._index_stocks_stats(frequency)
                 initialised = True
 
             # functions
-            functionalities = {"1": investor.get_baseline_stats(frequency), "2": investor.getAllDetails()[0]}
-            exclude_list = ["3", "4", "5", "6"]
+            functionalities = {"1": lambda: investor.get_baseline_stats(frequency), "2": lambda: investor.getAllDetails(frequency)[0],
+                               "10": lambda: investor.baseline_regression(frequency)}
+            exclude_list = ["3", "4", "5", "6", "7", "8", "9", "11", "12"]
 
             if option not in exclude_list:
-                df = functionalities[option]
-                displayDf(df)
+                df = functionalities[option]()
+                if df is None:
+                    panelShow(text="Not a valid frequency", style="bold red")
+                else:
+                    displayDf(df)
 
             elif option == "3":
-                filters = displayString(f"\n\nEnter filtering criteria for screening {index} stocks\n\nNote: Enter all screening criteria as AV_<_30 (This means show all stocks with annual volatility less than 30%) \
+                filters = displayString(f"\n\nEnter filtering criteria for screening {index} stocks\n\nNote: Enter screening criteria as AV < 30 (This means show all stocks with annual volatility less than 30%) \
+                                        \nCombine them with AND / OR / NOT and parentheses, use >, <, >=, <=, =, between (AV between 10 and 30) and rank with top / bottom (top 20 by SR) \
                                         \n\n1. 1PC (1 Period Change)\n2. AR (Annual Return) \
-                                        \n3. SR (Sharpe Ratio)\n4. MDD (Max Drawdown)\n5. VaR\n6. cVaR\n7. HP (Highest Peak)\n8. LT (Lowest Trough)\n9. CP (Current Price)\n10.AV (Annual Volatility)\n\nEnter Conditions", 
+                                        \n3. SR (Sharpe Ratio)\n4. MDD (Max Drawdown)\n5. VaR\n6. cVaR\n7. HP (Highest Peak)\n8. LT (Lowest Trough)\n9. CP (Current Price)\n10.AV (Annual Volatility) \
+                                        \n11.BETA\n12.DD (Drawdown Duration)\n13.TTR (Time to Recovery)\n\nEnter Conditions", 
                                         
-                                        style="bold blue").split()
+                                        style="bold blue")
                 
                 # screen stocks
                 df = investor.filterDatabase(filters, frequency)
-                displayDf(df)
+                if df is None:
+                    panelShow(text="Not a valid screen", style="bold red")
+                else:
+                    displayDf(df)
 
             elif option == "4":
                 # method mappers
@@ -80,12 +82,18 @@ while not Done:
                 use_method_dict = {"1":"ledoit_wolf", "2":"semicovariance", "3":"sample_cov", "4": "exp_cov"}
 
                 cash = float(displayString("\nEnter Cash Amount", style="bold yellow"))
-                opt_method = opt_method_dict[displayString("\n1. Max Sharpe\n2. Min Vol\n3. Kelly\n4. HRP\n\nEnter Code", style="bold magenta")]
-                use_method = use_method_dict[displayString("\n1. Ledoit Wolf\n2. Semi-Covariance\n3. Sample Covariance\n4. Exponential Covariance\n\nEnter Code", style="bold green")]
-                stock_list = displayString("\nEnter Stock Tickers\nEnter Ticker Names", style="bold magenta").upper().split()
-                
-                # call method
-                dataFrame = investor.assetAllocation(cash=cash, opt_method=opt_method, use_method=use_method, frequency=frequency, value_col="Adj Close", stock_list=stock_list)
+                opt_code = displayString("\n1. Max Sharpe\n2. Min Vol\n3. Kelly\n4. HRP\n5. HRP over the whole Index\n\nEnter Code", style="bold magenta")
+
+                if opt_code == "5":
+                    stock_list = displayString("\nEnter Stock Tickers (leave empty for the whole index)\nEnter Ticker Names", style="bold magenta").upper().split()
+                    dataFrame = investor.hrpAllocation(cash=cash, frequency=frequency, value_col="Adj Close", stock_list=stock_list)
+                else:
+                    opt_method = opt_method_dict[opt_code]
+                    use_method = use_method_dict[displayString("\n1. Ledoit Wolf\n2. Semi-Covariance\n3. Sample Covariance\n4. Exponential Covariance\n\nEnter Code", style="bold green")]
+                    stock_list = displayString("\nEnter Stock Tickers\nEnter Ticker Names", style="bold magenta").upper().split()
+
+                    # call method
+                    dataFrame = investor.assetAllocation(cash=cash, opt_method=opt_method, use_method=use_method, frequency=frequency, value_col="Adj Close", stock_list=stock_list)
 
                 displayDf(dataFrame)
             
@@ -100,6 +108,84 @@ while not Done:
                 stock_list = displayString("\nEnter Stock Tickers\nEnter Ticker Names", style="bold magenta").upper().split()
                 corr_df = investor.correlation_matrix(stock_list=stock_list, frequency=frequency, value_col="Adj Close")
                 displayDf(corr_df)
+
+            elif option == "7":
+                # correlations across the whole index
+                choice = displayString("\n1. Most Correlated Stocks\n2. Least Correlated Stocks\n3. Correlation Clusters\n\nEnter Code", style="bold magenta")
+
+                if choice in ["1", "2"]:
+                    stock = displayString("\nEnter Stock Ticker", style="bold magenta").upper()
+                    k = int(displayString("\nEnter Number of Stocks", style="bold green"))
+                    df = investor.correlated_stocks(stock_name=stock, frequency=frequency, k=k, least=(choice == "2"))
+                else:
+                    min_correlation = float(displayString("\nEnter Minimum Average Correlation within a Cluster (e.g. 0.7)", style="bold green"))
+                    df = investor.correlation_clusters(frequency=frequency, min_correlation=min_correlation)
+
+                if df is None:
+                    panelShow(text="Not a valid ticker", style="bold red")
+                else:
+                    displayDf(df)
+
+            elif option == "8":
+                # efficient frontier of a basket
+                use_method_dict = {"1":"ledoit_wolf", "2":"semicovariance", "3":"sample_cov", "4": "exp_cov"}
+
+                use_method = use_method_dict[displayString("\n1. Ledoit Wolf\n2. Semi-Covariance\n3. Sample Covariance\n4. Exponential Covariance\n\nEnter Code", style="bold green")]
+                points = int(displayString("\nEnter Number of Points on the Frontier", style="bold yellow"))
+                stock_list = displayString("\nEnter Stock Tickers\nEnter Ticker Names", style="bold magenta").upper().split()
+
+                result = investor.efficientFrontier(frequency=frequency, value_col="Adj Close", stock_list=stock_list, use_method=use_method, points=points)
+                if result is None:
+                    panelShow(text="Not a valid basket", style="bold red")
+                else:
+                    displayDf(result['frontier'])
+                    displayDf(pd.DataFrame({'Minimum Variance': result['min_variance'], 'Tangency': result['tangency']}))
+
+            elif option == "9":
+                # stocks whose rolling metric moved the most, e.g. beta rising over the last 60 days
+                metric_dict = {"1": "Annual Volatility", "2": "Sharpe Ratio", "3": "Maximum Drawdown", "4": "Beta"}
+
+                metric = metric_dict[displayString("\n1. Annual Volatility\n2. Sharpe Ratio\n3. Maximum Drawdown\n4. Beta\n\nEnter Code", style="bold magenta")]
+                window = int(displayString("\nEnter Rolling Window (in Periods)", style="bold green"))
+                periods = int(displayString("\nEnter Number of Periods to Compare over", style="bold green"))
+                falling = displayString("\n1. Rising\n2. Falling\n\nEnter Code", style="bold blue") == "2"
+
+                df = investor.trending_stocks(metric, frequency=frequency, window=window, lookback=periods, falling=falling)
+                if df is None:
+                    panelShow(text="Not a valid window", style="bold red")
+                else:
+                    displayDf(df)
+
+            elif option == "11":
+                # walk forward backtest of an allocation method, re-optimised on every rebalance
+                opt_method_dict = {"1":"max_sharpe", "2":"min_vol", "3":"kelly", "4": "HRP", "5": "EQ"}
+                use_method_dict = {"1":"ledoit_wolf", "2":"semicovariance", "3":"sample_cov", "4": "exp_cov"}
+
+                cash = float(displayString("\nEnter Cash Amount", style="bold yellow"))
+                opt_method = opt_method_dict[displayString("\n1. Max Sharpe\n2. Min Vol\n3. Kelly\n4. HRP\n5. Equal Weights\n\nEnter Code", style="bold magenta")]
+                use_method = use_method_dict[displayString("\n1. Ledoit Wolf\n2. Semi-Covariance\n3. Sample Covariance\n4. Exponential Covariance\n\nEnter Code", style="bold green")]
+                rebalance = displayString("\nEnter Rebalance Frequency (D/W/M/Q/Y)", style="bold blue").upper()
+                train_window = int(displayString("\nEnter Training Window (in Days)", style="bold green"))
+                stock_list = displayString("\nEnter Stock Tickers\nEnter Ticker Names", style="bold magenta").upper().split()
+
+                summary, _ = investor.backtestAllocation(cash=cash, opt_method=opt_method, use_method=use_method, frequency=frequency, value_col="Adj Close",
+                                                         stock_list=stock_list, rebalance=rebalance, train_window=train_window)
+                if summary is None:
+                    panelShow(text="Not enough prices to backtest the basket", style="bold red")
+                else:
+                    displayDf(summary)
+
+            elif option == "12":
+                # every allocation method x covariance estimator (x lookback) on a basket, best Sharpe ratio first
+                stock_list = displayString("\nEnter Stock Tickers\nEnter Ticker Names", style="bold magenta").upper().split()
+                lookbacks = [int(lookback) for lookback in displayString("\nEnter Lookbacks to compare (in Periods, leave empty for the whole lookback)",
+                                                                         style="bold green").split()]
+
+                df = investor.allocationSweep(frequency=frequency, value_col="Adj Close", stock_list=stock_list, lookbacks=lookbacks or None)
+                if df is None:
+                    panelShow(text="Not a valid basket", style="bold red")
+                else:
+                    displayDf(df)
             
             else:
                 displayString("\nNot a valid response", style="bold red")
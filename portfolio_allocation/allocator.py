@@ -4,27 +4,37 @@ import numpy as np
 
 from logger._logger import logger, get_exception_line_no
 from backtest.backtest import backtestCalculator
-from numpy.linalg import inv
-from pypfopt import risk_models
-from pypfopt import expected_returns
 from pypfopt import EfficientFrontier
 from pypfopt import objective_functions
-from pypfopt.risk_models import risk_matrix
-from pypfopt.hierarchical_portfolio import HRPOpt
+from pypfopt.base_optimizer import portfolio_performance
+from portfolio_allocation.frontier import max_sharpe_weights
+from portfolio_allocation.hrp import hrp_weights
+from portfolio_allocation.risk_model import risk_model_cache, solve_covariance
 
 logger_allocation = logger.getLogger("allocation")
 
-# Allocation of various stocks.
-def asset_allocation(cash:float, df:pd.DataFrame, opt_method:str, frequency:str, use_method:str="ledoit_wolf") -> pd.DataFrame:
+# Expected returns of various stocks.
+def historical_returns(df:pd.DataFrame, frequency:str) -> pd.Series:
     """
-    Perform asset allocation optimization and return a DataFrame with investment details.
+    Annualised mean historical return of every asset of historical price data (cached per basket and window).
+    """
+    return risk_model_cache.expected_returns(df, frequency=frequency)
 
-    This function performs asset allocation optimization based on historical price data and the chosen optimization
-    method. It returns a DataFrame containing investment details, including invested amount, balance, and the number
-    of shares allocated to each asset.
 
-    :param cash: The initial amount of cash available for investment.
-    :type cash: float
+# Covariance of various stocks.
+def covariance_matrix(df:pd.DataFrame, use_method:str="ledoit_wolf") -> pd.DataFrame:
+    """
+    Covariance matrix of the assets of historical price data with a ``risk_matrix`` estimator (cached per
+    basket, window and estimator).
+    """
+    return risk_model_cache.covariance(df, use_method=use_method)
+
+
+# Optimal weights of various stocks.
+def optimal_weights(df:pd.DataFrame, opt_method:str, frequency:str, use_method:str="ledoit_wolf", mu:pd.Series=None, cov:pd.DataFrame=None,
+                    weight_bounds:tuple=(0, 1), sector_mapper:dict=None, sector_upper:dict=None) -> tuple:
+    """
+    Calculate the portfolio weights of an optimisation method from historical price data.
 
     :param df: The DataFrame containing historical price data for various assets.
     :type df: pd.DataFrame
@@ -38,66 +48,75 @@ def asset_allocation(cash:float, df:pd.DataFrame, opt_method:str, frequency:str,
     :param use_method: The method for calculating the covariance matrix (default: "ledoit_wolf").
     :type use_method: str, optional
 
-    :return: A Pandas DataFrame containing investment details, including invested amount, balance, and the number
-             of shares allocated to each asset.
-    :rtype: pd.DataFrame
+    :param mu: Precomputed ``historical_returns`` of ``df`` to reuse (optional).
+    :type mu: pd.Series, optional
+
+    :param cov: Precomputed ``covariance_matrix`` of ``df`` to reuse (optional).
+    :type cov: pd.DataFrame, optional
+
+    :param weight_bounds: The (minimum, maximum) weight of every asset for "max_sharpe" and "min_vol"; for
+                          "max_sharpe", None gives the unconstrained (closed form) tangency portfolio.
+    :type weight_bounds: tuple, optional
+
+    :param sector_mapper: A dictionary mapping tickers to their sector, for the sector caps.
+    :type sector_mapper: dict, optional
+
+    :param sector_upper: A dictionary mapping sectors to their maximum total weight, for "max_sharpe" and "min_vol".
+    :type sector_upper: dict, optional
+
+    :return: A tuple of the weights (a dictionary of asset -> weight, None for an invalid method) and, for
+             "max_sharpe" and "min_vol", the expected (return, volatility, Sharpe ratio) of the portfolio, else None.
+    :rtype: tuple
     """
     try:
+        performance = None
+
         # unique securities
         ticker_list = list(df.columns)
 
-        df_cov = df.copy()
-        mapper = {"D": 252, "M": 12, "W":52, "Q": 4, "Y": 1}
-        freq = mapper[frequency]
-
-        # convert datetime to string index
-        df = df.reset_index()
-        df['Date'] = df['Date'].apply(lambda x: x.strftime("%Y-%m-%d"))
-        df.set_index("Date", inplace=True)
-
-        # Historical returns
-        retu = expected_returns.mean_historical_return(df, frequency=freq)
-
-        returns = retu
-        mean_returns = returns
-        cov = risk_matrix(df_cov, method=use_method)
-        precision_matrix = pd.DataFrame(inv(cov), index=ticker_list, columns=ticker_list)  # Inverse of cov matrix
+        # expected returns and covariance, only for the methods using them
+        cached = cov is None
+        if opt_method.upper() not in ("HRP", "EQ"):
+            retu = historical_returns(df, frequency=frequency) if mu is None else mu
+            mean_returns = retu
+            cov = covariance_matrix(df, use_method=use_method) if cov is None else cov
 
         # Optimisation Techniques
         if (opt_method.lower()=="max_sharpe"):
 
-            ef = EfficientFrontier(retu, cov)
-            weights = ef.nonconvex_objective(
-                objective_functions.sharpe_ratio,
-                objective_args = (ef.expected_returns, ef.cov_matrix),
-                weights_sum_to_one=True,
-            )
-            er, ev, es = ef.portfolio_performance(verbose=False)
-            wts = weights
+            # convex reformulation of the Sharpe ratio maximisation
+            wts = max_sharpe_weights(df, frequency=frequency, use_method=use_method, weight_bounds=weight_bounds, sector_mapper=sector_mapper,
+                                     sector_upper=sector_upper, mu=retu, cov=None if cached else cov)
+            performance = portfolio_performance(wts, retu, cov)
             weights = wts
 
         elif (opt_method.lower()=="min_vol"):
 
-            ef = EfficientFrontier(retu, cov, verbose=False)
+            ef = EfficientFrontier(retu, cov, weight_bounds=weight_bounds or (None, None), verbose=False)
+            if sector_upper:
+                ef.add_sector_constraints(sector_mapper, {}, sector_upper)
             ef.add_objective(objective_functions.L2_reg, gamma=1)
             ef.min_volatility()
             wts = ef.clean_weights()
-            er, ev, es = ef.portfolio_performance(verbose=False)
+            performance = ef.portfolio_performance(verbose=False)
             weights = wts
 
         elif (opt_method.lower()=="kelly"):
 
-            kelly_wt = precision_matrix.dot(mean_returns).clip(lower=0).values
+            # cov^-1 @ mu by a Cholesky solve, reusing the cached factor of the covariance
+            if cached:
+                kelly_wt = risk_model_cache.solve(df, mean_returns.to_numpy(), use_method=use_method)
+            else:
+                kelly_wt = solve_covariance(cov, mean_returns.to_numpy())
+            kelly_wt = kelly_wt.clip(min=0)
             kelly_wt /= np.sum(np.abs(kelly_wt))
             wts = dict(zip(ticker_list, kelly_wt))
             weights = wts
 
         elif (opt_method.upper()=="HRP"):
 
-            returns = df.pct_change().dropna()
-            hrp = HRPOpt(returns)
-            wts = hrp.optimize()
-            wts = hrp.clean_weights()
+            # linkage tree cached per basket and window
+            wts = hrp_weights(df)
             weights = wts
 
         elif (opt_method.upper()=="EQ"):
@@ -107,13 +126,63 @@ def asset_allocation(cash:float, df:pd.DataFrame, opt_method:str, frequency:str,
 
         else:
             print("Warning: Invalid optimisation method")
+            weights = None
+
+        return weights, performance
+    except Exception as e:
+        logger_allocation.info(f"problem {e} in optimal_weights() at line no.={get_exception_line_no()}")
+        return None, None
 
 
+# Allocation of various stocks.
+def asset_allocation(cash:float, df:pd.DataFrame, opt_method:str, frequency:str, use_method:str="ledoit_wolf", weight_bounds:tuple=(0, 1),
+                     sector_mapper:dict=None, sector_upper:dict=None) -> pd.DataFrame:
+    """
+    Perform asset allocation optimization and return a DataFrame with investment details.
+
+    This function performs asset allocation optimization based on historical price data and the chosen optimization
+    method. It returns a DataFrame containing investment details, including invested amount, balance, and the number
+    of shares allocated to each asset.
+
+    :param cash: The initial amount of cash available for investment.
+    :type cash: float
+
+    :param df: The DataFrame containing historical price data for various assets.
+    :type df: pd.DataFrame
+
+    :param opt_method: The optimization method to use ("max_sharpe", "min_vol", "kelly", "HRP", or "EQ").
+    :type opt_method: str
+
+    :param frequency: The frequency of data (e.g., "M" for monthly).
+    :type frequency: str
+
+    :param use_method: The method for calculating the covariance matrix (default: "ledoit_wolf").
+    :type use_method: str, optional
+
+    :param weight_bounds: The (minimum, maximum) weight of every asset for "max_sharpe" and "min_vol".
+    :type weight_bounds: tuple, optional
+
+    :param sector_mapper: A dictionary mapping tickers to their sector, for the sector caps.
+    :type sector_mapper: dict, optional
+
+    :param sector_upper: A dictionary mapping sectors to their maximum total weight.
+    :type sector_upper: dict, optional
+
+    :return: A Pandas DataFrame containing investment details, including invested amount, balance, and the number
+             of shares allocated to each asset.
+    :rtype: pd.DataFrame
+    """
+    try:
+        # optimal weights
+        weights, performance = optimal_weights(df, opt_method=opt_method, frequency=frequency, use_method=use_method, weight_bounds=weight_bounds,
+                                               sector_mapper=sector_mapper, sector_upper=sector_upper)
+
         # Discrete Allocation
         latest_prices = df.loc[df.index[-1]].to_dict()
         total_invested, balance, shares = backtestCalculator(cash, latest_prices, weights)
 
         if opt_method == "max_sharpe" or opt_method == "min_vol":
+            er, ev, es = performance
             num_shares = {'Invested (₹)': np.around(total_invested, 2), 'Balance (₹)': np.around(balance, 2), 'Expected Return (%)': f'{np.around(er, 2)*100}%', 
                                                                                                                 'Expected Volatility (%)': f'{np.around(ev, 2)*100}%',
                                                                                                                 'Expected Sharpe Ratio': np.around(es, 2),
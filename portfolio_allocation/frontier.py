@@ -0,0 +1,219 @@
+import numpy as np
+import pandas as pd
+import cvxpy as cp
+
+from portfolio_allocation.risk_model import risk_model_cache, solve_covariance
+from logger._logger import logger, get_exception_line_no
+
+logger_frontier = logger.getLogger("frontier")
+
+# risk free rate of the Sharpe ratios, as in pypfopt's portfolio_performance
+RISK_FREE_RATE = 0.02
+
+# interior point solver; on these small dense problems it beats a warm-started OSQP, which needs hundreds of
+# iterations per point (cvxpy's default solver when an older cvxpy does not ship Clarabel)
+SOLVER = "CLARABEL" if "CLARABEL" in cp.installed_solvers() else None
+
+
+def _risk(w:cp.Variable, df:pd.DataFrame, cov:pd.DataFrame, use_method:str):
+    """
+    Portfolio variance ``w' cov w`` as ``||L' w||^2`` with the cached Cholesky factor L of the covariance, or as a
+    quadratic form when the covariance is not positive definite.
+    """
+    factor = risk_model_cache.factor(df, use_method=use_method)
+    if factor is None:
+        return cp.quad_form(w, cp.psd_wrap(cov.to_numpy(dtype=np.float64)))
+
+    matrix, lower = factor
+    chol = np.tril(matrix) if lower else np.triu(matrix).T
+    return cp.sum_squares(chol.T @ w)
+
+
+def _row(target:float, weights:np.ndarray, tickers:list, mu:np.ndarray, cov:np.ndarray) -> dict:
+    """
+    Expected return, volatility, Sharpe ratio and weights (%) of a portfolio, as a row of the frontier.
+    """
+    expected = float(mu @ weights)
+    volatility = float(np.sqrt(max(weights @ cov @ weights, 0)))
+
+    row = {'Target Return (%)': round(target * 100, 2), 'Expected Return (%)': round(expected * 100, 2),
+           'Expected Volatility (%)': round(volatility * 100, 2),
+           'Expected Sharpe Ratio': round((expected - RISK_FREE_RATE) / volatility, 2) if volatility > 0 else np.nan}
+    row.update({ticker: round(weight * 100, 2) for ticker, weight in zip(tickers, weights)})
+    return row
+
+
+def _sector_indices(tickers:list, sector_mapper:dict, sectors:dict) -> dict:
+    """
+    Positions of the tickers of every capped sector.
+    """
+    return {sector: [i for i, ticker in enumerate(tickers) if sector_mapper.get(ticker) == sector] for sector in sectors}
+
+
+def max_sharpe_weights(df:pd.DataFrame, frequency:str, use_method:str="ledoit_wolf", weight_bounds:tuple=(0, 1),
+                       sector_mapper:dict=None, sector_upper:dict=None, sector_lower:dict=None, mu:pd.Series=None,
+                       cov:pd.DataFrame=None, risk_free_rate:float=RISK_FREE_RATE) -> dict:
+    """
+    Calculate the maximum Sharpe ratio (tangency) portfolio of a basket as a convex problem.
+
+    With ``y = w / k`` the Sharpe ratio maximisation becomes ``min y' cov y`` subject to ``(mu - rf)' y = 1`` and
+    ``sum(y) = k >= 0``; the weight bounds and sector caps are homogeneous in ``k`` (``lower * k <= y <= upper * k``)
+    so they stay linear, and ``w = y / k``. Without bounds or sector caps (``weight_bounds=None``) the tangency
+    portfolio has the closed form ``cov^-1 (mu - rf)`` (normalised), solved with the cached Cholesky factor.
+
+    :param df: The DataFrame containing historical price data for various assets.
+    :type df: pd.DataFrame
+
+    :param frequency: The frequency of data (e.g., "M" for monthly).
+    :type frequency: str
+
+    :param use_method: The method for calculating the covariance matrix (default: "ledoit_wolf").
+    :type use_method: str, optional
+
+    :param weight_bounds: The (minimum, maximum) weight of every asset, either side None for no bound, or None
+                          for an unconstrained (long-short) portfolio.
+    :type weight_bounds: tuple, optional
+
+    :param sector_mapper: A dictionary mapping tickers to their sector (required with sector caps).
+    :type sector_mapper: dict, optional
+
+    :param sector_upper: A dictionary mapping sectors to their maximum total weight.
+    :type sector_upper: dict, optional
+
+    :param sector_lower: A dictionary mapping sectors to their minimum total weight.
+    :type sector_lower: dict, optional
+
+    :param mu: Precomputed expected returns of ``df`` to reuse (optional).
+    :type mu: pd.Series, optional
+
+    :param cov: Precomputed covariance matrix of ``df`` to reuse (optional).
+    :type cov: pd.DataFrame, optional
+
+    :param risk_free_rate: The annual risk free rate.
+    :type risk_free_rate: float, optional
+
+    :return: A dictionary of asset -> weight.
+    :rtype: dict
+    """
+    tickers = list(df.columns)
+    cached = cov is None
+    mu = risk_model_cache.expected_returns(df, frequency=frequency) if mu is None else mu
+    cov = risk_model_cache.covariance(df, use_method=use_method) if cov is None else cov
+    excess = mu.to_numpy(dtype=np.float64) - risk_free_rate
+
+    if not (excess > 0).any():
+        raise ValueError("at least one asset must have an expected return above the risk free rate")
+
+    if weight_bounds is None and not sector_upper and not sector_lower:
+        # closed form tangency portfolio
+        if cached:
+            weights = risk_model_cache.solve(df, excess, use_method=use_method)
+        else:
+            weights = solve_covariance(cov, excess)
+
+        # below the minimum variance return the Sharpe ratio of a fully invested portfolio has no maximum
+        if weights.sum() <= 0:
+            raise ValueError("no tangency portfolio, the expected returns are below the minimum variance return")
+        weights = weights / weights.sum()
+    else:
+        y, k = cp.Variable(len(tickers)), cp.Variable()
+        constraints = [excess @ y == 1, cp.sum(y) == k, k >= 0]
+
+        lower, upper = weight_bounds or (None, None)
+        if lower is not None:
+            constraints.append(y >= lower * k)
+        if upper is not None:
+            constraints.append(y <= upper * k)
+
+        for sector, positions in _sector_indices(tickers, sector_mapper or {}, sector_upper or {}).items():
+            constraints.append(cp.sum(y[positions]) <= sector_upper[sector] * k)
+        for sector, positions in _sector_indices(tickers, sector_mapper or {}, sector_lower or {}).items():
+            constraints.append(cp.sum(y[positions]) >= sector_lower[sector] * k)
+
+        risk = _risk(y, df, cov, use_method) if cached else cp.quad_form(y, cp.psd_wrap(cov.to_numpy(dtype=np.float64)))
+        problem = cp.Problem(cp.Minimize(risk), constraints)
+        problem.solve(solver=SOLVER)
+        if problem.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE):
+            raise ValueError(f"max sharpe problem is {problem.status}")
+
+        weights = np.where(np.abs(y.value) < 1e-6 * k.value, 0.0, y.value)
+        weights = weights / weights.sum()
+
+    return dict(zip(tickers, weights))
+
+
+def efficient_frontier(df:pd.DataFrame, frequency:str, use_method:str="ledoit_wolf", points:int=100,
+                       weight_bounds:tuple=(0, 1)) -> dict:
+    """
+    Trace the efficient frontier of a basket from historical price data.
+
+    The minimum-variance portfolio and the highest attainable return are solved first, then the portfolio of
+    minimum variance is solved for ``points`` target returns evenly spaced between them. The problem is compiled
+    once with the target return as a cvxpy Parameter, so every point only updates the parameter and re-solves
+    the cached canonical problem, warm-started from the previous point. Expected returns, the covariance and its Cholesky factor come from the shared
+    risk model cache.
+
+    :param df: The DataFrame containing historical price data for various assets.
+    :type df: pd.DataFrame
+
+    :param frequency: The frequency of data (e.g., "M" for monthly).
+    :type frequency: str
+
+    :param use_method: The method for calculating the covariance matrix (default: "ledoit_wolf").
+    :type use_method: str, optional
+
+    :param points: The number of target returns on the frontier.
+    :type points: int, optional
+
+    :param weight_bounds: The (minimum, maximum) weight of every asset.
+    :type weight_bounds: tuple, optional
+
+    :return: A dictionary with the 'frontier' DataFrame (one row per point: the 'Target Return (%)', 'Expected
+             Return (%)', 'Expected Volatility (%)', 'Expected Sharpe Ratio' and the weight (%) of every asset, by
+             increasing return), its 'min_variance' row and the 'tangency' (maximum Sharpe ratio) portfolio in the
+             same format.
+    :rtype: dict
+    """
+    try:
+        tickers = list(df.columns)
+        mu = risk_model_cache.expected_returns(df, frequency=frequency)
+        cov = risk_model_cache.covariance(df, use_method=use_method)
+        mu_values, cov_values = mu.to_numpy(dtype=np.float64), cov.to_numpy(dtype=np.float64)
+
+        w = cp.Variable(len(tickers))
+        risk = _risk(w, df, cov, use_method)
+        constraints = [cp.sum(w) == 1, w >= weight_bounds[0], w <= weight_bounds[1]]
+
+        # ends of the frontier
+        cp.Problem(cp.Minimize(risk), constraints).solve(solver=SOLVER)
+        lowest = float(mu_values @ w.value)
+        cp.Problem(cp.Maximize(mu_values @ w), constraints).solve(solver=SOLVER)
+        highest = float(mu_values @ w.value)
+
+        # compiled once, only the target return changes between the points
+        target = cp.Parameter()
+        problem = cp.Problem(cp.Minimize(risk), constraints + [mu_values @ w >= target])
+
+        rows = []
+        for value in np.linspace(lowest, highest, points):
+            target.value = value
+            # warm-started from the previous point: Clarabel updates the data of its cached solver in place
+            # instead of setting up a new one, OSQP and SCS also start from the previous solution
+            problem.solve(solver=SOLVER, warm_start=True)
+            if w.value is None or problem.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE):
+                continue
+
+            rows.append(_row(value, np.where(np.abs(w.value) < 1e-6, 0.0, w.value), tickers, mu_values, cov_values))
+
+        frontier = pd.DataFrame(rows)
+        frontier.index = frontier.index + 1
+
+        # the exact tangency portfolio, between two points of the frontier
+        tangency = max_sharpe_weights(df, frequency=frequency, use_method=use_method, weight_bounds=weight_bounds)
+        weights = np.array([tangency[ticker] for ticker in tickers])
+
+        return {'frontier': frontier,
+                'min_variance': frontier.loc[frontier['Expected Volatility (%)'].idxmin()],
+                'tangency': pd.Series(_row(float(mu_values @ weights), weights, tickers, mu_values, cov_values))}
+    except Exception as e:
+        logger_frontier.info(f"problem {e} in efficient_frontier() at line no.={get_exception_line_no()}")
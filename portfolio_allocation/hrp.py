@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
+from stats.correlation import simple_returns, blockwise_matrix
+from backtest.backtest import backtestCalculator
+from portfolio_allocation.risk_model import risk_model_cache, window, fingerprint
+from logger._logger import logger, get_exception_line_no
+
+logger_hrp = logger.getLogger("hrp")
+
+
+def hrp_tree(returns:np.ndarray, linkage_method:str="single", min_periods:int=10) -> dict:
+    """
+    Hierarchical clustering of the tickers of a dates x tickers return matrix on the correlation distance
+    ``sqrt((1 - correlation) / 2)``, as in pypfopt's ``HRPOpt``. Correlations are pairwise-complete, so tickers
+    with different histories can be clustered together; tickers with fewer than ``min_periods`` returns are left out.
+
+    :return: A dictionary with the column 'positions' of the clustered tickers, the 'linkage' matrix and the leaf
+             'order' (indices into 'positions').
+    :rtype: dict
+    """
+    positions = np.flatnonzero((~np.isnan(returns)).sum(axis=0) >= min_periods)
+    correlation = blockwise_matrix(returns[:, positions], statistic="correlation",
+                                   out=np.empty((len(positions), len(positions)), dtype=np.float64))
+
+    # pairs without common returns are treated as uncorrelated
+    distance = np.sqrt(np.clip((1.0 - np.nan_to_num(correlation, nan=0.0)) / 2.0, 0.0, 1.0))
+    np.fill_diagonal(distance, 0.0)
+    tree = linkage(squareform(distance, checks=False), linkage_method)
+
+    return {'positions': positions, 'linkage': tree, 'order': leaves_list(tree)}
+
+
+def recursive_bisection(cov:np.ndarray, order:np.ndarray) -> np.ndarray:
+    """
+    Hierarchical risk parity weights: the quasi-diagonal ``order`` is split in halves recursively and every
+    pair of halves shares its weight in inverse proportion to the variance of their inverse-variance portfolios.
+    """
+    def cluster_variance(items:np.ndarray) -> float:
+        block = cov[np.ix_(items, items)]
+        weights = 1 / np.diag(block)
+        weights /= weights.sum()
+        return weights @ block @ weights
+
+    weights = np.ones(len(cov))
+    clusters = [np.asarray(order)]
+    while len(clusters) > 0:
+        clusters = [cluster[start:stop] for cluster in clusters
+                    for start, stop in ((0, len(cluster) // 2), (len(cluster) // 2, len(cluster))) if len(cluster) > 1]
+        for first, second in zip(clusters[::2], clusters[1::2]):
+            first_variance, second_variance = cluster_variance(first), cluster_variance(second)
+            alpha = 1 - first_variance / (first_variance + second_variance)
+            weights[first] *= alpha
+            weights[second] *= 1 - alpha
+    return weights
+
+
+def hrp_weights(prices:pd.DataFrame, tickers:list=None, linkage_method:str="single", cache=risk_model_cache) -> dict:
+    """
+    Calculate hierarchical risk parity weights, reusing the clustering of the whole universe.
+
+    The correlation distance and linkage tree of all the tickers of ``prices`` are computed once per
+    (universe prices, window) and cached. An allocation over a subset of the universe prunes the cached tree: its
+    quasi-diagonal order is the universe leaf order restricted to the subset, so only the covariance of the
+    subset is computed for the recursive bisection. Over the whole universe (or a basket of its own) the weights
+    are those of pypfopt's ``HRPOpt``, cleaned the same way; over a subset they follow the universe clustering.
+
+    :param prices: The prices of the universe, indexed by date with one column per ticker (NaN where missing).
+    :type prices: pd.DataFrame
+
+    :param tickers: The tickers to allocate to (default: the whole universe).
+    :type tickers: list, optional
+
+    :param linkage_method: The scipy linkage method of the clustering.
+    :type linkage_method: str, optional
+
+    :param cache: The cache holding the linkage trees.
+    :type cache: RiskModelCache, optional
+
+    :return: A dictionary of ticker -> weight. Tickers with too little history get no weight.
+    :rtype: dict
+    """
+    returns = simple_returns(prices.to_numpy())
+
+    key = ("hrp", fingerprint(prices)) + window(prices) + (linkage_method,)
+    tree = cache.get(key)
+    if tree is None:
+        tree = hrp_tree(returns, linkage_method=linkage_method)
+        cache.put(key, tree)
+
+    # prune the universe leaf order down to the requested tickers
+    ordered = tree['positions'][tree['order']]
+    if tickers is not None:
+        columns = {ticker: position for position, ticker in enumerate(prices.columns)}
+        ordered = ordered[np.isin(ordered, [columns[ticker] for ticker in tickers if ticker in columns])]
+
+    positions = np.sort(ordered)
+    cov = blockwise_matrix(returns[:, positions], statistic="covariance", out=np.empty((len(positions), len(positions)), dtype=np.float64))
+    weights = recursive_bisection(cov, np.searchsorted(positions, ordered))
+
+    # as HRPOpt.clean_weights
+    weights = np.round(np.where(np.abs(weights) < 1e-4, 0.0, weights), 5)
+    return dict(zip(prices.columns[positions], weights))
+
+
+def hrp_allocation(cash:float, prices:pd.DataFrame, tickers:list=None) -> pd.DataFrame:
+    """
+    Allocate cash with hierarchical risk parity over an index universe (or a subset of it).
+
+    :param cash: The initial amount of cash available for investment.
+    :type cash: float
+
+    :param prices: The prices of the universe, indexed by date with one column per ticker.
+    :type prices: pd.DataFrame
+
+    :param tickers: The tickers to allocate to (default: the whole universe).
+    :type tickers: list, optional
+
+    :return: A Pandas DataFrame with the invested amount, the balance and the number of shares of every ticker.
+    :rtype: pd.DataFrame
+    """
+    try:
+        weights = hrp_weights(prices, tickers=tickers)
+
+        # latest available price of every ticker
+        latest_prices = prices[list(weights)].ffill().iloc[-1].to_dict()
+        total_invested, balance, shares = backtestCalculator(cash, latest_prices, weights)
+
+        num_shares = {'Invested': np.around(total_invested, 2), 'Balance': np.around(balance, 2)}
+        num_shares.update(shares)
+        return pd.DataFrame(num_shares, index=[0])
+    except Exception as e:
+        logger_hrp.info(f"problem {e} in hrp_allocation() at line no.={get_exception_line_no()}")
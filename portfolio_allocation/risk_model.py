@@ -0,0 +1,147 @@
+import zlib
+import numpy as np
+import pandas as pd
+
+from scipy.linalg import cho_factor, cho_solve
+from pypfopt import expected_returns
+from pypfopt.risk_models import risk_matrix
+from utils.memory_cache import MemoryCache
+from stats.price_stats import PERIODS_PER_YEAR
+from logger._logger import logger, get_exception_line_no
+
+logger_risk = logger.getLogger("risk_model")
+
+# estimators computed pair by pair, so the matrix of a basket is a block of the matrix of any larger basket
+PAIRWISE_ESTIMATORS = ["sample_cov", "semicovariance", "exp_cov"]
+
+
+def window(df:pd.DataFrame) -> tuple:
+    """
+    The (first date, last date, number of rows, digest of the dates) a price DataFrame covers.
+    """
+    return pd.Timestamp(df.index[0]), pd.Timestamp(df.index[-1]), len(df), int(pd.util.hash_array(df.index.to_numpy()).sum())
+
+
+def fingerprint(df:pd.DataFrame) -> tuple:
+    """
+    The (ticker, digest of its prices) pairs of a price DataFrame, so that frames of the same shape and dates
+    but other prices (Close vs Adj Close, refreshed or adjusted data) never share a cache entry. A column keeps
+    its digest in any basket containing it, which lets a basket be sliced out of a larger one.
+    """
+    values = np.asfortranarray(df.to_numpy(dtype=np.float64))
+    return tuple((ticker, zlib.crc32(values[:, position])) for position, ticker in enumerate(df.columns))
+
+
+def solve_covariance(cov, b) -> np.ndarray:
+    """
+    Solve ``cov @ x = b`` with the Cholesky factor of the covariance, falling back to an LU solve when the
+    covariance is not positive definite.
+    """
+    cov, b = np.asarray(cov, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    try:
+        return cho_solve(cho_factor(cov, lower=True), b)
+    except np.linalg.LinAlgError:
+        return np.linalg.solve(cov, b)
+
+
+class RiskModelCache(MemoryCache):
+
+    def __init__(self, max_bytes:int=256 * 1024 ** 2) -> None:
+        """
+        Initialize a RiskModelCache instance.
+
+        An LRU cache (``MemoryCache``) of the risk models of the allocations of a session: the expected returns
+        keyed by (``fingerprint``, ``window``, frequency), and the covariance matrix and its Cholesky factor keyed by
+        (``fingerprint``, ``window``, estimator), so an entry is only reused for the very same prices. Expected
+        returns and the pairwise covariance estimators (``PAIRWISE_ESTIMATORS``) of a basket are sliced out of any
+        cached larger basket over the same dates, so overlapping baskets share the work; ``ledoit_wolf`` and the
+        other shrinkage estimators depend on the whole basket and are only reused on an exact hit.
+
+        :param max_bytes: The memory budget of the cache in bytes.
+        :type max_bytes: int, optional
+
+        :return: None
+        """
+        super().__init__(max_bytes=max_bytes)
+
+
+    def _covering(self, kind:str, columns:tuple, dates:tuple, parameter:str) -> tuple:
+        """
+        Key of the most recently used entry of a larger basket with the same prices over the same dates, or None.
+        """
+        wanted = set(columns)
+        for key in reversed(self.keys()):
+            if key[0] == kind and key[2:] == dates + (parameter,) and wanted.issubset(key[1]):
+                return key
+
+
+    def expected_returns(self, df:pd.DataFrame, frequency:str) -> pd.Series:
+        """
+        Annualised mean historical return of every asset of historical price data, cached.
+        """
+        columns, tickers, dates = fingerprint(df), list(df.columns), window(df)
+        key = ("mu", columns) + dates + (frequency,)
+
+        mu = self.get(key)
+        if mu is None:
+            # the covering entry may be evicted by another thread in between
+            covering = self._covering("mu", columns, dates, frequency)
+            larger = self.get(covering) if covering is not None else None
+            if larger is not None:
+                mu = larger[tickers]
+            else:
+                mu = expected_returns.mean_historical_return(df, frequency=PERIODS_PER_YEAR[frequency])
+            self.put(key, mu)
+        return mu
+
+
+    def covariance(self, df:pd.DataFrame, use_method:str="ledoit_wolf") -> pd.DataFrame:
+        """
+        Covariance matrix of the assets of historical price data with a ``risk_matrix`` estimator, cached.
+        """
+        columns, tickers, dates = fingerprint(df), list(df.columns), window(df)
+        key = ("cov", columns) + dates + (use_method,)
+
+        cov = self.get(key)
+        if cov is None:
+            covering = self._covering("cov", columns, dates, use_method) if use_method in PAIRWISE_ESTIMATORS else None
+            larger = self.get(covering) if covering is not None else None
+            if larger is not None:
+                cov = larger.loc[tickers, tickers]
+            else:
+                cov = risk_matrix(df, method=use_method)
+            self.put(key, cov)
+        return cov
+
+
+    def factor(self, df:pd.DataFrame, use_method:str="ledoit_wolf") -> tuple:
+        """
+        Cholesky factor (``scipy.linalg.cho_factor``) of the cached covariance matrix, or None if it is not
+        positive definite.
+        """
+        key = ("chol", fingerprint(df)) + window(df) + (use_method,)
+
+        # a covariance that is not positive definite is cached as a None factor
+        factor = self.get(key)
+        if factor is None and key not in self:
+            try:
+                factor = cho_factor(self.covariance(df, use_method=use_method).to_numpy(dtype=np.float64), lower=True)
+            except np.linalg.LinAlgError as e:
+                logger_risk.info(f"problem {e} in factor() at line no.={get_exception_line_no()}, estimator = {use_method}")
+            self.put(key, factor)
+        return factor
+
+
+    def solve(self, df:pd.DataFrame, b, use_method:str="ledoit_wolf") -> np.ndarray:
+        """
+        Solve ``cov @ x = b`` for the cached covariance matrix of historical price data, with its cached factor.
+        """
+        cov = self.covariance(df, use_method=use_method)
+        factor = self.factor(df, use_method=use_method)
+        if factor is None:
+            return np.linalg.solve(cov.to_numpy(dtype=np.float64), np.asarray(b, dtype=np.float64))
+        return cho_solve(factor, np.asarray(b, dtype=np.float64))
+
+
+# cache shared by every allocation of the session
+risk_model_cache = RiskModelCache()
@@ -0,0 +1,117 @@
+import os
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor
+from pypfopt.base_optimizer import portfolio_performance
+from portfolio_allocation.allocator import historical_returns, covariance_matrix, optimal_weights
+from logger._logger import logger, get_exception_line_no
+
+logger_sweep = logger.getLogger("sweep")
+
+# every optimisation method and risk_matrix estimator offered by asset_allocation
+OPT_METHODS = ["max_sharpe", "min_vol", "kelly", "HRP", "EQ"]
+USE_METHODS = ["ledoit_wolf", "semicovariance", "sample_cov", "exp_cov"]
+
+# methods whose weights do not depend on the covariance estimator
+SHARED_METHODS = ["HRP", "EQ"]
+
+
+def _sweep_worker(df:pd.DataFrame, frequency:str, use_method:str, mu:pd.Series, opt_methods:list) -> tuple:
+    """
+    Weights of ``opt_methods`` on one price window, computing the covariance of ``use_method`` (if any) once.
+    """
+    cov = None
+    try:
+        if use_method is not None:
+            cov = covariance_matrix(df, use_method=use_method)
+    except Exception as e:
+        logger_sweep.info(f"problem {e} in _sweep_worker() at line no.={get_exception_line_no()}, estimator = {use_method}")
+        return None, {method: None for method in opt_methods}
+
+    return cov, {method: optimal_weights(df, opt_method=method, frequency=frequency, use_method=use_method, mu=mu, cov=cov)[0]
+                 for method in opt_methods}
+
+
+def allocation_sweep(df:pd.DataFrame, frequency:str, opt_methods:list=None, use_methods:list=None, lookbacks:list=None,
+                     workers:int=None) -> pd.DataFrame:
+    """
+    Evaluate every combination of optimisation method x covariance estimator (x lookback) on historical prices.
+
+    The expected returns of every lookback window are computed once and every covariance matrix once per
+    (lookback, estimator), in its own task on a pool of processes, where all the methods using it are solved.
+    HRP and EQ do not use the estimator, so their weights are computed once per lookback and only evaluated
+    under each estimator. Every portfolio is scored with the same ``portfolio_performance`` (expected return,
+    volatility and Sharpe ratio under that estimator's covariance).
+
+    :param df: The DataFrame containing historical price data for various assets.
+    :type df: pd.DataFrame
+
+    :param frequency: The frequency of data (e.g., "M" for monthly).
+    :type frequency: str
+
+    :param opt_methods: The optimization methods to compare (default: all of ``OPT_METHODS``).
+    :type opt_methods: list, optional
+
+    :param use_methods: The covariance estimators to compare (default: all of ``USE_METHODS``).
+    :type use_methods: list, optional
+
+    :param lookbacks: Numbers of most recent periods of ``df`` to compare (default: the whole history).
+    :type lookbacks: list, optional
+
+    :param workers: The number of worker processes (default: the number of CPUs). With 1 worker everything runs
+                    in the calling process.
+    :type workers: int, optional
+
+    :return: A DataFrame with one row per combination: the 'Lookback', 'Method' and 'Estimator', the 'Expected
+             Return (%)', 'Expected Volatility (%)' and 'Expected Sharpe Ratio', and the weight (%) of every asset,
+             best Sharpe ratio first.
+    :rtype: pd.DataFrame
+    """
+    try:
+        opt_methods = opt_methods or OPT_METHODS
+        use_methods = use_methods or USE_METHODS
+        windows = {lookback: df.iloc[-lookback:] if lookback else df for lookback in (lookbacks or [None])}
+        workers = workers or os.cpu_count() or 1
+
+        # expected returns once per window
+        mus = {lookback: historical_returns(window, frequency=frequency) for lookback, window in windows.items()}
+
+        # one task per (window, estimator) plus one per window for the estimator free methods
+        own = [method for method in opt_methods if method not in SHARED_METHODS]
+        shared = [method for method in opt_methods if method in SHARED_METHODS]
+        tasks = [(lookback, use_method, own) for lookback in windows for use_method in use_methods if own]
+        tasks += [(lookback, None, shared) for lookback in windows if shared]
+
+        arguments = [(windows[lookback], frequency, use_method, mus[lookback], methods) for lookback, use_method, methods in tasks]
+        if workers <= 1 or len(tasks) < 2:
+            results = [_sweep_worker(*args) for args in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                results = list(executor.map(_sweep_worker, *zip(*arguments)))
+
+        covs = {(lookback, use_method): cov for (lookback, use_method, _), (cov, _) in zip(tasks, results)}
+        weights = {(lookback, use_method, method): found for (lookback, use_method, _), (_, solved) in zip(tasks, results) for method, found in solved.items()}
+
+        rows = []
+        for lookback in windows:
+            for use_method in use_methods:
+                for method in opt_methods:
+                    found = weights.get((lookback, None if method in SHARED_METHODS else use_method, method))
+                    cov = covs.get((lookback, use_method))
+
+                    performance = (np.nan, np.nan, np.nan)
+                    if found is not None and cov is not None:
+                        performance = portfolio_performance(found, mus[lookback], cov)
+
+                    row = {'Lookback': lookback or len(windows[lookback]), 'Method': method, 'Estimator': use_method,
+                           'Expected Return (%)': round(performance[0] * 100, 2), 'Expected Volatility (%)': round(performance[1] * 100, 2),
+                           'Expected Sharpe Ratio': round(performance[2], 2)}
+                    row.update({ticker: round(found.get(ticker, 0.0) * 100, 2) if found is not None else np.nan for ticker in df.columns})
+                    rows.append(row)
+
+        table = pd.DataFrame(rows).sort_values('Expected Sharpe Ratio', ascending=False, kind="stable", ignore_index=True)
+        table.index = table.index + 1
+        return table
+    except Exception as e:
+        logger_sweep.info(f"problem {e} in allocation_sweep() at line no.={get_exception_line_no()}")
@@ -3,37 +3,72 @@ import datetime
 import pandas as pd
 import datetime as dt
 
-from rich.progress import track
 from utils.utils import filter_database
 from logger._logger import logger, get_exception_line_no
 from dataloader.data_loader import Dataloader
+from screener.session_cache import SessionCache
 from stats.price_stats import getPricestats, corr_cals
-from portfolio_allocation.allocator import asset_allocation
+from stats.parallel import parallel_cross_sectional_stats
+from stats.cross_section import index_regression, period_returns
+from stats.correlation import CorrelationEngine
+from stats.rolling import rolling_stats, rising
 
 logger = logger.getLogger("investor_module")
 
 class MarketScreener:
 
     # Constructor
-    def __init__(self, indexes:str, lookback:int=365, currency:str="₹") -> None:
+    def __init__(self, indexes:str, lookback:int=365, currency:str="₹", cache:SessionCache=None, workers:int=1, fetch_fn=None, tickers:list=None) -> None:
         self.start = dt.datetime.now() - dt.timedelta(days=lookback)
         self.end = dt.datetime.now()
         self.indexes = indexes
         self.lookback = lookback
         self._currency = currency
+        self._cache = cache
+        self._workers = workers
 
         # some dataframe that will live throughout the life of the object
         self._baseline = pd.DataFrame()
-        self._all_stocks = pd.DataFrame()
+
+        # memo of the daily price matrix per value column, of its resamples per (value column, frequency)
+        # and of the (visual, filter) stats tables per frequency
+        self._daily_prices = {}
+        self._resampled = {}
+        self._stats = {}
+
+        # full-universe correlation engines and regressions on the baseline per frequency, rolling analytics per (frequency, window)
+        self._correlations = {}
+        self._regressions = {}
+        self._rolling = {}
 
         # creates the data directory
         os.makedirs("data", exist_ok=True)
 
-        # initiate data_loader class and load all data
-        self._data_loader = Dataloader(index=self.indexes, start_date=self.start, end_date=self.end)
-        self._data_loader.load_baseline()
-        self._data_loader.load_all_index_tickers()
-        self._data_loader.load_data()
+        # initiate data_loader class and load all data (served from the session cache when possible)
+        self._data_loader = Dataloader(index=self.indexes, start_date=self.start, end_date=self.end, fetch_fn=fetch_fn, tickers=tickers)
+        panel = self._cache.get_panel(self.indexes, self.start, self.end) if self._cache is not None else None
+
+        if panel is not None:
+            self._data_loader.setData(**panel)
+        else:
+            self._data_loader.load_baseline()
+            self._data_loader.load_all_index_tickers()
+            self._data_loader.load_data()
+
+            # a failed load is not cached, so the next screener of the session retries it
+            if not self.has_data():
+                logger.info(f"Load of {self.indexes} returned no data, not cached")
+            elif self._cache is not None:
+                self._cache.put_panel(self.indexes, self.start, self.end, {'baseline': self._data_loader.getIndexData(),
+                                                                            'tickers': self._data_loader.getAllindextickers(),
+                                                                            'panel': self._data_loader.getPricepanel()})
+
+
+    # True if the load produced baseline prices and constituent prices
+    def has_data(self) -> bool:
+        baseline, tickers, prices = self._data_loader.getIndexData(), self._data_loader.getAllindextickers(), self._data_loader.getPricepanel()
+        return baseline is not None and len(baseline) > 0 and len(tickers or []) > 0 and \
+               prices is not None and len(prices.tickers) > 0 and len(prices.dates) > 0
 
 
 
@@ -57,73 +92,77 @@ class MarketScreener:
         return startDate, endDate, no_of_periods, frequency, annual_ret, annual_vol, sharpe, max_drawdown, var, cvar, ret_1_ch, high, low, current_price
 
 
-    # Info of all stocks in the index
+    # dates x tickers matrix of the daily prices of a value column, materialized once per session
+    def _wide_prices(self, value_col:str="Adj Close") -> pd.DataFrame:
+        if value_col not in self._daily_prices:
+            # dates x tickers matrix straight from the price panel
+            panel = self._data_loader.getPricepanel()
+            loaded = set(panel.tickers)
+            self._daily_prices[value_col] = panel.frame(value_col, [tick for tick in self._tickers if tick in loaded])
+
+        return self._daily_prices[value_col]
+
+
+    # the wide matrix resampled to a frequency once per session
+    def _resampled_prices(self, frequency:str, value_col:str="Adj Close") -> pd.DataFrame:
+        if (value_col, frequency) not in self._resampled:
+            self._resampled[(value_col, frequency)] = self._wide_prices(value_col).resample(frequency).last().dropna(how="all")
+
+        return self._resampled[(value_col, frequency)]
+
+
+    # Info of all stocks in the index, computed once per frequency
     def _index_stocks_stats(self, frequency) -> None:
-        # get all index data
         try:
-            self._all_stocks = self._data_loader.getAllindexdata()
-            self._all_stocks.sort_index(inplace=True)
-
-            tracker = {"D":"Days", "M":"Months", "W":"Weeks", "Q":"Quarters", "Y":"Years"}
-            self._visual_data = pd.DataFrame()
-            self._filter_data = pd.DataFrame()
-
-            # get stats for all data
-            for tick in track(self._tickers, description='[green]Processing Data'):
-                try:
-                    data = self._all_stocks[self._all_stocks['TIC']==tick]
-                    resamp = self._data_loader.resampler(data, frequency=frequency, dataType="securities")
-                    startDate, endDate, no_of_periods, frequency, annual_ret, annual_vol, sharpe, max_drawdown, var, cvar, ret_1_ch, high, low, current_price = getPricestats(resamp.reset_index(), 
-                                                                                                                                    frequency=frequency, date_col="Date", price_col="Adj Close")
-                    # beta of the stock 
-                    beta = self.calculate_beta(price_series=data, baseline_price_series=self._baseline)
-                    
-                    df = pd.DataFrame([
-                                startDate.strftime("%Y-%m-%d"),
-                                endDate.strftime("%Y-%m-%d"),
-                                round(no_of_periods),
-                                f'{round(annual_ret*100, 2)}%',
-                                f'{round(annual_vol*100, 2)}%',
-                                f'{round(sharpe, 2)}',
-                                f'{round(max_drawdown*100, 2)}%',
-                                f'{round(var*100, 2)}%',
-                                f'{round(cvar*100, 2)}%',
-                                f'{round(ret_1_ch*100, 2)}%',
-                                f'{self._currency} {round(high, 2)}',
-                                f'{self._currency} {round(low, 2)}',
-                                f'{self._currency} {round(current_price, 2)}',
-                                f'{round(beta, 2)}'
-                                ], index=['Start Date', 'End Date', f'Period (in {tracker[frequency]})', 'Annual Return', 'Annual Volatility', 'Sharpe Ratio', 
-                                        'Maximum Drawdown', 'VaR', 'cVaR', f'1 {tracker[frequency][:-1]} Change (%)', 'Highest Peak', 'Lowest Trough', 'Current Price', 'Beta'], columns=[f'{tick}'])
-                    
-                    newDf = pd.DataFrame([
-                                startDate.strftime("%Y-%m-%d"),
-                                endDate.strftime("%Y-%m-%d"),
-                                round(no_of_periods),
-                                round(annual_ret*100, 2),
-                                round(annual_vol*100, 2),
-                                round(sharpe, 2),
-                                round(max_drawdown*100, 2),
-                                round(var*100, 2),
-                                round(cvar*100, 2),
-                                round(ret_1_ch*100, 2),
-                                round(high, 2),
-                                round(low, 2),
-                                round(current_price, 2),
-                                round(beta, 2)
-                                ], index=['Start Date', 'End Date', f'Period (in {tracker[frequency]})', 'Annual Return', 'Annual Volatility', 'Sharpe Ratio', 
-                                        'Maximum Drawdown', 'VaR', 'cVaR', f'1 {tracker[frequency][:-1]} Change (%)', 'Highest Peak', 'Lowest Trough', 'Current Price', 'Beta'], columns=[f'{tick}'])
-                    
-                    self._visual_data = pd.concat([self._visual_data, df.T])
-                    self._filter_data = pd.concat([self._filter_data, newDf.T])
-                
-                except:
-                    pass
+            # stats already computed for this frequency
+            if frequency in self._stats:
+                self._visual_data, self._filter_data = self._stats[frequency]
+                return
+
+            # stats already computed this session
+            tables = self._cache.get_stats(self.indexes, self.start, self.end, frequency) if self._cache is not None else None
+            if tables is None:
+                # resample every ticker together and get stats for all data
+                resamp = self._resampled_prices(frequency)
+                stats = parallel_cross_sectional_stats(resamp, frequency=frequency, daily_prices=self._wide_prices("Adj Close"), baseline=self._baseline['Adj Close'],
+                                                       workers=self._workers)
+                tables = self._stats_tables(stats, frequency=frequency)
+
+                if self._cache is not None:
+                    self._cache.put_stats(self.indexes, self.start, self.end, frequency, tables)
+
+            self._stats[frequency] = tables
+            self._visual_data, self._filter_data = tables
 
             # saves the dataframe
             self.save_index_stats() 
-        except:
-            pass
+        except Exception as e:
+            logger.info(f"problem {e} in _index_stocks_stats() at line no. = {get_exception_line_no()}, index = {self.indexes}")
+
+
+    # Format the raw stats of all stocks into display and screening tables
+    def _stats_tables(self, stats:pd.DataFrame, frequency:str) -> tuple:
+        tracker = {"D":"Days", "M":"Months", "W":"Weeks", "Q":"Quarters", "Y":"Years"}
+        percent_cols = ['Annual Return', 'Annual Volatility', 'Maximum Drawdown', 'VaR', 'cVaR', '1 Period Change']
+        price_cols = ['Highest Peak', 'Lowest Trough', 'Current Price']
+        date_cols = ['Start Date', 'End Date', 'Peak Date', 'Trough Date']
+        names = {'Periods': f'Period (in {tracker[frequency]})', '1 Period Change': f'1 {tracker[frequency][:-1]} Change (%)',
+                 'Drawdown Duration': f'Drawdown Duration (in {tracker[frequency]})', 'Time to Recovery': f'Time to Recovery (in {tracker[frequency]})'}
+
+        filter_data = stats.copy()
+        for col in date_cols:
+            filter_data[col] = filter_data[col].dt.strftime("%Y-%m-%d")
+        filter_data[['Drawdown Duration', 'Time to Recovery']] = filter_data[['Drawdown Duration', 'Time to Recovery']].astype('Int64')
+        filter_data[percent_cols] = (filter_data[percent_cols] * 100).round(2)
+        filter_data[price_cols + ['Sharpe Ratio', 'Beta']] = filter_data[price_cols + ['Sharpe Ratio', 'Beta']].round(2)
+
+        visual_data = filter_data.copy()
+        visual_data[percent_cols] = visual_data[percent_cols].astype(str) + '%'
+        visual_data[price_cols] = f'{self._currency} ' + visual_data[price_cols].astype(str)
+        visual_data[['Sharpe Ratio', 'Beta']] = visual_data[['Sharpe Ratio', 'Beta']].astype(str)
+        visual_data['Time to Recovery'] = visual_data['Time to Recovery'].astype(str).replace('<NA>', 'Not Recovered')
+
+        return visual_data.rename(columns=names), filter_data.rename(columns=names)
 
 
     # More info on individual stocks
@@ -160,9 +199,14 @@ class MarketScreener:
 
     # Just a function to aggregate our results.
     def get_baseline_stats(self, frequency:str) -> pd.DataFrame:
+        return self._summary(self._baseline_stats(frequency=frequency), column='Summary')
+
+
+    # format a getPricestats tuple into a one column table
+    def _summary(self, stats:tuple, column:str) -> pd.DataFrame:
         # create a dataframe 
         tracker = {"D":"Days", "M":"Months", "W":"Weeks", "Q":"Quarters", "Y":"Years"}
-        startDate, endDate, no_of_periods, frequency, annual_ret, annual_vol, sharpe, max_drawdown, var, cvar, ret_1_ch, high, low, current_price = self._baseline_stats(frequency=frequency)
+        startDate, endDate, no_of_periods, frequency, annual_ret, annual_vol, sharpe, max_drawdown, var, cvar, ret_1_ch, high, low, current_price = stats
 
         return pd.DataFrame([
                              startDate.strftime("%Y-%m-%d"),
@@ -179,48 +223,128 @@ class MarketScreener:
                              f'{self._currency} {round(low, 2)}',
                              f'{self._currency} {round(current_price, 2)}'
                              ], index=['Start Date', 'End Date', f'Period (in {tracker[frequency]})', 'Annual Return', 'Annual Volatility', 'Sharpe Ratio', 
-                                       'Maximum Drawdown', 'VaR', 'cVaR', f'1 {tracker[frequency][:-1]} Change (%)', 'Highest Peak', 'Lowest Trough', 'Current Price'], columns=['Summary'])
+                                       'Maximum Drawdown', 'VaR', 'cVaR', f'1 {tracker[frequency][:-1]} Change (%)', 'Highest Peak', 'Lowest Trough', 'Current Price'], columns=[column])
     
 
     def assetAllocation(self, cash:float, opt_method:str, use_method:str, frequency:str, value_col:str, stock_list:list) -> pd.DataFrame:
-        # price data
-        price_data = self._data_loader.getAllindexdata()[[value_col, 'TIC']].reset_index().set_index(['Date', 'TIC']).unstack()
-        price_data.columns = price_data.columns.droplevel()
-        price_data.columns.name = None
+        # the allocation modules pull in pypfopt and cvxpy, only loaded once an allocation is asked for
+        from portfolio_allocation.allocator import asset_allocation
 
-        # take only mentioned tickers
-        price_data = price_data[stock_list]
-
-        # resample to frequency
-        price_data = self._data_loader.resample_df(price_data, frequency=frequency)
+        # mentioned tickers, from the cached resample of the whole universe
+        price_data = self._resampled_prices(frequency, value_col=value_col)[stock_list].dropna()
         
         # get the allocations
         allocations = asset_allocation(cash=cash, df=price_data, opt_method=opt_method, frequency=frequency, use_method=use_method)
 
         return allocations
     
-    def correlation_matrix(self, stock_list:list, frequency:str, value_col:str) -> pd.DataFrame:
-        # correlation matrix
-        price_data = self._data_loader.getAllindexdata()[[value_col, 'TIC']].reset_index().set_index(['Date', 'TIC']).unstack()
-        price_data.columns = price_data.columns.droplevel()
-        price_data.columns.name = None
+    def hrpAllocation(self, cash:float, frequency:str, value_col:str, stock_list:list=None) -> pd.DataFrame:
+        # hierarchical risk parity over the whole universe, or a subset pruned from the cached universe tree
+        from portfolio_allocation.hrp import hrp_allocation
 
-        # take only mentioned tickers
-        price_data = price_data[stock_list]
-        
-        # resample to frequency
-        price_data = self._data_loader.resample_df(price_data, frequency=frequency)
+        prices = self._resampled_prices(frequency, value_col=value_col).dropna(how="all")
+        return hrp_allocation(cash=cash, prices=prices, tickers=stock_list or None)
+
+    def allocationSweep(self, frequency:str, value_col:str, stock_list:list, lookbacks:list=None, workers:int=None) -> pd.DataFrame:
+        # every optimisation method x covariance estimator (x lookback) on the mentioned tickers
+        from portfolio_allocation.sweep import allocation_sweep
+
+        price_data = self._resampled_prices(frequency, value_col=value_col)[stock_list].dropna()
+        return allocation_sweep(price_data, frequency=frequency, lookbacks=lookbacks, workers=workers)
+
+    def efficientFrontier(self, frequency:str, value_col:str, stock_list:list, use_method:str="ledoit_wolf", points:int=100) -> dict:
+        # efficient frontier of the mentioned tickers with its min variance and tangency portfolios
+        from portfolio_allocation.frontier import efficient_frontier
+
+        price_data = self._resampled_prices(frequency, value_col=value_col)[stock_list].dropna()
+        return efficient_frontier(price_data, frequency=frequency, use_method=use_method, points=points)
+
+    def backtestAllocation(self, cash:float, opt_method:str, use_method:str, frequency:str, value_col:str, stock_list:list,
+                           rebalance:str="M", train_window:int=252, cost:float=0.001) -> tuple:
+        # walk forward backtest of an allocation method on the daily prices of the mentioned tickers
+        from backtest.walk_forward import walk_forward_backtest
+
+        result = walk_forward_backtest(self._wide_prices(value_col)[stock_list], opt_method=opt_method, frequency=frequency, use_method=use_method,
+                                       cash=cash, rebalance=rebalance, train_window=train_window, cost=cost)
+        if result is None:
+            return None, None
+
+        summary = self._summary(result['stats'], column=opt_method)
+        summary.loc['Rebalances'] = str(len(result['turnover']))
+        summary.loc['Average Turnover'] = f"{round(result['turnover'].mean()*100, 2)}%"
+        summary.loc['Transaction Costs'] = f"{self._currency} {round(result['costs'].sum(), 2)}"
+
+        return summary, result
+
+    def correlation_matrix(self, stock_list:list, frequency:str, value_col:str) -> pd.DataFrame:
+        # correlation matrix of the mentioned tickers, from the cached resample of the whole universe
+        price_data = self._resampled_prices(frequency, value_col=value_col)[stock_list].dropna()
         corr_df = corr_cals(price_data)
         return corr_df
 
-    def filterDatabase(self, filters:list, frequency:str) -> pd.DataFrame:
-        return filter_database(self._filter_data, filters=filters, frequency=frequency)
+    # correlation matrix of the whole universe, loaded from disk when it was already built today
+    def _correlation_engine(self, frequency:str) -> CorrelationEngine:
+        if frequency not in self._correlations:
+            prices = self._resampled_prices(frequency)
+            engine = CorrelationEngine(index=self.indexes, root="data")
+            if not engine.load(prices, frequency=frequency):
+                engine.build(prices, frequency=frequency)
+            self._correlations[frequency] = engine
+
+        return self._correlations[frequency]
 
-    def getAllDetails(self) -> tuple:
+    def correlated_stocks(self, stock_name:str, frequency:str, k:int=10, least:bool=False) -> pd.DataFrame:
+        # most / least correlated stocks of the index
+        return self._correlation_engine(frequency).top_k(stock_name, k=k, least=least)
+
+    def correlation_clusters(self, frequency:str, min_correlation:float=0.7) -> pd.DataFrame:
+        # groups of stocks of the index moving together
+        return self._correlation_engine(frequency).clusters(min_correlation=min_correlation)
+
+    # beta, alpha, R-squared and tracking error of every stock against the baseline, computed once per frequency
+    def baseline_regression(self, frequency:str) -> pd.DataFrame:
+        try:
+            if frequency not in self._regressions:
+                prices = self._resampled_prices(frequency)
+                returns = pd.DataFrame(period_returns(prices.to_numpy(dtype=float)), index=prices.index, columns=prices.columns)
+                baseline_returns = self._data_loader.resampler(dataType="baseline", frequency=frequency)['Adj Close'].pct_change()
+                self._regressions[frequency] = index_regression(returns, baseline_returns, frequency=frequency).round(2)
+
+            return self._regressions[frequency]
+        except Exception as e:
+            logger.info(f"problem {e} in baseline_regression() at line no. = {get_exception_line_no()}, index = {self.indexes}")
+
+    # rolling volatility, Sharpe ratio, maximum drawdown and beta of every stock, computed once per (frequency, window)
+    def rolling_analytics(self, frequency:str, window:int) -> dict:
+        if (frequency, window) not in self._rolling:
+            baseline = self._data_loader.resampler(dataType="baseline", frequency=frequency)['Adj Close']
+            self._rolling[(frequency, window)] = rolling_stats(self._resampled_prices(frequency), window, frequency=frequency, baseline=baseline)
+
+        return self._rolling[(frequency, window)]
+
+    def trending_stocks(self, metric:str, frequency:str, window:int, lookback:int, falling:bool=False) -> pd.DataFrame:
+        # stocks whose rolling metric (e.g. 'Beta') rose / fell over the last lookback periods
+        try:
+            return rising(self.rolling_analytics(frequency, window)[metric], lookback, falling=falling).round(2)
+        except Exception as e:
+            logger.info(f"problem {e} in trending_stocks() at line no. = {get_exception_line_no()}, index = {self.indexes}")
+
+    def filterDatabase(self, filters:list, frequency:str) -> pd.DataFrame:
+        # None when the stats of the frequency could not be computed (see the logs)
+        self._index_stocks_stats(frequency)
+        tables = self._stats.get(frequency)
+        if tables is None:
+            return None
+        return filter_database(tables[1], filters=filters, frequency=frequency)
+
+    def getAllDetails(self, frequency:str=None) -> tuple:
+        if frequency is not None:
+            self._index_stocks_stats(frequency)
+            return self._stats.get(frequency, (None, None))
         return self._visual_data, self._filter_data
     
     def getAllindexdata(self) -> pd.DataFrame:
-        return self._all_stocks
+        return self._data_loader.getAllindexdata()
     
     def save_index_stats(self) -> None:
         try:
@@ -233,11 +357,10 @@ class MarketScreener:
         Calculates the beta of stocks.
         """
         try:
-            price_returns = price_series['Adj Close'].pct_change() # calculate price returns
+            price_returns = price_series[['Adj Close']].pct_change() # calculate price returns
             baseline_returns = baseline_price_series['Adj Close'].pct_change() # calculate baseline price return
-            covariance = price_returns.cov(baseline_returns)
 
-            # return the beta of the stock.
-            return covariance / baseline_returns.var()
+            # return the beta of the stock, aligned to the baseline calendar.
+            return index_regression(price_returns, baseline_returns)['Beta'].iloc[0]
         except Exception as e:
             logger.info(f"problem inside calculate_beta() - {e}, at line no. = {get_exception_line_no()}")
\ No newline at end of file
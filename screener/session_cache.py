@@ -0,0 +1,79 @@
+import pandas as pd
+
+from utils.memory_cache import MemoryCache
+
+
+def slice_dates(df:pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """
+    Rows of a date-indexed DataFrame between two dates (inclusive). The index does not have to be sorted.
+    """
+    return df[(df.index >= pd.Timestamp(start_date)) & (df.index <= pd.Timestamp(end_date))]
+
+
+class SessionCache(MemoryCache):
+
+    def __init__(self, max_bytes:int=2 * 1024 ** 3) -> None:
+        """
+        Initialize a SessionCache instance.
+
+        An in-process LRU cache (``MemoryCache``) shared by the MarketScreener instances of a session. It holds the
+        loaded price panels of an index (baseline, tickers and constituent prices) keyed by (index, start date,
+        end date) and the computed stats tables keyed by (index, start date, end date, frequency). When the total
+        footprint exceeds ``max_bytes`` the least recently used entries are evicted. Every access holds a lock, so
+        the cache can be shared by screeners running on different threads (e.g. the indexes of the HTTP API).
+
+        :param max_bytes: The memory budget of the cache in bytes.
+        :type max_bytes: int, optional
+
+        :return: None
+        """
+        super().__init__(max_bytes=max_bytes)
+
+
+    def get_panel(self, index:str, start_date, end_date) -> dict:
+        """
+        Get the price panel of an index over [start_date, end_date].
+
+        An exact hit is returned as is; otherwise any cached panel of the same index covering the requested
+        range is sliced down to it (e.g. after shrinking the lookback). Returns None if no panel covers the range.
+
+        :return: A dictionary with the 'baseline' DataFrame, the 'tickers' list and the price 'panel'.
+        :rtype: dict
+        """
+        start, end = pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()
+        panel = self.get(("panel", index, start, end))
+        if panel is not None:
+            return panel
+
+        # the covering panel may be evicted by another thread in between
+        covering = [key for key in self.keys() if key[0] == "panel" and key[1] == index and key[2] <= start and key[3] >= end]
+        panel = self.get(covering[-1]) if len(covering) > 0 else None
+        if panel is not None:
+            return {'baseline': slice_dates(panel['baseline'], start, end + pd.Timedelta(days=1)),
+                    'tickers': panel['tickers'],
+                    'panel': panel['panel'].slice(start, end + pd.Timedelta(days=1))}
+
+
+    def put_panel(self, index:str, start_date, end_date, panel:dict) -> None:
+        """
+        Cache the price panel ('baseline', 'tickers' and 'panel') of an index over [start_date, end_date].
+        """
+        self.put(("panel", index, pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize()), panel)
+
+
+    def get_stats(self, index:str, start_date, end_date, frequency:str) -> tuple:
+        """
+        Get the (visual, filter) stats tables of an index over [start_date, end_date] at a frequency, or None.
+        """
+        return self.get(("stats", index, pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize(), frequency))
+
+
+    def put_stats(self, index:str, start_date, end_date, frequency:str, tables:tuple) -> None:
+        """
+        Cache the (visual, filter) stats tables of an index over [start_date, end_date] at a frequency.
+        """
+        self.put(("stats", index, pd.Timestamp(start_date).normalize(), pd.Timestamp(end_date).normalize(), frequency), tables)
+
+
+# cache shared by every MarketScreener of the session
+session_cache = SessionCache()
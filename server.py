@@ -0,0 +1,280 @@
+"""
+Local HTTP API of AlphaTracker, keeping a warm MarketScreener per index in memory.
+
+    >>> python server.py --port 8050 --preload NIFTY_50 SP500
+
+Every endpoint is a GET returning JSON (a DataFrame in pandas' "split" orientation):
+
+    /baseline?index=NIFTY_50&frequency=W
+    /all-stats?index=NIFTY_50&frequency=W
+    /screen?index=NIFTY_50&frequency=W&filter=AV%20%3C%2030%20AND%20SR%20%3E%201
+    /allocate?index=NIFTY_50&frequency=W&cash=100000&method=min_vol&estimator=sample_cov&tickers=TCS.NS,INFY.NS
+    /single?index=NIFTY_50&frequency=W&ticker=TCS.NS
+    /corr?index=NIFTY_50&frequency=W&tickers=TCS.NS,INFY.NS
+    /trending?index=NIFTY_50&frequency=D&metric=beta&window=60&periods=60&falling=false
+    /regression?index=NIFTY_50&frequency=W
+    /backtest?index=NIFTY_50&frequency=W&cash=100000&method=min_vol&estimator=sample_cov&rebalance=M&train_window=252&cost=0.001&tickers=TCS.NS,INFY.NS
+    /sweep?index=NIFTY_50&frequency=W&lookbacks=52,104&tickers=TCS.NS,INFY.NS,WIPRO.NS
+    /health
+
+``lookback`` (days, default the server's) can be added to any endpoint; the ``--max-screeners`` most recently
+used (index, lookback) pairs are kept loaded.
+"""
+import json
+import asyncio
+import argparse
+
+from urllib.parse import urlsplit, parse_qs
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from cli import run_command, ROLLING_METRICS
+from logger._logger import logger, get_exception_line_no
+from screener.investor import MarketScreener
+from screener.session_cache import session_cache
+from utils.global_variables import INDEXES, CURRENCIES
+
+logger_server = logger.getLogger("server")
+
+ENDPOINTS = ["baseline", "all-stats", "screen", "allocate", "single", "corr", "trending", "regression", "backtest", "sweep"]
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+def load_screener(index:str, lookback:int) -> MarketScreener:
+    """
+    Load an index into a ready MarketScreener.
+    """
+    investor = MarketScreener(indexes=index, lookback=lookback, currency=CURRENCIES.get(index, '₹'), cache=session_cache)
+    investor._select_index()
+    return investor
+
+
+def parse_options(endpoint:str, query:dict, lookback:int) -> dict:
+    """
+    The options of ``cli.run_command`` from the query string of a request.
+    """
+    def value(name:str, default=None):
+        values = query.get(name)
+        if not values:
+            if default is None:
+                raise ValueError(f"missing parameter {name}")
+            return default
+        return values[0]
+
+    index = value('index')
+    if index not in INDEXES:
+        raise ValueError(f"unknown index {index}")
+
+    options = {'index': index, 'lookback': int(value('lookback', lookback)), 'frequency': value('frequency', 'D').upper()}
+    if endpoint == "screen":
+        options['filter'] = value('filter')
+    elif endpoint == "allocate":
+        options.update({'cash': float(value('cash')), 'method': value('method', 'max_sharpe'), 'estimator': value('estimator', 'ledoit_wolf'),
+                        'tickers': [ticker.upper() for ticker in value('tickers', '').split(',') if ticker]})
+    elif endpoint == "backtest":
+        options.update({'cash': float(value('cash')), 'method': value('method', 'max_sharpe'), 'estimator': value('estimator', 'ledoit_wolf'),
+                        'tickers': [ticker.upper() for ticker in value('tickers').split(',') if ticker], 'rebalance': value('rebalance', 'M').upper(),
+                        'train_window': int(value('train_window', 252)), 'cost': float(value('cost', 0.001))})
+    elif endpoint == "sweep":
+        options.update({'tickers': [ticker.upper() for ticker in value('tickers').split(',') if ticker],
+                        'lookbacks': [int(lookback) for lookback in value('lookbacks', '').split(',') if lookback], 'sweep_workers': None})
+    elif endpoint == "single":
+        options['ticker'] = value('ticker').upper()
+    elif endpoint == "corr":
+        options['tickers'] = [ticker.upper() for ticker in value('tickers').split(',') if ticker]
+    elif endpoint == "trending":
+        options.update({'metric': value('metric', 'beta').lower(), 'window': int(value('window', 60)), 'periods': int(value('periods', 20)),
+                        'falling': value('falling', 'false').lower() in ("true", "1", "yes")})
+        if options['metric'] not in ROLLING_METRICS:
+            raise ValueError(f"unknown metric {options['metric']}, use one of {', '.join(ROLLING_METRICS)}")
+    return options
+
+
+class ScreenerService:
+
+    def __init__(self, lookback:int=365, loader=load_screener, max_screeners:int=4) -> None:
+        """
+        Initialize a ScreenerService instance.
+
+        The service keeps the loaded MarketScreener of the ``max_screeners`` most recently used (index, lookback)
+        pairs, so only the first request of an index pays for the download and every later one is served from the
+        warm price panel and stats memos. A load without data is not kept, the next request retries it. The work of an index runs on its own single thread, off the event loop and never on two
+        threads at once, while different indexes run in parallel. Requests are coalesced: concurrent identical
+        requests (and concurrent loads of the same index) await one shared computation.
+
+        :param lookback: The default lookback period in days.
+        :type lookback: int, optional
+
+        :param loader: A function (index, lookback) -> MarketScreener loading an index.
+        :type loader: callable, optional
+
+        :param max_screeners: The number of loaded screeners kept in memory.
+        :type max_screeners: int, optional
+
+        :return: None
+        """
+        self._lookback = lookback
+        self._loader = loader
+        self._max_screeners = max(max_screeners, 1)
+        self._screeners = OrderedDict()
+        self._executors = {}
+        self._inflight = {}
+        self.computations = 0
+        self.requests = 0
+
+
+    def _executor(self, index:str) -> ThreadPoolExecutor:
+        if index not in self._executors:
+            self._executors[index] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=''.join(index.split('/')))
+        return self._executors[index]
+
+
+    async def _coalesce(self, key:tuple, index:str, fn):
+        """
+        Run ``fn`` on the thread of ``index``, or join the identical computation already in flight.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            self.computations += 1
+            future = asyncio.get_running_loop().run_in_executor(self._executor(index), fn)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # a client going away must not cancel the computation other clients wait for
+        return await asyncio.shield(future)
+
+
+    async def screener(self, index:str, lookback:int) -> MarketScreener:
+        """
+        The warm screener of an index, loaded on first use; the least recently used screener is evicted beyond
+        ``max_screeners``.
+        """
+        key = (index, lookback)
+        if key not in self._screeners:
+            investor = await self._coalesce(("load",) + key, index, lambda: self._loader(index, lookback))
+            if not investor.has_data():
+                raise ValueError(f"no data loaded for {index} over {lookback} days")
+
+            self._screeners[key] = investor
+            while len(self._screeners) > self._max_screeners:
+                evicted, _ = self._screeners.popitem(last=False)
+                logger_server.info(f"Evicted screener {evicted}")
+
+        self._screeners.move_to_end(key)
+        return self._screeners[key]
+
+
+    async def query(self, endpoint:str, options:dict):
+        """
+        The result of an endpoint on the warm screener of the requested index.
+        """
+        investor = await self.screener(options['index'], options['lookback'])
+        key = (endpoint,) + tuple((name, tuple(value) if isinstance(value, list) else value) for name, value in sorted(options.items()))
+        return await self._coalesce(key, options['index'], lambda: run_command(endpoint, investor, options))
+
+
+    async def respond(self, target:str) -> tuple:
+        """
+        The (status, JSON body) of a request target.
+        """
+        url = urlsplit(target)
+        endpoint = url.path.strip("/")
+        self.requests += 1
+
+        if endpoint == "health":
+            return 200, json.dumps({'indexes': sorted({index for index, _ in self._screeners}), 'requests': self.requests,
+                                    'computations': self.computations})
+        if endpoint not in ENDPOINTS:
+            return 404, json.dumps({'error': f"unknown endpoint {endpoint}"})
+
+        try:
+            options = parse_options(endpoint, parse_qs(url.query), self._lookback)
+        except ValueError as e:
+            return 400, json.dumps({'error': str(e)})
+
+        try:
+            df = await self.query(endpoint, options)
+            if df is None:
+                return 400, json.dumps({'error': f"{endpoint} returned no result"})
+            return 200, df.to_json(orient="split", date_format="iso", default_handler=str)
+        except Exception as e:
+            logger_server.info(f"problem {e} in respond() at line no.={get_exception_line_no()}, target = {target}")
+            return 500, json.dumps({'error': str(e)})
+
+
+    async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        """
+        Serve the HTTP/1.1 requests of one connection, keeping it alive until the client closes it.
+        """
+        try:
+            while True:
+                request = await reader.readline()
+                if not request:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, header = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = header.strip()
+
+                parts = request.decode("latin-1").split()
+                if len(parts) != 3 or parts[0] != "GET":
+                    status, body = 400, json.dumps({'error': "only GET requests are supported"})
+                else:
+                    status, body = await self.respond(parts[1])
+
+                keep_alive = headers.get('connection', '').lower() != "close"
+                payload = body.encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+    async def serve(self, host:str="127.0.0.1", port:int=8050, preload:list=None) -> asyncio.base_events.Server:
+        """
+        Start listening (and load the ``preload`` indexes in the background). Returns the asyncio server.
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        for index in preload or []:
+            asyncio.ensure_future(self._preload(index))
+        return server
+
+
+    async def _preload(self, index:str) -> None:
+        try:
+            await self.screener(index, self._lookback)
+        except Exception as e:
+            logger_server.info(f"problem {e} in _preload() at line no.={get_exception_line_no()}, index = {index}")
+
+
+async def run(host:str, port:int, lookback:int, preload:list, max_screeners:int) -> None:
+    server = await ScreenerService(lookback=lookback, max_screeners=max_screeners).serve(host, port, preload=preload)
+    logger_server.info(f"Serving on {host}:{port}")
+    print(f"AlphaTracker API on http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv:list=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--lookback", type=int, default=365, help="default lookback period in days")
+    parser.add_argument("--preload", nargs="*", default=[], choices=INDEXES, help="indexes loaded at start up")
+    parser.add_argument("--max-screeners", type=int, default=4, help="loaded (index, lookback) pairs kept in memory")
+    args = parser.parse_args(argv)
+
+    asyncio.run(run(args.host, args.port, args.lookback, args.preload, args.max_screeners))
+
+
+if __name__ == "__main__":
+    main()
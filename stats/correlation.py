@@ -0,0 +1,283 @@
+import os
+import json
+import datetime
+import numpy as np
+import pandas as pd
+
+from logger._logger import logger, get_exception_line_no
+
+logger_corr = logger.getLogger("correlation")
+
+
+def simple_returns(prices:np.ndarray) -> np.ndarray:
+    """
+    Simple returns of a dates x tickers price matrix; NaN wherever the bar or the previous bar is missing.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return prices[1:] / prices[:-1] - 1
+
+
+def _block(x_a:np.ndarray, m_a:np.ndarray, x_b:np.ndarray, m_b:np.ndarray, statistic:str, min_periods:int) -> np.ndarray:
+    """
+    Pairwise-complete covariance or correlation between the columns of two blocks.
+
+    ``x`` are the returns with NaN set to 0 and ``m`` the 0/1 masks of the valid returns, so every sum below
+    only runs over the dates where both tickers of a pair have a return.
+    """
+    n = m_a.T @ m_b
+    sum_a, sum_b = x_a.T @ m_b, m_a.T @ x_b
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cross = x_a.T @ x_b - sum_a * sum_b / n
+        if statistic == "covariance":
+            values = cross / (n - 1)
+        else:
+            var_a = (x_a * x_a).T @ m_b - sum_a ** 2 / n
+            var_b = m_a.T @ (x_b * x_b) - sum_b ** 2 / n
+            values = np.clip(cross / np.sqrt(var_a * var_b), -1, 1)
+
+    values[n < max(min_periods, 2)] = np.nan
+    return values
+
+
+def blockwise_matrix(returns:np.ndarray, statistic:str="correlation", block_size:int=512, min_periods:int=2, out:np.ndarray=None) -> np.ndarray:
+    """
+    Calculate the full covariance or correlation matrix of a dates x tickers return matrix, block by block.
+
+    Missing returns are handled pairwise like ``DataFrame.corr``: every pair uses the dates on which both tickers
+    have a return. Only ``block_size`` columns of each side are expanded at a time and only the upper triangle of
+    blocks is computed, so the working memory stays bounded whatever the number of tickers.
+
+    :param returns: The returns, one column per ticker, NaN where missing.
+    :type returns: np.ndarray
+
+    :param statistic: "correlation" or "covariance".
+    :type statistic: str, optional
+
+    :param block_size: The number of tickers per block.
+    :type block_size: int, optional
+
+    :param min_periods: The minimum number of common returns for a pair, NaN below it.
+    :type min_periods: int, optional
+
+    :param out: An (n x n) array (e.g. a memory map) to write the matrix into (optional).
+    :type out: np.ndarray, optional
+
+    :return: The (tickers x tickers) matrix.
+    :rtype: np.ndarray
+    """
+    try:
+        returns = np.asarray(returns, dtype=np.float64)
+        valid = ~np.isnan(returns)
+        filled, mask = np.where(valid, returns, 0.0), valid.astype(np.float64)
+
+        size = returns.shape[1]
+        out = np.empty((size, size), dtype=np.float32) if out is None else out
+        for start_a in range(0, size, block_size):
+            stop_a = min(start_a + block_size, size)
+            x_a, m_a = filled[:, start_a:stop_a], mask[:, start_a:stop_a]
+
+            for start_b in range(start_a, size, block_size):
+                stop_b = min(start_b + block_size, size)
+                values = _block(x_a, m_a, filled[:, start_b:stop_b], mask[:, start_b:stop_b], statistic, min_periods)
+
+                # the matrix is symmetric, mirror every off-diagonal block
+                out[start_a:stop_a, start_b:stop_b] = values
+                out[start_b:stop_b, start_a:stop_a] = values.T
+
+        if statistic == "correlation":
+            diagonal = np.arange(size)
+            out[diagonal, diagonal] = np.where(np.isnan(out[diagonal, diagonal]), np.nan, 1.0)
+
+        return out
+    except Exception as e:
+        logger_corr.info(f"problem {e} in blockwise_matrix() at line no.={get_exception_line_no()}")
+
+
+class CorrelationEngine:
+
+    def __init__(self, index:str, root:str="data", block_size:int=512, min_periods:int=10) -> None:
+        """
+        Initialize a CorrelationEngine instance.
+
+        The engine computes the correlation matrix of the returns of a whole index universe with
+        ``blockwise_matrix``, persists it as a memory-mapped ``.npy`` file per frequency
+        (``<root>/CORR<index>/<frequency>.npy`` with a ``.json`` of the tickers and the covered dates) and
+        answers top-K neighbour and clustering queries from it without loading the whole matrix.
+
+        :param index: The financial index whose universe is correlated.
+        :type index: str
+
+        :param root: The directory holding the matrices.
+        :type root: str, optional
+
+        :param block_size: The number of tickers per block.
+        :type block_size: int, optional
+
+        :param min_periods: The minimum number of common returns for a pair to get a correlation.
+        :type min_periods: int, optional
+
+        :return: None
+        """
+        self._index = index
+        self._path = os.path.join(root, f"CORR{''.join(index.split('/'))}")
+        self._block_size = block_size
+        self._min_periods = min_periods
+        self._matrix = None
+        self._tickers = []
+        self._columns = {}
+
+
+    def _files(self, frequency:str) -> tuple:
+        return os.path.join(self._path, f"{frequency}.npy"), os.path.join(self._path, f"{frequency}.json")
+
+
+    def _meta(self, prices:pd.DataFrame) -> dict:
+        return {'updated': datetime.datetime.now().date().isoformat(), 'start': prices.index[0].date().isoformat(),
+                'end': prices.index[-1].date().isoformat(), 'tickers': [str(ticker) for ticker in prices.columns]}
+
+
+    def _attach(self, matrix:np.ndarray, tickers:list) -> None:
+        self._matrix = matrix
+        self._tickers = list(tickers)
+        self._columns = {ticker: position for position, ticker in enumerate(self._tickers)}
+
+
+    def load(self, prices:pd.DataFrame, frequency:str) -> bool:
+        """
+        Attach the persisted matrix of ``frequency`` if it was built today from the same dates and tickers.
+
+        :param prices: The resampled prices the matrix should have been built from.
+        :type prices: pd.DataFrame
+
+        :param frequency: The frequency of the prices.
+        :type frequency: str
+
+        :return: True if the persisted matrix is current and was attached.
+        :rtype: bool
+        """
+        try:
+            matrix_file, meta_file = self._files(frequency)
+            if not os.path.exists(meta_file):
+                return False
+
+            with open(meta_file) as file:
+                meta = json.load(file)
+            if meta != self._meta(prices):
+                return False
+
+            self._attach(np.load(matrix_file, mmap_mode="r"), meta['tickers'])
+            return True
+        except Exception as e:
+            logger_corr.info(f"problem {e} in load() at line no.={get_exception_line_no()}, index = {self._index}")
+            return False
+
+
+    def build(self, prices:pd.DataFrame, frequency:str) -> None:
+        """
+        Compute and persist the correlation matrix of the returns of ``prices``.
+
+        :param prices: Resampled prices, indexed by date with one column per ticker.
+        :type prices: pd.DataFrame
+
+        :param frequency: The frequency of the prices.
+        :type frequency: str
+
+        :return: None
+        """
+        try:
+            os.makedirs(self._path, exist_ok=True)
+            matrix_file, meta_file = self._files(frequency)
+
+            # written straight to disk block by block, the full matrix is never held in memory
+            size = prices.shape[1]
+            matrix = np.lib.format.open_memmap(matrix_file, mode="w+", dtype=np.float32, shape=(size, size))
+            blockwise_matrix(simple_returns(prices.to_numpy()), statistic="correlation", block_size=self._block_size,
+                             min_periods=self._min_periods, out=matrix)
+            matrix.flush()
+
+            meta = self._meta(prices)
+            with open(meta_file, "w") as file:
+                json.dump(meta, file)
+
+            self._attach(np.load(matrix_file, mmap_mode="r"), meta['tickers'])
+            logger_corr.info(f"Built correlation matrix of {size} tickers, frequency = {frequency}, index = {self._index}")
+        except Exception as e:
+            logger_corr.info(f"problem {e} in build() at line no.={get_exception_line_no()}, index = {self._index}")
+
+
+    def matrix(self, tickers:list=None) -> pd.DataFrame:
+        """
+        The correlation matrix of all (or the given) tickers.
+        """
+        tickers = self._tickers if tickers is None else list(tickers)
+        positions = [self._columns[ticker] for ticker in tickers]
+        return pd.DataFrame(np.asarray(self._matrix[np.ix_(positions, positions)]), index=tickers, columns=tickers)
+
+
+    def top_k(self, ticker:str, k:int=10, least:bool=False) -> pd.DataFrame:
+        """
+        The ``k`` tickers most (or least) correlated with ``ticker``.
+
+        :param ticker: The ticker to find neighbours of.
+        :type ticker: str
+
+        :param k: The number of neighbours.
+        :type k: int, optional
+
+        :param least: Return the least correlated tickers instead.
+        :type least: bool, optional
+
+        :return: A DataFrame indexed by ticker with the 'Correlation', sorted.
+        :rtype: pd.DataFrame
+        """
+        try:
+            position = self._columns[ticker]
+            row = np.array(self._matrix[position], dtype=np.float64)
+            row[position] = np.nan
+
+            # only the row of the ticker is read from the memory map
+            candidates = np.flatnonzero(~np.isnan(row))
+            order = candidates[np.argsort(row[candidates] if least else -row[candidates], kind="stable")][:k]
+
+            return pd.DataFrame({'Correlation': row[order].round(2)}, index=[self._tickers[i] for i in order])
+        except Exception as e:
+            logger_corr.info(f"problem {e} in top_k() at line no.={get_exception_line_no()}, ticker = {ticker}")
+
+
+    def clusters(self, min_correlation:float=0.7) -> pd.DataFrame:
+        """
+        Group the tickers by average-linkage hierarchical clustering on the correlation distance (1 - correlation).
+
+        :param min_correlation: The minimum average correlation between the members of a cluster.
+        :type min_correlation: float, optional
+
+        :return: A DataFrame with the 'Size', 'Average Correlation' and 'Tickers' of every cluster of two or more
+                 tickers, largest first.
+        :rtype: pd.DataFrame
+        """
+        from scipy.cluster.hierarchy import linkage, fcluster  # scipy is slow to import, only loaded when clustering
+        from scipy.spatial.distance import squareform
+
+        try:
+            # pairs without enough common returns are treated as uncorrelated
+            distance = 1 - np.nan_to_num(np.asarray(self._matrix, dtype=np.float64), nan=0.0)
+            np.fill_diagonal(distance, 0)
+            labels = fcluster(linkage(squareform(np.clip(distance, 0, 2), checks=False), method="average"),
+                              t=1 - min_correlation, criterion="distance")
+
+            rows = []
+            for label in np.unique(labels):
+                members = np.flatnonzero(labels == label)
+                if len(members) < 2:
+                    continue
+                block = np.asarray(self._matrix[np.ix_(members, members)], dtype=np.float64)
+                average = np.nanmean(block[~np.eye(len(members), dtype=bool)])
+                rows.append((len(members), round(average, 2), ", ".join(self._tickers[i] for i in members)))
+
+            clusters = pd.DataFrame(rows, columns=['Size', 'Average Correlation', 'Tickers'])
+            clusters = clusters.sort_values(['Size', 'Average Correlation'], ascending=False, ignore_index=True)
+            clusters.index = clusters.index + 1
+            return clusters
+        except Exception as e:
+            logger_corr.info(f"problem {e} in clusters() at line no.={get_exception_line_no()}, index = {self._index}")
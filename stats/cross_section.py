@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+
+from stats.price_stats import TIME_TRACKER, PERIODS_PER_YEAR
+from stats.drawdown import forward_fill, drawdown_analytics
+from logger._logger import logger, get_exception_line_no
+
+logger_cross = logger.getLogger("cross_section")
+
+
+def pivot_prices(df:pd.DataFrame, value_col:str="Adj Close", tic_col:str="TIC") -> pd.DataFrame:
+    """
+    Pivot a long price frame (one row per date and ticker) into a dates x tickers matrix.
+
+    :param df: Long DataFrame indexed by date with a ticker column.
+    :type df: pd.DataFrame
+
+    :param value_col: The column holding the values to spread across tickers.
+    :type value_col: str, optional
+
+    :param tic_col: The column holding the ticker symbol.
+    :type tic_col: str, optional
+
+    :return: A DataFrame indexed by date with one column per ticker.
+    :rtype: pd.DataFrame
+    """
+    try:
+        date_col = df.index.name or "Date"
+        long_df = df[[value_col, tic_col]].reset_index()
+        long_df.columns = [date_col, value_col, tic_col]
+        long_df = long_df.drop_duplicates(subset=[date_col, tic_col], keep="last")
+
+        wide = long_df.pivot(index=date_col, columns=tic_col, values=value_col).sort_index()
+        wide.columns = wide.columns.astype(str)
+        wide.columns.name = None
+        return wide
+    except Exception as e:
+        logger_cross.info(f"problem {e} in pivot_prices() at line no.={get_exception_line_no()}")
+
+
+def period_returns(values:np.ndarray) -> np.ndarray:
+    """
+    Simple returns of every column of a dates x tickers array.
+
+    Each column is treated as its own series with the missing rows dropped, i.e. the return on a
+    valid row is measured against the previous valid row of that column. Rows where the column has
+    no price, and the first valid row of each column, are NaN.
+    """
+    filled = forward_fill(values)
+    previous = np.vstack([np.full((1, values.shape[1]), np.nan), filled[:-1]])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = filled / previous - 1
+
+    returns[np.isnan(values)] = np.nan
+    return returns
+
+
+def index_regression(returns:pd.DataFrame, baseline_returns:pd.Series, frequency:str="D") -> pd.DataFrame:
+    """
+    Regress every column of a returns matrix on the baseline returns in one vectorised pass.
+
+    The baseline returns and variance are computed once and the whole return matrix is aligned to the baseline
+    calendar with a single reindex. Every statistic of a ticker uses the dates on which both the ticker and the
+    baseline have a return, except the baseline variance of the beta which uses the whole baseline series,
+    mirroring ``pd.Series.cov`` / ``pd.Series.var``.
+
+    :param returns: Returns, indexed by date with one column per ticker.
+    :type returns: pd.DataFrame
+
+    :param baseline_returns: Returns of the baseline index.
+    :type baseline_returns: pd.Series
+
+    :param frequency: The frequency of the returns (e.g., "D" for daily), used to annualise.
+    :type frequency: str, optional
+
+    :return: A DataFrame indexed by ticker with the 'Beta', Jensen's 'Alpha' (annualised, zero risk-free rate),
+             'Correlation', 'R-Squared' and annualised 'Tracking Error' against the baseline.
+    :rtype: pd.DataFrame
+    """
+    base = baseline_returns.dropna()
+    aligned = returns.reindex(base.index).to_numpy(dtype=np.float64)
+    base = base.to_numpy(dtype=np.float64)
+    base_variance = np.var(base, ddof=1) if len(base) > 1 else np.nan
+
+    mask = ~np.isnan(aligned)
+    n = mask.sum(axis=0)
+
+    x = np.where(mask, aligned, 0.0)
+    y = np.where(mask, base[:, None], 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean, y_mean = x.sum(axis=0) / n, y.sum(axis=0) / n
+        dx, dy = (x - x_mean) * mask, (y - y_mean) * mask
+        covariance = (dx * dy).sum(axis=0) / (n - 1)
+        correlation = covariance / np.sqrt((dx * dx).sum(axis=0) * (dy * dy).sum(axis=0) / (n - 1) ** 2)
+
+        beta = covariance / base_variance
+        alpha = (x_mean - beta * y_mean) * PERIODS_PER_YEAR[frequency]
+
+        # volatility of the active (stock - baseline) returns
+        active = (dx - dy) * mask
+        tracking_error = np.sqrt((active * active).sum(axis=0) / (n - 1)) * np.sqrt(PERIODS_PER_YEAR[frequency])
+
+    return pd.DataFrame({'Beta': beta, 'Alpha': alpha, 'Correlation': correlation, 'R-Squared': correlation ** 2,
+                         'Tracking Error': tracking_error}, index=returns.columns)
+
+
+def betas(returns:pd.DataFrame, baseline_returns:pd.Series) -> np.ndarray:
+    """
+    Beta of every column of a returns matrix against the baseline returns (see ``index_regression``).
+    """
+    return index_regression(returns, baseline_returns)['Beta'].to_numpy()
+
+
+def getCrossSectionalstats(prices:pd.DataFrame, frequency:str="M", daily_prices:pd.DataFrame=None, baseline:pd.Series=None) -> pd.DataFrame:
+    """
+    Calculate the price statistics of every ticker in a dates x tickers price matrix at once.
+
+    This is the vectorised counterpart of ``getPricestats``: every column of ``prices`` is treated as one
+    security (missing rows are skipped exactly as if the column had been sliced out and ``dropna``-ed)
+    and the same statistics are produced for all of them with a handful of NumPy reductions.
+
+    :param prices: Resampled prices, indexed by date with one column per ticker.
+    :type prices: pd.DataFrame
+
+    :param frequency: The frequency of ``prices`` (e.g., "M" for monthly).
+    :type frequency: str, optional
+
+    :param daily_prices: Un-resampled prices used for the beta calculation (optional).
+    :type daily_prices: pd.DataFrame, optional
+
+    :param baseline: Un-resampled baseline index prices used for the beta calculation (optional).
+    :type baseline: pd.Series, optional
+
+    :return: A DataFrame indexed by ticker with the start date, end date, number of periods, annual return,
+             annual volatility, Sharpe ratio, maximum drawdown (``price / peak - 1``), VaR, cVaR, the last
+             one-period change, highest price, lowest price, current price, drawdown duration, time to recovery,
+             peak and trough dates of the maximum drawdown and beta. Tickers with fewer than two prices are dropped.
+    :rtype: pd.DataFrame
+    """
+    try:
+        prices = prices.loc[:, prices.notna().sum() >= 2]
+        values = prices.to_numpy(dtype=np.float64)
+        cols = np.arange(values.shape[1])
+        valid = ~np.isnan(values)
+
+        # first and last valid row of every ticker
+        first_idx = valid.argmax(axis=0)
+        last_idx = len(values) - 1 - valid[::-1].argmax(axis=0)
+        startDate, endDate = prices.index[first_idx], prices.index[last_idx]
+        no_of_periods = np.asarray((endDate - startDate).days) // TIME_TRACKER[frequency]
+
+        first_price, current_price = values[first_idx, cols], values[last_idx, cols]
+        returns = period_returns(values)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Annual Return
+            cumret = current_price / first_price - 1
+            annual_ret = (cumret / no_of_periods) * PERIODS_PER_YEAR[frequency]
+
+            # Annual Volatility (the first period counts as a zero return)
+            filled_returns = returns.copy()
+            filled_returns[first_idx, cols] = 0
+            annual_vol = np.nanstd(filled_returns, axis=0) * np.sqrt(PERIODS_PER_YEAR[frequency])
+
+            # Sharpe Ratio
+            sharpe = annual_ret / annual_vol
+
+            # Maximum Drawdown, from the same drawdown series as its duration, recovery, peak and trough
+            drawdowns = drawdown_analytics(prices)
+
+            # var and cVar
+            var = -np.nanpercentile(returns, 5, axis=0)
+            is_beyond = returns <= -var
+            cvar = -np.where(is_beyond, returns, 0).sum(axis=0) / is_beyond.sum(axis=0)
+
+        stats = pd.DataFrame({
+            "Start Date": startDate,
+            "End Date": endDate,
+            "Periods": no_of_periods,
+            "Annual Return": annual_ret,
+            "Annual Volatility": annual_vol,
+            "Sharpe Ratio": sharpe,
+            "Maximum Drawdown": drawdowns["Maximum Drawdown"].to_numpy(),
+            "VaR": var,
+            "cVaR": cvar,
+            "1 Period Change": filled_returns[last_idx, cols],
+            "Highest Peak": np.nanmax(values, axis=0),
+            "Lowest Trough": np.nanmin(values, axis=0),
+            "Current Price": current_price,
+            "Drawdown Duration": drawdowns["Drawdown Duration"].to_numpy(),
+            "Time to Recovery": drawdowns["Time to Recovery"].to_numpy(),
+            "Peak Date": drawdowns["Peak Date"].to_numpy(),
+            "Trough Date": drawdowns["Trough Date"].to_numpy(),
+        }, index=prices.columns)
+
+        # beta of every stock against the baseline
+        if daily_prices is not None and baseline is not None:
+            daily_prices = daily_prices.reindex(columns=prices.columns)
+            daily_returns = pd.DataFrame(period_returns(daily_prices.to_numpy(dtype=np.float64)), index=daily_prices.index, columns=daily_prices.columns)
+            stats["Beta"] = betas(daily_returns, baseline.pct_change())
+        else:
+            stats["Beta"] = np.nan
+
+        return stats
+    except Exception as e:
+        logger_cross.info(f"problem {e} in getCrossSectionalstats() at line no.={get_exception_line_no()}")
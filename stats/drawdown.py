@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from logger._logger import logger, get_exception_line_no
+
+logger_drawdown = logger.getLogger("drawdown")
+
+
+def forward_fill(values:np.ndarray) -> np.ndarray:
+    """
+    Forward fill NaNs down each column of a 2-D array.
+    """
+    rows = np.arange(values.shape[0])[:, None]
+    idx = np.where(~np.isnan(values), rows, 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return values[idx, np.arange(values.shape[1])]
+
+
+def running_peak(prices:np.ndarray) -> np.ndarray:
+    """
+    Running maximum of a 1-D price array or of every column of a 2-D (dates x tickers) array.
+
+    NaNs are skipped, so the peak carries over missing rows and is NaN only before the first price.
+    """
+    return np.fmax.accumulate(np.asarray(prices, dtype=np.float64), axis=0)
+
+
+def drawdown_analytics(prices, peak:np.ndarray=None) -> pd.DataFrame:
+    """
+    Calculate the drawdown profile of one or many price series in a single vectorised pass.
+
+    Drawdowns are measured against the running peak (``price / peak - 1``). Durations are counted in
+    periods of the series itself, i.e. rows where a column has no price are skipped.
+
+    :param prices: A price Series, a dates x tickers DataFrame, or a 1-D / 2-D array.
+    :type prices: pd.Series | pd.DataFrame | np.ndarray
+
+    :param peak: A precomputed ``running_peak(prices)`` to reuse (optional).
+    :type peak: np.ndarray, optional
+
+    :return: A DataFrame with one row per series holding the maximum drawdown, the longest drawdown duration,
+             the time to recovery from the maximum drawdown (NaN if not yet recovered) and the peak, trough and
+             recovery dates of the maximum drawdown.
+    :rtype: pd.DataFrame
+    """
+    try:
+        if isinstance(prices, pd.DataFrame):
+            dates, names = prices.index, prices.columns
+        elif isinstance(prices, pd.Series):
+            dates, names = prices.index, [prices.name]
+        else:
+            dates, names = None, None
+
+        values = np.asarray(prices, dtype=np.float64)
+        values = values.reshape(len(values), -1)
+        names = names if names is not None else range(values.shape[1])
+        peak = running_peak(values) if peak is None else np.asarray(peak).reshape(values.shape)
+
+        rows, cols = np.arange(len(values))[:, None], np.arange(values.shape[1])
+        valid = ~np.isnan(values)
+        position = np.cumsum(valid, axis=0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = forward_fill(values) / peak - 1
+        underwater = valid & (drawdown < 0)
+
+        # longest run of periods spent below the previous peak
+        last_high = np.maximum.accumulate(np.where(valid & ~underwater, position, 0), axis=0)
+        duration = np.where(underwater, position - last_high, 0).max(axis=0)
+
+        # maximum drawdown and the peak it is measured from
+        trough = np.where(valid, drawdown, np.inf).argmin(axis=0)
+        max_drawdown = drawdown[trough, cols]
+        at_trough = last_high[trough, cols]
+        peak_idx = (valid & (position == at_trough) & (rows <= trough)).argmax(axis=0)
+
+        # first period after the trough back at (or above) the peak
+        recovered = valid & ~underwater & (rows > trough)
+        has_recovered = recovered.any(axis=0) | (max_drawdown == 0)
+        recovery_idx = np.where(max_drawdown == 0, trough, recovered.argmax(axis=0))
+        time_to_recovery = np.where(has_recovered, position[recovery_idx, cols] - position[trough, cols], np.nan)
+
+        def _dates(idx, mask=None):
+            mask = np.ones(len(idx), dtype=bool) if mask is None else mask
+            if dates is None:
+                return np.where(mask, idx, -1)
+            return pd.Index(dates[idx]).where(mask)
+
+        return pd.DataFrame({
+            "Maximum Drawdown": max_drawdown,
+            "Drawdown Duration": duration,
+            "Time to Recovery": time_to_recovery,
+            "Peak Date": _dates(peak_idx),
+            "Trough Date": _dates(trough),
+            "Recovery Date": _dates(recovery_idx, has_recovered),
+        }, index=names)
+    except Exception as e:
+        logger_drawdown.info(f"problem {e} in drawdown_analytics() at line no.={get_exception_line_no()}")
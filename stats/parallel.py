@@ -0,0 +1,109 @@
+import os
+import numpy as np
+import pandas as pd
+
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from stats.cross_section import getCrossSectionalstats
+from logger._logger import logger, get_exception_line_no
+
+logger_parallel = logger.getLogger("parallel")
+
+
+def _to_shared(values:np.ndarray) -> tuple:
+    """
+    Copy an array into a new shared memory block. Returns the block and the spec workers attach with.
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    shared = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+    shared[:] = values
+    return block, (block.name, values.shape, values.dtype.str)
+
+
+def _from_shared(spec:tuple) -> tuple:
+    """
+    Attach to a shared memory block created by ``_to_shared``. Returns the block and a zero-copy array view.
+    """
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _stats_worker(prices_spec:tuple, prices_index:pd.Index, daily_spec:tuple, daily_index:pd.Index, columns:list,
+                  start:int, stop:int, frequency:str, baseline:pd.Series) -> pd.DataFrame:
+    """
+    Compute the stats of the tickers in columns [start, stop) from the shared price matrices.
+    """
+    prices_block, prices = _from_shared(prices_spec)
+    daily_block, daily = _from_shared(daily_spec) if daily_spec is not None else (None, None)
+    try:
+        shard = pd.DataFrame(prices[:, start:stop], index=prices_index, columns=columns, copy=False)
+        daily_shard = pd.DataFrame(daily[:, start:stop], index=daily_index, columns=columns, copy=False) if daily is not None else None
+
+        return getCrossSectionalstats(shard, frequency=frequency, daily_prices=daily_shard, baseline=baseline)
+    finally:
+        # views into the shared buffers have to be released before the blocks can be closed
+        shard = daily_shard = prices = daily = None
+        for block in (prices_block, daily_block):
+            if block is not None:
+                block.close()
+
+
+def parallel_cross_sectional_stats(prices:pd.DataFrame, frequency:str="M", daily_prices:pd.DataFrame=None, baseline:pd.Series=None,
+                                   workers:int=None) -> pd.DataFrame:
+    """
+    Calculate ``getCrossSectionalstats`` with the tickers sharded across a pool of processes.
+
+    The resampled and daily price matrices are placed in shared memory once; every worker attaches to them and
+    works on a contiguous block of columns, so only the column bounds (not the prices) are pickled per task.
+
+    :param prices: Resampled prices, indexed by date with one column per ticker.
+    :type prices: pd.DataFrame
+
+    :param frequency: The frequency of ``prices`` (e.g., "M" for monthly).
+    :type frequency: str, optional
+
+    :param daily_prices: Un-resampled prices used for the beta calculation (optional).
+    :type daily_prices: pd.DataFrame, optional
+
+    :param baseline: Un-resampled baseline index prices used for the beta calculation (optional).
+    :type baseline: pd.Series, optional
+
+    :param workers: The number of worker processes (default: the number of CPUs). With 1 worker the stats are
+                    computed in the calling process.
+    :type workers: int, optional
+
+    :return: The same table as ``getCrossSectionalstats``.
+    :rtype: pd.DataFrame
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or prices.shape[1] < 2 * workers:
+        return getCrossSectionalstats(prices, frequency=frequency, daily_prices=daily_prices, baseline=baseline)
+
+    blocks = []
+    try:
+        columns = list(prices.columns)
+        block, prices_spec = _to_shared(prices.to_numpy(dtype=np.float64))
+        blocks.append(block)
+
+        daily_spec, daily_index = None, None
+        if daily_prices is not None:
+            daily_prices = daily_prices.reindex(columns=columns)
+            block, daily_spec = _to_shared(daily_prices.to_numpy(dtype=np.float64))
+            blocks.append(block)
+            daily_index = daily_prices.index
+
+        # one contiguous block of tickers per worker
+        bounds = np.linspace(0, len(columns), workers + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_stats_worker, prices_spec, prices.index, daily_spec, daily_index, columns[start:stop],
+                                       start, stop, frequency, baseline) for start, stop in zip(bounds[:-1], bounds[1:])]
+            shards = [future.result() for future in futures]
+
+        return pd.concat(shards)
+    except Exception as e:
+        logger_parallel.info(f"problem {e} in parallel_cross_sectional_stats() at line no.={get_exception_line_no()}")
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
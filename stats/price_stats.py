@@ -1,13 +1,15 @@
 import numpy as np
 import pandas as pd
-import scipy.stats
 
-from scipy.stats import norm
-from scipy.optimize import minimize
+from stats.drawdown import running_peak
 from logger._logger import logger, get_exception_line_no
 
 logger_stats = logger.getLogger("stats")
 
+# days spanned by one period and periods per year for each resampling frequency
+TIME_TRACKER = {"D":1, "M":30, "Q":90, "W":7, "Y":365}
+PERIODS_PER_YEAR = {"D":252, "M":12, "Q":4, "W":52, "Y":1}
+
 
 def skewness(r:pd.Series) -> float:
     """
@@ -44,7 +46,9 @@ def is_normal(r, level=0.01) -> bool:
     if isinstance(r, pd.DataFrame):
         return r.aggregate(is_normal)
     else:
-        statistic, p_value = scipy.stats.jarque_bera(r)
+        from scipy.stats import jarque_bera  # scipy.stats is slow to import, only loaded when used
+
+        statistic, p_value = jarque_bera(r)
         return p_value > level
 
 
@@ -81,6 +85,8 @@ def var_gaussian(r:pd.Series, level=5, modified=False) -> float:
     If "modified" is True, then the modified VaR is returned,
     using the Cornish-Fisher modification
     """
+    from scipy.stats import norm  # scipy.stats is slow to import, only loaded when used
+
     # compute the Z score assuming it was Gaussian
     z = norm.ppf(level/100)
     if modified:
@@ -116,16 +122,17 @@ def getPricestats(df:pd.DataFrame, frequency="M", date_col="Date", price_col="Ad
     :type price_col: str, optional
 
     :return: A tuple containing various price statistics including start date, end date, number of periods,
-             annual return, annual volatility, Sharpe ratio, maximum drawdown, Value at Risk (VaR), Conditional
-             Value at Risk (CVaR), the last one-period change, highest price, lowest price, and current price.
+             annual return, annual volatility, Sharpe ratio, maximum drawdown (``price / peak - 1``), Value at Risk
+             (VaR), Conditional Value at Risk (CVaR), the last one-period change, highest price, lowest price, and
+             current price.
     :rtype: tuple
     """
     try:
         # Will work on a copy of the sent df
         _df = df.copy()
         
-        time_tracker = {"D":1, "M":30, "Q":90, "W":7, "Y":365}
-        multiplier = {"D":252, "M":12, "Q":4, "W":5, "Y":1}
+        time_tracker = TIME_TRACKER
+        multiplier = PERIODS_PER_YEAR
 
         # calculate stats
         startDate, endDate = _df[date_col].iloc[0], _df[date_col].iloc[-1]
@@ -143,17 +150,11 @@ def getPricestats(df:pd.DataFrame, frequency="M", date_col="Date", price_col="Ad
         sharpe = annual_ret / annual_vol
 
         # Drawdown
-        inv = pd.Series(_df[price_col].values)
-
-        z = pd.Series(index=range(len(inv)))
-        z.iloc[0] = inv.iloc[0]
-
-        for i in range(1, len(inv)):
-            z.iloc[i] = max(inv[i], z[i-1])
+        inv = _df[price_col].to_numpy(dtype=np.float64)
+        z = running_peak(inv)
 
-        # Maximum Drawdown
-        drawdowns = (inv - z)
-        max_drawdown = drawdowns.min() / z.iloc[0]
+        # Maximum Drawdown, relative to the running peak
+        max_drawdown = np.nanmin(inv / z - 1)
 
         # last 1 period change
         ret_1_ch = _df[price_col].pct_change().fillna(0).iloc[-1]
@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+from stats.price_stats import PERIODS_PER_YEAR
+from stats.drawdown import forward_fill
+from logger._logger import logger, get_exception_line_no
+
+logger_rolling = logger.getLogger("rolling")
+
+
+def rolling_sum(values:np.ndarray, window:int) -> np.ndarray:
+    """
+    Sum over the trailing ``window`` rows of every column, from one cumulative sum (NaNs count as 0).
+    """
+    total = np.cumsum(np.nan_to_num(values, nan=0.0), axis=0, dtype=np.float64)
+    total[window:] = total[window:] - total[:-window]
+    return total
+
+
+def _returns(values:np.ndarray) -> np.ndarray:
+    """
+    Simple returns of forward-filled prices (a missing bar is a zero return, as with ``pct_change``); the first
+    row is NaN.
+    """
+    filled = forward_fill(np.asarray(values, dtype=np.float64))
+    returns = np.full(filled.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = filled[1:] / filled[:-1] - 1
+    return returns
+
+
+def _moments(returns:np.ndarray, window:int, min_periods:int) -> tuple:
+    """
+    Rolling count, mean and population variance of every column, NaN where the window has too few returns.
+    """
+    valid = ~np.isnan(returns)
+    n = rolling_sum(valid, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = rolling_sum(returns, window) / n
+        variance = np.maximum(rolling_sum(returns * returns, window) / n - mean ** 2, 0)
+
+    short = n < min_periods
+    mean[short], variance[short] = np.nan, np.nan
+    return n, mean, variance
+
+
+def rolling_volatility(prices:pd.DataFrame, window:int, frequency:str="D", min_periods:int=None) -> pd.DataFrame:
+    """
+    Annualised volatility of the returns over the trailing ``window`` periods, for every ticker.
+    """
+    _, _, variance = _moments(_returns(prices.to_numpy()), window, min_periods or window)
+    return pd.DataFrame(np.sqrt(variance) * np.sqrt(PERIODS_PER_YEAR[frequency]), index=prices.index, columns=prices.columns)
+
+
+def rolling_sharpe(prices:pd.DataFrame, window:int, frequency:str="D", min_periods:int=None) -> pd.DataFrame:
+    """
+    Annualised Sharpe ratio (mean over volatility of the returns) over the trailing ``window`` periods.
+    """
+    _, mean, variance = _moments(_returns(prices.to_numpy()), window, min_periods or window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / np.sqrt(variance) * np.sqrt(PERIODS_PER_YEAR[frequency])
+    return pd.DataFrame(sharpe, index=prices.index, columns=prices.columns)
+
+
+def rolling_beta(prices:pd.DataFrame, baseline:pd.Series, window:int, min_periods:int=None) -> pd.DataFrame:
+    """
+    Beta against the baseline over the trailing ``window`` periods, for every ticker.
+
+    The baseline is aligned to the dates of ``prices``; each window only uses the periods where both the
+    ticker and the baseline have a return.
+    """
+    returns = _returns(prices.to_numpy())
+    base = _returns(baseline.reindex(prices.index).to_numpy()[:, None])
+
+    both = ~np.isnan(returns) & ~np.isnan(base)
+    x, y = np.where(both, returns, 0.0), np.where(both, base, 0.0)
+
+    n = rolling_sum(both, window)
+    sum_x, sum_y = rolling_sum(x, window), rolling_sum(y, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = rolling_sum(x * y, window) - sum_x * sum_y / n
+        variance = rolling_sum(y * y, window) - sum_y ** 2 / n
+        beta = covariance / variance
+
+    beta[n < (min_periods or window)] = np.nan
+    return pd.DataFrame(beta, index=prices.index, columns=prices.columns)
+
+
+def rolling_max_drawdown(prices:pd.DataFrame, window:int, min_periods:int=None) -> pd.DataFrame:
+    """
+    Maximum drawdown (``price / peak - 1``, peak within the window) over the trailing ``window`` periods.
+
+    The rows are cut into blocks of ``window`` rows, so any window is the suffix of one block followed by the
+    prefix of the next. Prefix and suffix running max / min / drawdown are accumulated once per block, and the
+    drawdown of a window is the worst of the suffix, the prefix and the fall from the suffix peak to the prefix
+    trough; every window costs O(1) on top of an O(n) pass.
+    """
+    values = forward_fill(prices.to_numpy(dtype=np.float64))
+    rows, columns = values.shape
+    blocks = -(-rows // window)
+
+    padded = np.full((blocks * window, columns), np.nan)
+    padded[:rows] = values
+    padded = padded.reshape(blocks, window, columns)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # forward within every block
+        prefix_peak = np.fmax.accumulate(padded, axis=1)
+        prefix_trough = np.fmin.accumulate(padded, axis=1)
+        prefix_drawdown = np.fmin.accumulate(padded / prefix_peak - 1, axis=1)
+
+        # backward within every block; the drawdown of a suffix is the worst fall from any of its prices
+        reverse = padded[:, ::-1]
+        suffix_peak = np.fmax.accumulate(reverse, axis=1)[:, ::-1]
+        suffix_trough = np.fmin.accumulate(reverse, axis=1)[:, ::-1]
+        suffix_drawdown = np.fmin.accumulate((suffix_trough / padded - 1)[:, ::-1], axis=1)[:, ::-1]
+
+        prefix_peak, prefix_trough, prefix_drawdown = (a.reshape(-1, columns)[:rows] for a in (prefix_peak, prefix_trough, prefix_drawdown))
+        suffix_peak, suffix_drawdown = (a.reshape(-1, columns)[:rows] for a in (suffix_peak, suffix_drawdown))
+
+        # window [end - window + 1, end]: suffix from its start, prefix up to its end
+        drawdown = np.full((rows, columns), np.nan)
+        end = np.arange(window - 1, rows)
+        start = end - window + 1
+        aligned = (start % window == 0)[:, None]
+
+        across = np.where(aligned, np.nan, prefix_trough[end] / suffix_peak[start] - 1)
+        drawdown[end] = np.fmin(np.fmin(suffix_drawdown[start], np.where(aligned, np.nan, prefix_drawdown[end])), across)
+
+    drawdown[rolling_sum(~np.isnan(values), window) < (min_periods or window)] = np.nan
+    return pd.DataFrame(drawdown, index=prices.index, columns=prices.columns)
+
+
+def rolling_stats(prices:pd.DataFrame, window:int, frequency:str="D", baseline:pd.Series=None, min_periods:int=None) -> dict:
+    """
+    Calculate the rolling analytics of every ticker of a dates x tickers price matrix at once.
+
+    :param prices: Prices, indexed by date with one column per ticker.
+    :type prices: pd.DataFrame
+
+    :param window: The number of periods in each window.
+    :type window: int
+
+    :param frequency: The frequency of ``prices`` (e.g., "D" for daily), used to annualise.
+    :type frequency: str, optional
+
+    :param baseline: The baseline index prices, for the rolling beta (optional).
+    :type baseline: pd.Series, optional
+
+    :param min_periods: The minimum number of observations in a window to produce a value (default: the window).
+    :type min_periods: int, optional
+
+    :return: A dictionary mapping 'Annual Volatility', 'Sharpe Ratio', 'Maximum Drawdown' and, with a baseline,
+             'Beta' to a dates x tickers DataFrame.
+    :rtype: dict
+    """
+    try:
+        stats = {'Annual Volatility': rolling_volatility(prices, window, frequency=frequency, min_periods=min_periods),
+                 'Sharpe Ratio': rolling_sharpe(prices, window, frequency=frequency, min_periods=min_periods),
+                 'Maximum Drawdown': rolling_max_drawdown(prices, window, min_periods=min_periods)}
+        if baseline is not None:
+            stats['Beta'] = rolling_beta(prices, baseline, window, min_periods=min_periods)
+        return stats
+    except Exception as e:
+        logger_rolling.info(f"problem {e} in rolling_stats() at line no.={get_exception_line_no()}")
+
+
+def trend(metric:pd.DataFrame, lookback:int) -> pd.DataFrame:
+    """
+    How a rolling metric moved over its last ``lookback`` periods, for every ticker.
+
+    :param metric: A dates x tickers rolling metric (e.g. the 'Beta' of ``rolling_stats``).
+    :type metric: pd.DataFrame
+
+    :param lookback: The number of periods to look back.
+    :type lookback: int
+
+    :return: A DataFrame indexed by ticker with the metric 'Then', 'Now' and the 'Change'. Tickers without a
+             value at both ends are dropped.
+    :rtype: pd.DataFrame
+    """
+    values = metric.to_numpy()
+    then, now = values[-1 - lookback], values[-1]
+    return pd.DataFrame({'Then': then, 'Now': now, 'Change': now - then}, index=metric.columns).dropna()
+
+
+def rising(metric:pd.DataFrame, lookback:int, threshold:float=0.0, falling:bool=False) -> pd.DataFrame:
+    """
+    The tickers whose rolling metric rose (or fell) by more than ``threshold`` over the last ``lookback`` periods,
+    e.g. beta rising over the last 60 days. The steepest moves come first.
+    """
+    moves = trend(metric, lookback)
+    if falling:
+        return moves[moves['Change'] < -threshold].sort_values('Change')
+    return moves[moves['Change'] > threshold].sort_values('Change', ascending=False)
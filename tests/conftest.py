@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import pytest
+
+# test runs log to a temporary directory, set before the first import of the logger
+os.environ.setdefault("ALPHA_TRACKER_LOG_PATH", os.path.join(tempfile.gettempdir(), "alpha_tracker_logs"))
+
+# the packages live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_prices(tickers:int=12, days:int=400, seed:int=0, gaps:bool=False) -> pd.DataFrame:
+    """
+    Business-day random walk prices, one column per ticker. With ``gaps`` some tickers list late and some
+    bars are missing.
+    """
+    random = np.random.default_rng(seed)
+    drift, volatility = random.uniform(-0.0005, 0.001, tickers), random.uniform(0.01, 0.03, tickers)
+    market = random.normal(0, 0.01, (days, 1))
+    returns = drift + volatility * random.normal(0, 1, (days, tickers)) + random.uniform(0.2, 1.2, tickers) * market
+    values = 100 * np.cumprod(1 + returns, axis=0)
+
+    if gaps:
+        values[random.random(values.shape) < 0.03] = np.nan
+        for column in range(0, tickers, 4):
+            values[:random.integers(20, days // 2), column] = np.nan
+
+    dates = pd.bdate_range("2022-01-03", periods=days, name="Date")
+    return pd.DataFrame(values, index=dates, columns=[f"T{number}" for number in range(tickers)])
+
+
+def long_prices(prices:pd.DataFrame) -> pd.DataFrame:
+    """
+    The long layout of the downloader (one row per date and ticker) with every price column set to the price.
+    """
+    from dataloader.price_store import PRICE_DTYPES
+
+    frames = [pd.DataFrame({column: prices[ticker] for column in PRICE_DTYPES}).dropna().assign(TIC=ticker) for ticker in prices.columns]
+    return pd.concat(frames)
+
+
+@pytest.fixture
+def prices() -> pd.DataFrame:
+    return make_prices()
+
+
+@pytest.fixture
+def gappy_prices() -> pd.DataFrame:
+    return make_prices(gaps=True)
+
+
+def load_screener(market, index:str="NIFTY_50", lookback:int=400):
+    """
+    A loaded MarketScreener of a synthetic market, with its own session cache.
+    """
+    from screener.investor import MarketScreener
+    from screener.session_cache import SessionCache
+
+    investor = MarketScreener(index, lookback=lookback, cache=SessionCache(), fetch_fn=market, tickers=market.tickers)
+    investor._select_index()
+    return investor
+
+
+@pytest.fixture
+def market(tmp_path, monkeypatch):
+    """
+    A small synthetic market; the screeners write their ./data under a temporary working directory.
+    """
+    from benchmarks.synthetic import SyntheticMarket
+
+    monkeypatch.chdir(tmp_path)
+    return SyntheticMarket(8, 300, seed=1)
@@ -0,0 +1,65 @@
+import json
+import pandas as pd
+import pytest
+
+import cli
+from utils.global_variables import INDEXES
+from conftest import load_screener
+
+
+def test_parse_args_expands_all_and_normalises_tickers():
+    args = cli.parse_args(["corr", "--index", "all", "--tickers", "tcs.ns", "infy.ns"])
+
+    assert args.index == INDEXES
+    assert args.tickers == ["TCS.NS", "INFY.NS"]
+
+    args = cli.parse_args(["sweep", "--index", "SP500", "SP500", "--tickers", "aapl"])
+    assert args.index == ["SP500"]
+    assert args.lookbacks == [] and args.sweep_workers is None
+
+
+def test_parse_args_rejects_unknown_choices():
+    with pytest.raises(SystemExit):
+        cli.parse_args(["allocate", "--cash", "100", "--method", "unknown"])
+
+
+def test_screen_keeps_the_rows_matching_the_filter(market):
+    investor = load_screener(market)
+
+    stats = cli.run_command("all-stats", investor, {'frequency': "W"})
+    screened = cli.run_command("screen", investor, {'frequency': "W", 'filter': "SR > 0"})
+
+    assert list(screened.index) == list(stats.index[stats['Sharpe Ratio'].astype(float) > 0])
+    assert list(cli.run_command("regression", investor, {'frequency': "W"}).index) == list(stats.index)
+
+    with pytest.raises(ValueError):
+        cli.run_command("unknown", investor, {'frequency': "W"})
+
+
+@pytest.mark.parametrize("file_format", ["csv", "json"])
+def test_write_result_round_trip(tmp_path, file_format):
+    df = pd.DataFrame({'Sharpe Ratio': [0.5, -0.2]}, index=["A", "B"])
+
+    path = cli.write_result(df, "all-stats", "NSE/BSE", output=str(tmp_path), file_format=file_format)
+
+    assert path.startswith(str(tmp_path / "NSEBSE_all-stats_"))
+    if file_format == "json":
+        assert [row['Sharpe Ratio'] for row in json.load(open(path))] == [0.5, -0.2]
+    else:
+        pd.testing.assert_frame_equal(pd.read_csv(path, index_col=0), df)
+
+
+def test_main_reports_the_failed_indexes(monkeypatch, capsys):
+    def run_index(command, index, options):
+        if index == "SP500":
+            raise ValueError(f"{command} returned no result, see the logs")
+        return f"{index}.csv"
+
+    monkeypatch.setattr(cli, "run_index", run_index)
+
+    assert cli.main(["baseline", "--index", "NIFTY_50", "--workers", "1"]) == 0
+    assert cli.main(["baseline", "--index", "NIFTY_50", "SP500", "--workers", "1"]) == 1
+
+    out, err = capsys.readouterr()
+    assert "NIFTY_50: NIFTY_50.csv" in out
+    assert "SP500: failed" in err
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from stats.correlation import blockwise_matrix, simple_returns
+
+
+@pytest.mark.parametrize("statistic, method", [("correlation", "corr"), ("covariance", "cov")])
+@pytest.mark.parametrize("block_size", [3, 5, 512])
+def test_matches_pairwise_complete_pandas(gappy_prices, statistic, method, block_size):
+    returns = gappy_prices.pct_change(fill_method=None)
+    matrix = blockwise_matrix(returns.to_numpy(), statistic=statistic, block_size=block_size,
+                              out=np.empty((returns.shape[1],) * 2))
+
+    np.testing.assert_allclose(matrix, getattr(returns, method)().to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_min_periods_and_simple_returns():
+    prices = np.array([[1.0, 2.0], [1.1, np.nan], [1.21, np.nan], [1.1, 2.2]])
+    returns = simple_returns(prices)
+
+    np.testing.assert_allclose(returns[:, 0], [0.1, 0.1, 1.1 / 1.21 - 1])
+    assert np.isnan(returns[:, 1]).all()
+
+    matrix = blockwise_matrix(returns, min_periods=2)
+    assert matrix[0, 0] == 1 and np.isnan(matrix[0, 1]) and np.isnan(matrix[1, 1])
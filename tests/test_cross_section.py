@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stats.price_stats import getPricestats
+from stats.cross_section import getCrossSectionalstats, index_regression, period_returns
+
+STATS = ["Periods", "Annual Return", "Annual Volatility", "Sharpe Ratio", "Maximum Drawdown", "VaR", "cVaR",
+         "1 Period Change", "Highest Peak", "Lowest Trough", "Current Price"]
+
+
+@pytest.mark.parametrize("frequency", ["D", "W", "M"])
+def test_matches_per_ticker_price_stats(gappy_prices, frequency):
+    prices = gappy_prices.resample(frequency).last().dropna(how="all") if frequency != "D" else gappy_prices
+    stats = getCrossSectionalstats(prices, frequency=frequency)
+
+    for ticker in prices.columns:
+        single = prices[[ticker]].dropna().reset_index()
+        expected = getPricestats(single, frequency=frequency, date_col="Date", price_col=ticker)
+        start, end, periods, _, *values = expected
+
+        assert stats.loc[ticker, "Start Date"] == start
+        assert stats.loc[ticker, "End Date"] == end
+        np.testing.assert_allclose(stats.loc[ticker, STATS].to_numpy(dtype=float), [periods] + values, rtol=1e-12)
+
+
+def test_index_regression_annualises_weekly_with_52_periods(prices):
+    weekly = prices.resample("W").last()
+    returns = pd.DataFrame(period_returns(weekly.to_numpy()), index=weekly.index, columns=weekly.columns)
+    baseline = returns.mean(axis=1)
+    regression = index_regression(returns, baseline, frequency="W")
+
+    ticker = returns.columns[0]
+    both = pd.concat([returns[ticker], baseline], axis=1).dropna()
+    beta = both.cov().iloc[0, 1] / baseline.dropna().var()
+    alpha = (both.iloc[:, 0].mean() - beta * both.iloc[:, 1].mean()) * 52
+    tracking_error = (both.iloc[:, 0] - both.iloc[:, 1]).std() * np.sqrt(52)
+
+    np.testing.assert_allclose(regression.loc[ticker, ["Beta", "Alpha", "Tracking Error"]].to_numpy(dtype=float),
+                               [beta, alpha, tracking_error], rtol=1e-10)
+
+
+def test_maximum_drawdown_spans_its_peak_and_trough(gappy_prices):
+    stats = getCrossSectionalstats(gappy_prices, frequency="D")
+
+    for ticker in gappy_prices.columns:
+        peak, trough = gappy_prices.loc[stats.loc[ticker, "Peak Date"], ticker], gappy_prices.loc[stats.loc[ticker, "Trough Date"], ticker]
+        assert stats.loc[ticker, "Maximum Drawdown"] == pytest.approx(trough / peak - 1, rel=1e-12)
+
+
+def test_weekly_volatility_agrees_with_the_rolling_metrics(prices):
+    weekly = prices.resample("W").last()
+    stats = getCrossSectionalstats(weekly, frequency="W")
+
+    returns = weekly.pct_change().fillna(0)
+    np.testing.assert_allclose(stats["Annual Volatility"].to_numpy(dtype=float), returns.std(ddof=0).to_numpy() * np.sqrt(52), rtol=1e-10)
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+import dataloader.downloader as downloader
+from dataloader.downloader import BatchDownloader, PRICE_COLUMNS
+from conftest import make_prices
+
+
+class FlakyFetch:
+    """
+    A ``fetch_fn`` that raises on its first ``errors`` calls and has no data for the ``empty`` tickers.
+    """
+
+    def __init__(self, errors:int=0, empty:tuple=()) -> None:
+        self.errors, self.empty, self.calls = errors, set(empty), []
+
+    def __call__(self, tickers, start_date, end_date) -> dict:
+        self.calls.append(list(tickers))
+        if len(self.calls) <= self.errors:
+            raise ConnectionError("connection reset")
+
+        prices = make_prices(tickers=1, days=5)['T0']
+        return {ticker: pd.DataFrame({column: prices for column in PRICE_COLUMNS}) for ticker in tickers if ticker not in self.empty}
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list:
+    slept = []
+    monkeypatch.setattr(downloader.time, "sleep", slept.append)
+    return slept
+
+
+def test_raising_batch_is_retried_with_backoff(sleeps):
+    fetch = FlakyFetch(errors=2)
+    data = BatchDownloader(fetch_fn=fetch, batch_size=10, max_workers=1, backoff=1.0).download(["A", "B"], "2022-01-01", "2022-02-01")
+
+    assert len(fetch.calls) == 3
+    assert sleeps == [1.0, 2.0]
+    assert list(data['TIC'].unique()) == ["A", "B"]
+
+
+def test_batch_failing_every_attempt_is_reported(sleeps):
+    fetch = FlakyFetch(errors=10)
+    loader = BatchDownloader(fetch_fn=fetch, retries=2, backoff=0.5)
+    data = loader.download(["A", "B"], "2022-01-01", "2022-02-01")
+
+    assert len(fetch.calls) == 3 and sleeps == [0.5, 1.0]
+    assert len(data) == 0
+    assert set(loader.getFailures()) == {"A", "B"} and loader.getFailures()["A"].startswith("ConnectionError")
+
+
+def test_empty_tickers_are_not_retried(sleeps):
+    fetch = FlakyFetch(empty=("B",))
+    loader = BatchDownloader(fetch_fn=fetch, batch_size=2, max_workers=1)
+    data = loader.download(["C", "B", "A"], "2022-01-01", "2022-02-01")
+
+    assert sorted(map(sorted, fetch.calls)) == [["A"], ["B", "C"]]
+    assert sleeps == []
+    assert loader.getFailures() == {"B": "no data returned"}
+    assert list(data['TIC'].unique()) == ["C", "A"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from stats.drawdown import drawdown_analytics, forward_fill, running_peak
+
+
+def brute_force(series:pd.Series) -> dict:
+    """
+    Drawdown profile of one series walking through its prices.
+    """
+    series = series.dropna()
+    peak, peak_date, worst = -np.inf, None, (0.0, None, None, None)
+    run, longest = 0, 0
+    for date, price in series.items():
+        if price >= peak:
+            peak, peak_date, run = price, date, 0
+        else:
+            run += 1
+            longest = max(longest, run)
+            if price / peak - 1 < worst[0]:
+                worst = (price / peak - 1, peak_date, date, peak)
+
+    drawdown, peak_date, trough_date, peak = worst
+    if trough_date is None:
+        return {'Maximum Drawdown': 0.0, 'Drawdown Duration': 0, 'Time to Recovery': 0.0}
+
+    after = series[series.index > trough_date]
+    recovered = after[after >= peak]
+    recovery = np.nan if recovered.empty else float(series.index.get_loc(recovered.index[0]) - series.index.get_loc(trough_date))
+    return {'Maximum Drawdown': drawdown, 'Drawdown Duration': longest, 'Time to Recovery': recovery,
+            'Peak Date': peak_date, 'Trough Date': trough_date}
+
+
+def test_matches_brute_force(gappy_prices):
+    analytics = drawdown_analytics(gappy_prices)
+
+    for ticker in gappy_prices.columns:
+        expected = brute_force(gappy_prices[ticker])
+        row = analytics.loc[ticker]
+        np.testing.assert_allclose(row['Maximum Drawdown'], expected['Maximum Drawdown'], rtol=1e-12)
+        assert row['Drawdown Duration'] == expected['Drawdown Duration']
+        np.testing.assert_equal(row['Time to Recovery'], expected['Time to Recovery'])
+        if 'Peak Date' in expected:
+            assert row['Peak Date'] == expected['Peak Date']
+            assert row['Trough Date'] == expected['Trough Date']
+
+
+def test_series_and_recovery():
+    prices = pd.Series([10, 12, 9, 6, 8, 12, 13, 11], index=pd.bdate_range("2023-01-02", periods=8), name="X")
+    row = drawdown_analytics(prices).loc["X"]
+
+    assert row['Maximum Drawdown'] == 6 / 12 - 1
+    assert row['Drawdown Duration'] == 3
+    assert row['Time to Recovery'] == 2
+    assert row['Recovery Date'] == prices.index[5]
+
+
+def test_forward_fill_and_running_peak():
+    values = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, 0.5], [1.0, 3.0]])
+
+    np.testing.assert_equal(forward_fill(values), [[np.nan, 1.0], [2.0, 1.0], [2.0, 0.5], [1.0, 3.0]])
+    np.testing.assert_equal(running_peak(values), [[np.nan, 1.0], [2.0, 1.0], [2.0, 1.0], [2.0, 3.0]])
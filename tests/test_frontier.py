@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from pypfopt import EfficientFrontier
+from portfolio_allocation.risk_model import RiskModelCache
+from portfolio_allocation.frontier import max_sharpe_weights, efficient_frontier, RISK_FREE_RATE
+from conftest import make_prices
+
+
+@pytest.fixture
+def basket():
+    # enough drift that some assets beat the risk free rate
+    prices = make_prices(tickers=8, days=500, seed=3)
+    cache = RiskModelCache()
+    return prices, cache.expected_returns(prices, frequency="D"), cache.covariance(prices, use_method="sample_cov")
+
+
+def test_long_only_matches_pypfopt(basket):
+    prices, mu, cov = basket
+    weights = max_sharpe_weights(prices, frequency="D", mu=mu, cov=cov)
+
+    expected = EfficientFrontier(mu, cov).max_sharpe()
+    np.testing.assert_allclose([weights[ticker] for ticker in mu.index], [expected[ticker] for ticker in mu.index], atol=1e-5)
+
+
+def test_unconstrained_is_the_tangency_portfolio(basket):
+    prices, mu, cov = basket
+    weights = max_sharpe_weights(prices, frequency="D", weight_bounds=None, mu=mu, cov=cov)
+
+    expected = np.linalg.solve(cov.to_numpy(), mu.to_numpy() - RISK_FREE_RATE)
+    np.testing.assert_allclose([weights[ticker] for ticker in mu.index], expected / expected.sum(), rtol=1e-9)
+
+    # no long-only portfolio has a higher Sharpe ratio
+    sharpe = lambda w: (w @ mu.to_numpy() - RISK_FREE_RATE) / np.sqrt(w @ cov.to_numpy() @ w)
+    long_only = EfficientFrontier(mu, cov).max_sharpe()
+    assert sharpe(expected / expected.sum()) >= sharpe(np.array([long_only[ticker] for ticker in mu.index]))
+
+
+def test_bounds_and_sector_caps_hold(basket):
+    prices, mu, cov = basket
+    sectors = {ticker: "A" if number % 2 == 0 else "B" for number, ticker in enumerate(mu.index)}
+    weights = max_sharpe_weights(prices, frequency="D", weight_bounds=(0, 0.3), sector_mapper=sectors,
+                                 sector_upper={"A": 0.4}, mu=mu, cov=cov)
+
+    assert sum(weights.values()) == pytest.approx(1)
+    assert max(weights.values()) <= 0.3 + 1e-6
+    assert min(weights.values()) >= -1e-9
+    assert sum(weight for ticker, weight in weights.items() if sectors[ticker] == "A") <= 0.4 + 1e-6
+
+
+def test_no_asset_above_risk_free_rate_raises(basket):
+    prices, mu, cov = basket
+    with pytest.raises(ValueError):
+        max_sharpe_weights(prices, frequency="D", mu=mu * 0 - 0.1, cov=cov)
+
+
+def test_frontier_returns_are_increasing(basket):
+    prices, _, _ = basket
+    result = efficient_frontier(prices, frequency="D", use_method="sample_cov", points=10)
+
+    frontier = result['frontier']
+    assert len(frontier) > 0
+    assert np.all(np.diff(frontier['Expected Volatility (%)'].to_numpy()) >= -0.01)
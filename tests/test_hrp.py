@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from pypfopt.hierarchical_portfolio import HRPOpt
+from portfolio_allocation.risk_model import RiskModelCache
+from portfolio_allocation.hrp import hrp_weights, recursive_bisection
+from conftest import make_prices
+
+
+@pytest.mark.parametrize("linkage_method", ["single", "ward"])
+def test_universe_matches_hrpopt(prices, linkage_method):
+    weights = hrp_weights(prices, linkage_method=linkage_method, cache=RiskModelCache())
+
+    optimizer = HRPOpt(prices.pct_change().dropna())
+    optimizer.optimize(linkage_method=linkage_method)
+    expected = optimizer.clean_weights()
+
+    assert list(weights) == sorted(weights, key=list(prices.columns).index)
+    np.testing.assert_allclose([weights[ticker] for ticker in prices.columns], [expected[ticker] for ticker in prices.columns], atol=1e-12)
+
+
+def test_subset_prunes_the_cached_tree():
+    prices = make_prices(tickers=30, seed=5)
+    cache = RiskModelCache()
+    hrp_weights(prices, cache=cache)
+    entries = len(cache._entries)
+
+    subset = list(prices.columns[::3])
+    weights = hrp_weights(prices, tickers=subset, cache=cache)
+
+    assert len(cache._entries) == entries
+    assert set(weights) == set(subset)
+    assert sum(weights.values()) == pytest.approx(1, abs=1e-4)
+
+
+def test_new_prices_rebuild_the_tree(prices):
+    cache = RiskModelCache()
+    hrp_weights(prices, cache=cache)
+    hrp_weights(prices * np.linspace(1, 2, len(prices))[:, None], cache=cache)
+
+    assert len(cache._entries) == 2
+
+
+def test_recursive_bisection_two_assets():
+    cov = np.diag([0.04, 0.01])
+    # inverse variance split for uncorrelated assets
+    np.testing.assert_allclose(recursive_bisection(cov, np.array([0, 1])), [0.2, 0.8])
@@ -0,0 +1,64 @@
+import io
+import pandas as pd
+import pytest
+
+from rich.console import Console
+from display.pager import TablePager
+
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({'Annual Return': ["12.5%", "-3.1%", "40.0%", None, "7%"],
+                         'Current Price': ["₹ 1021.3", "₹ 99.5", "₹ 250", "₹ 10", "₹ 3000"],
+                         'Sector': ["IT", "Banks", "Energy", "IT", "Auto"]},
+                        index=["A", "B", "C", "D", "E"])
+
+
+def rows(pager):
+    return [cells[0] for cells in pager._formatted(pager._order[pager.page * pager._page_size:(pager.page + 1) * pager._page_size])]
+
+
+def test_pages_and_navigation(table):
+    pager = TablePager(table, page_size=2, console=Console(file=io.StringIO()))
+
+    assert pager.pages == 3 and rows(pager) == ["A", "B"]
+    assert pager.next() and pager.next() and not pager.next()
+    assert rows(pager) == ["E"]
+    assert pager.prev() and pager.page == 1
+
+    pager.goto(10)
+    assert pager.page == 2
+    assert TablePager(table.iloc[:0], console=Console(file=io.StringIO())).pages == 1
+
+
+def test_formatted_cells_sort_by_their_number(table):
+    pager = TablePager(table, page_size=5, console=Console(file=io.StringIO()))
+
+    pager.sort("Annual Return", ascending=False)
+    assert rows(pager) == ["C", "A", "E", "B", "D"]
+
+    pager.sort(pager.column("current"))
+    assert rows(pager) == ["D", "B", "C", "A", "E"]
+
+    pager.sort(pager.column("3"))
+    assert rows(pager) == ["E", "B", "C", "A", "D"]
+    assert pager.column("volume") is None
+
+
+def test_only_visible_rows_are_formatted(table):
+    pager = TablePager(table, page_size=2, console=Console(file=io.StringIO()))
+
+    pager.show()
+    assert sorted(pager._rows) == [0, 1]
+    assert "Page 1/3 - rows 1-2 of 5" in pager._console.file.getvalue()
+
+
+def test_browse_follows_the_commands(table, monkeypatch):
+    pager = TablePager(table, page_size=2, console=Console(file=io.StringIO(), width=200))
+    commands = iter(["s annual desc", "n", "g 3", "p", "x", "q"])
+    monkeypatch.setattr("display.pager.Prompt.ask", lambda *args, **kwargs: next(commands))
+
+    pager.browse()
+
+    assert pager.sorted_by == ("Annual Return", False) and pager.page == 1
+    assert "Not a valid response" in pager._console.file.getvalue()
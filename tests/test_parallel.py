@@ -0,0 +1,16 @@
+import pandas as pd
+
+from stats.cross_section import getCrossSectionalstats
+from stats.parallel import parallel_cross_sectional_stats
+from conftest import make_prices
+
+
+def test_sharded_stats_match_the_single_process_table():
+    daily = make_prices(tickers=20, days=300, seed=2, gaps=True)
+    monthly = daily.resample("M").last()
+    baseline = daily.mean(axis=1)
+
+    expected = getCrossSectionalstats(monthly, frequency="M", daily_prices=daily, baseline=baseline)
+    sharded = parallel_cross_sectional_stats(monthly, frequency="M", daily_prices=daily, baseline=baseline, workers=3)
+
+    pd.testing.assert_frame_equal(sharded, expected, rtol=1e-12)
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from dataloader.price_panel import PricePanel, PANEL_FIELDS
+from conftest import long_prices
+
+
+def test_long_round_trip(gappy_prices):
+    data = long_prices(gappy_prices)
+    panel = PricePanel.from_long(data)
+
+    assert panel.tickers == sorted(gappy_prices.columns)
+    assert panel.dates.equals(gappy_prices.dropna(how="all").index)
+
+    back = panel.to_long()
+    expected = data.reset_index().sort_values(['TIC', 'Date'], kind="stable")
+    np.testing.assert_allclose(back['Adj Close'].to_numpy(), expected['Adj Close'].to_numpy(dtype=np.float32))
+    assert list(back['TIC'].astype(str)) == list(expected['TIC'])
+    assert list(back.columns) == PANEL_FIELDS + ['TIC']
+
+
+def test_frames_are_views_of_the_panel(prices):
+    panel = PricePanel.from_long(long_prices(prices))
+    frame = panel.frame("Close")
+
+    np.testing.assert_allclose(frame.to_numpy(), prices[panel.tickers].to_numpy(dtype=np.float32))
+    assert np.shares_memory(frame.to_numpy(), panel.column("Close", "T0"))
+    assert list(panel.frame("Close", tickers=["T5", "T2"]).columns) == ["T5", "T2"]
+    assert panel.memory_usage() < long_prices(prices).memory_usage(deep=True).sum() / 2
+
+
+def test_slice_and_history(gappy_prices):
+    panel = PricePanel.from_long(long_prices(gappy_prices))
+    part = panel.slice("2022-03-01", "2022-03-31")
+
+    assert part.dates.min() >= pd.Timestamp("2022-03-01") and part.dates.max() <= pd.Timestamp("2022-03-31")
+    np.testing.assert_allclose(panel.history("T0")['Close'].to_numpy(), gappy_prices["T0"].dropna().to_numpy(dtype=np.float32))
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from dataloader.price_store import PriceStore, PRICE_DTYPES
+from conftest import long_prices
+
+
+def test_round_trip_and_filters(tmp_path, gappy_prices):
+    store = PriceStore("NSE/BSE", root=tmp_path)
+    data = long_prices(gappy_prices)
+    store.write(data)
+
+    read = store.read()
+    assert read.dtypes.to_dict() == {**PRICE_DTYPES, 'TIC': 'category'}
+    for ticker in gappy_prices.columns:
+        stored = read[read['TIC'] == ticker]['Adj Close']
+        np.testing.assert_allclose(stored.to_numpy(), gappy_prices[ticker].dropna().to_numpy(dtype=np.float32))
+
+    subset = store.read(tickers=["T1", "T2"], start_date="2022-03-01", end_date="2022-03-31")
+    assert set(subset['TIC']) == {"T1", "T2"}
+    assert subset.index.min() >= pd.Timestamp("2022-03-01") and subset.index.max() <= pd.Timestamp("2022-03-31")
+
+    first, last = store.manifest()['tickers']["T0"]
+    assert (first, last) == (gappy_prices["T0"].first_valid_index().date().isoformat(), gappy_prices["T0"].last_valid_index().date().isoformat())
+
+
+def test_partial_write_keeps_other_tickers(tmp_path, prices):
+    store = PriceStore("NIFTY_50", root=tmp_path)
+    store.write(long_prices(prices))
+    store.write(long_prices(prices[["T3"]] * 2), tickers=["T3"])
+
+    read = store.read()
+    assert set(read['TIC']) == set(prices.columns)
+    np.testing.assert_allclose(read[read['TIC'] == "T3"]['Close'].to_numpy(), (prices["T3"] * 2).to_numpy(dtype=np.float32))
+    np.testing.assert_allclose(read[read['TIC'] == "T4"]['Close'].to_numpy(), prices["T4"].to_numpy(dtype=np.float32))
+
+
+def test_missing_store_reads_empty(tmp_path):
+    store = PriceStore("SP500", root=tmp_path)
+
+    assert not store.exists()
+    assert len(store.read()) == 0 and store.manifest()['tickers'] == {}
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypfopt import expected_returns
+from pypfopt.risk_models import risk_matrix
+from portfolio_allocation.risk_model import RiskModelCache, solve_covariance
+
+
+def test_same_shape_other_prices_is_a_miss(prices):
+    cache = RiskModelCache()
+    trended = prices * np.linspace(1, 2, len(prices))[:, None]
+
+    cache.covariance(prices, use_method="sample_cov")
+    pd.testing.assert_frame_equal(cache.covariance(trended, use_method="sample_cov"), risk_matrix(trended, method="sample_cov"))
+    pd.testing.assert_series_equal(cache.expected_returns(trended, frequency="D"), expected_returns.mean_historical_return(trended, frequency=252))
+
+
+@pytest.mark.parametrize("use_method", ["sample_cov", "semicovariance", "exp_cov"])
+def test_basket_sliced_from_a_larger_one(prices, use_method):
+    cache = RiskModelCache()
+    cache.covariance(prices, use_method=use_method)
+    basket = prices[["T3", "T1", "T7"]]
+
+    pd.testing.assert_frame_equal(cache.covariance(basket, use_method=use_method), risk_matrix(basket, method=use_method), rtol=1e-12)
+
+
+def test_solve_with_cached_factor(prices):
+    cache = RiskModelCache()
+    b = np.arange(prices.shape[1], dtype=float)
+    cov = cache.covariance(prices, use_method="sample_cov").to_numpy()
+
+    np.testing.assert_allclose(cache.solve(prices, b, use_method="sample_cov"), np.linalg.solve(cov, b), rtol=1e-8)
+    np.testing.assert_allclose(solve_covariance(cov, b), np.linalg.solve(cov, b), rtol=1e-8)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stats.rolling import rolling_beta, rolling_max_drawdown, rolling_sharpe, rolling_volatility, rising
+
+
+def brute_force_drawdown(prices:pd.DataFrame, window:int) -> pd.DataFrame:
+    """
+    Maximum drawdown of every trailing window, recomputed from scratch for each window. Missing bars carry the
+    last price, so only the rows before the first price count as missing.
+    """
+    filled = prices.ffill()
+    result = pd.DataFrame(np.nan, index=prices.index, columns=prices.columns)
+    for end in range(window - 1, len(prices)):
+        block = filled.iloc[end - window + 1:end + 1]
+        result.iloc[end] = (block / block.cummax() - 1).min()
+    result[filled.notna().rolling(window).sum() < window] = np.nan
+    return result
+
+
+@pytest.mark.parametrize("window", [1, 7, 20, 64])
+def test_rolling_drawdown_matches_brute_force(prices, window):
+    pd.testing.assert_frame_equal(rolling_max_drawdown(prices, window), brute_force_drawdown(prices, window), rtol=1e-12)
+
+
+def test_rolling_drawdown_with_gaps(gappy_prices):
+    window = 30
+    expected = brute_force_drawdown(gappy_prices, window)
+    pd.testing.assert_frame_equal(rolling_max_drawdown(gappy_prices, window, min_periods=window), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("frequency, periods", [("D", 252), ("W", 52), ("M", 12)])
+def test_rolling_volatility_and_sharpe_annualisation(prices, frequency, periods):
+    returns = prices.pct_change()
+    window = 10
+
+    volatility = returns.rolling(window).std(ddof=0) * np.sqrt(periods)
+    sharpe = returns.rolling(window).mean() / returns.rolling(window).std(ddof=0) * np.sqrt(periods)
+
+    pd.testing.assert_frame_equal(rolling_volatility(prices, window, frequency=frequency), volatility, rtol=1e-8)
+    pd.testing.assert_frame_equal(rolling_sharpe(prices, window, frequency=frequency), sharpe, rtol=1e-8)
+
+
+def test_rolling_beta_matches_pandas(prices):
+    baseline = prices.mean(axis=1)
+    window = 60
+    returns, base = prices.pct_change(), baseline.pct_change()
+    expected = returns.rolling(window).cov(base).div(base.rolling(window).var(), axis=0)
+
+    pd.testing.assert_frame_equal(rolling_beta(prices, baseline, window), expected, rtol=1e-8)
+
+
+def test_rising_and_falling():
+    metric = pd.DataFrame({'A': [1.0, 1.5, 2.0], 'B': [1.0, 0.8, 0.5], 'C': [np.nan, 1.0, 1.0]})
+
+    assert list(rising(metric, 2).index) == ['A']
+    assert list(rising(metric, 2, falling=True).index) == ['B']
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.screen_query import Screen, compile_screen, tokenize
+from utils.utils import filter_database
+
+
+@pytest.fixture
+def table() -> pd.DataFrame:
+    random = np.random.default_rng(1)
+    size = 200
+    return pd.DataFrame({'Annual Return': random.normal(10, 15, size).round(2),
+                         'Annual Volatility': random.uniform(5, 60, size).round(2),
+                         'Sharpe Ratio': random.normal(0.5, 1, size).round(2),
+                         'Beta': random.uniform(0, 2, size).round(2),
+                         '1 Month Change (%)': random.normal(0, 5, size).round(2),
+                         'Drawdown Duration (in Months)': random.integers(0, 12, size)},
+                        index=[f"T{number}" for number in range(size)])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("AV < 30", lambda df: df['Annual Volatility'] < 30),
+    ("AV < 30 AND SR > 1", lambda df: (df['Annual Volatility'] < 30) & (df['Sharpe Ratio'] > 1)),
+    ("AV < 30 SR > 1", lambda df: (df['Annual Volatility'] < 30) & (df['Sharpe Ratio'] > 1)),
+    ("AV_<_30 SR_>_1", lambda df: (df['Annual Volatility'] < 30) & (df['Sharpe Ratio'] > 1)),
+    ("AR > 10 AND (SR >= 1 OR BETA < 0.8)", lambda df: (df['Annual Return'] > 10) & ((df['Sharpe Ratio'] >= 1) | (df['Beta'] < 0.8))),
+    ("NOT BETA > 1 OR 1PC <= -2", lambda df: ~(df['Beta'] > 1) | (df['1 Month Change (%)'] <= -2)),
+    ("av between 10 and 25", lambda df: df['Annual Volatility'].between(10, 25)),
+    ("DD = 3", lambda df: df['Drawdown Duration (in Months)'] == 3),
+])
+def test_conditions_match_pandas(table, text, expected):
+    pd.testing.assert_frame_equal(compile_screen(text, "M").apply(table), table[expected(table)])
+
+
+def test_rank_after_condition(table):
+    result = Screen("AV < 40 top 5 by SR", frequency="M").apply(table)
+    expected = table[table['Annual Volatility'] < 40].sort_values('Sharpe Ratio', ascending=False, kind="stable").head(5)
+    assert list(result.index) == list(expected.index)
+
+    bottom = Screen("bottom 3 by BETA", frequency="M").apply(table)
+    assert list(bottom.index) == list(table.sort_values('Beta', kind="stable").head(3).index)
+
+
+def test_legacy_tokens_expand():
+    assert tokenize("AV_<_30%") == [("field", "AV"), ("op", "<"), ("number", 30.0)]
+
+
+@pytest.mark.parametrize("text", ["XYZ > 1", "AV <", "(AV < 30", "AV < 30 top by SR", "AV ! 3"])
+def test_invalid_screens_raise(text):
+    with pytest.raises(ValueError):
+        Screen(text, frequency="M")
+
+
+def test_filter_database_returns_none_on_invalid_screen(table):
+    assert filter_database(table, "XYZ > 1", frequency="M") is None
+    assert len(filter_database(table, ["AV", "<", "30"], frequency="M")) == (table['Annual Volatility'] < 30).sum()
+
+
+def test_nullable_durations_with_missing_recoveries(table):
+    # the stats tables hold the durations as Int64, NA while a stock has not recovered
+    table['Drawdown Duration (in Months)'] = table['Drawdown Duration (in Months)'].astype('Int64')
+    table['Time to Recovery (in Months)'] = pd.array([pd.NA if number % 3 == 0 else number % 7 for number in range(len(table))], dtype='Int64')
+    recovery = table['Time to Recovery (in Months)']
+
+    pd.testing.assert_frame_equal(Screen("TTR < 3 AND DD >= 2", frequency="M").apply(table),
+                                  table[(recovery < 3).fillna(False) & (table['Drawdown Duration (in Months)'] >= 2)])
+    assert list(Screen("bottom 4 by TTR", frequency="M").apply(table).index) == list(recovery.dropna().sort_values(kind="stable").head(4).index)
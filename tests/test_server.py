@@ -0,0 +1,66 @@
+import json
+import asyncio
+import pytest
+
+from urllib.parse import quote
+from server import ScreenerService
+from conftest import load_screener
+
+
+@pytest.fixture
+def service(market):
+    loads = []
+
+    def loader(index, lookback):
+        loads.append((index, lookback))
+        return load_screener(market, index, lookback)
+
+    service = ScreenerService(lookback=400, loader=loader, max_screeners=1)
+    service.loads = loads
+    return service
+
+
+def test_screen_endpoint_matches_the_screener(service, market):
+    status, body = asyncio.run(service.respond(f"/screen?index=NIFTY_50&frequency=W&filter={quote('SR > 0')}"))
+
+    assert status == 200
+    expected = load_screener(market).filterDatabase("SR > 0", "W")
+    assert json.loads(body)['index'] == list(expected.index)
+
+
+def test_bad_requests(service):
+    assert asyncio.run(service.respond("/unknown?index=NIFTY_50"))[0] == 404
+    assert asyncio.run(service.respond("/screen?index=NIFTY_50"))[0] == 400
+    assert asyncio.run(service.respond("/baseline?index=MOON"))[0] == 400
+    assert asyncio.run(service.respond("/trending?index=NIFTY_50&metric=alpha"))[0] == 400
+    assert service.loads == []
+
+
+def test_identical_requests_are_coalesced_and_screeners_evicted(service):
+    async def burst():
+        return await asyncio.gather(*(service.respond("/all-stats?index=NIFTY_50&frequency=W") for _ in range(5)))
+
+    statuses = [status for status, _ in asyncio.run(burst())]
+    assert statuses == [200] * 5
+    assert service.loads == [("NIFTY_50", 400)]
+    assert service.computations == 2
+
+    # max_screeners=1: a second lookback evicts the first, which is reloaded on its next request
+    asyncio.run(service.respond("/baseline?index=NIFTY_50&lookback=200"))
+    asyncio.run(service.respond("/baseline?index=NIFTY_50"))
+    assert service.loads == [("NIFTY_50", 400), ("NIFTY_50", 200), ("NIFTY_50", 400)]
+
+    health = json.loads(asyncio.run(service.respond("/health"))[1])
+    assert health['indexes'] == ["NIFTY_50"] and health['requests'] == 8
+
+
+def test_load_without_data_is_not_kept(service, market):
+    market.tickers = []
+
+    status, body = asyncio.run(service.respond("/baseline?index=NIFTY_50"))
+    assert status == 500 and "no data loaded" in json.loads(body)['error']
+    assert service._screeners == {}
+
+    # the next request retries the load
+    asyncio.run(service.respond("/baseline?index=NIFTY_50"))
+    assert len(service.loads) == 2
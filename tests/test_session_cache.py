@@ -0,0 +1,63 @@
+import threading
+import numpy as np
+import pandas as pd
+
+from dataloader.price_panel import PricePanel
+from screener.session_cache import SessionCache
+from conftest import long_prices
+
+
+def test_least_recently_used_is_evicted_first():
+    block = pd.DataFrame(np.zeros((100, 10)))
+    size = int(block.memory_usage(deep=True, index=True).sum())
+    cache = SessionCache(max_bytes=int(2.5 * size))
+
+    cache.put("a", block)
+    cache.put("b", block)
+    cache.get("a")
+    cache.put("c", block)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is block and cache.get("c") is block
+    assert cache.memory_usage() == 2 * size
+
+
+def test_shorter_lookback_is_sliced_from_a_cached_panel(prices):
+    cache = SessionCache()
+    start, end = prices.index[0], prices.index[-1]
+    cache.put_panel("NIFTY_50", start, end, {'baseline': prices[["T0"]], 'tickers': list(prices.columns),
+                                             'panel': PricePanel.from_long(long_prices(prices))})
+
+    middle = cache.get_panel("NIFTY_50", prices.index[100], prices.index[199])
+    assert middle['panel'].dates.equals(pd.DatetimeIndex(prices.index[100:200], name="Date"))
+    assert middle['baseline'].index.equals(prices.index[100:200])
+
+    assert cache.get_panel("NIFTY_50", start - pd.Timedelta(days=30), end) is None
+    assert cache.get_panel("SP500", start, end) is None
+
+
+def test_stats_are_keyed_by_frequency():
+    cache = SessionCache()
+    cache.put_stats("NIFTY_50", "2022-01-01", "2023-01-01", "M", ("visual", "filter"))
+
+    assert cache.get_stats("NIFTY_50", "2022-01-01", "2023-01-01", "M") == ("visual", "filter")
+    assert cache.get_stats("NIFTY_50", "2022-01-01", "2023-01-01", "W") is None
+
+
+def test_concurrent_access_keeps_the_size_consistent():
+    block = pd.Series(np.zeros(1000))
+    cache = SessionCache(max_bytes=20 * int(block.memory_usage(deep=True, index=True)))
+
+    def worker(offset):
+        for number in range(200):
+            cache.put((offset, number % 30), block)
+            cache.get((offset, (number * 7) % 30))
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.memory_usage() == sum(size for _, size in cache._entries.values())
+    assert cache.memory_usage() <= cache._max_bytes
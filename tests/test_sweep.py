@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from portfolio_allocation.sweep import allocation_sweep
+from portfolio_allocation.allocator import optimal_weights
+from conftest import make_prices
+
+USE_METHODS = ["sample_cov", "exp_cov"]
+
+
+@pytest.fixture
+def basket():
+    return make_prices(tickers=6, days=500, seed=3)
+
+
+def test_every_combination_is_scored(basket):
+    table = allocation_sweep(basket, frequency="D", use_methods=USE_METHODS, lookbacks=[250, None], workers=1)
+
+    assert len(table) == 2 * len(USE_METHODS) * 5
+    assert set(table['Lookback']) == {250, len(basket)}
+    assert list(table['Expected Sharpe Ratio'].dropna()) == sorted(table['Expected Sharpe Ratio'].dropna(), reverse=True)
+
+    equal = table[table['Method'] == "EQ"]
+    np.testing.assert_allclose(equal[list(basket.columns)].to_numpy(), round(100 / basket.shape[1], 2))
+
+
+def test_sweep_weights_match_single_allocations(basket):
+    table = allocation_sweep(basket, frequency="D", opt_methods=["min_vol", "kelly"], use_methods=USE_METHODS, workers=1)
+
+    for _, row in table.iterrows():
+        weights, _ = optimal_weights(basket, opt_method=row['Method'], frequency="D", use_method=row['Estimator'])
+        np.testing.assert_allclose(row[list(basket.columns)].to_numpy(dtype=float), [round(weights[ticker] * 100, 2) for ticker in basket.columns], atol=0.011)
+
+
+def test_process_pool_gives_the_same_table(basket):
+    serial = allocation_sweep(basket, frequency="D", opt_methods=["kelly", "EQ"], use_methods=USE_METHODS, workers=1)
+    pooled = allocation_sweep(basket, frequency="D", opt_methods=["kelly", "EQ"], use_methods=USE_METHODS, workers=2)
+
+    assert serial.equals(pooled)
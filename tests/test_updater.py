@@ -0,0 +1,82 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataloader.price_store import PriceStore, PRICE_DTYPES
+from dataloader.downloader import BatchDownloader
+from dataloader.updater import IncrementalUpdater, find_restated, plan_refresh
+
+
+class Provider:
+    """
+    A ``fetch_fn`` serving bars of ``prices`` over [start_date, end_date), recording every request.
+    """
+
+    def __init__(self, prices:pd.DataFrame) -> None:
+        self.prices, self.calls = prices, []
+
+    def __call__(self, tickers, start_date, end_date) -> dict:
+        self.calls.append((sorted(tickers), pd.Timestamp(start_date)))
+        window = self.prices[(self.prices.index >= pd.Timestamp(start_date)) & (self.prices.index < pd.Timestamp(end_date))]
+        return {ticker: pd.DataFrame({column: window[ticker] for column in PRICE_DTYPES}) for ticker in tickers}
+
+
+def next_day(prices:pd.DataFrame, row:int) -> pd.Timestamp:
+    return prices.index[row] + pd.Timedelta(days=1)
+
+
+def age_store(store:PriceStore) -> None:
+    # make the next refresh a new trading day
+    manifest = store.manifest()
+    manifest['updated'] = "2000-01-01"
+    with open(store._manifest_path, "w") as file:
+        json.dump(manifest, file)
+
+
+@pytest.fixture
+def updater(tmp_path, prices):
+    provider = Provider(prices.iloc[:40])
+    store = PriceStore("NIFTY_50", root=tmp_path)
+    updater = IncrementalUpdater(store=store, downloader=BatchDownloader(fetch_fn=provider, max_workers=1))
+    updater.refresh(list(prices.columns), start_date=prices.index[0], end_date=next_day(prices, 39))
+    age_store(store)
+    return updater, provider, store
+
+
+def stored_closes(data:pd.DataFrame, ticker:str) -> np.ndarray:
+    return data[data['TIC'] == ticker]['Adj Close'].to_numpy()
+
+
+def test_refresh_appends_only_the_new_bars(updater, prices):
+    updater, provider, store = updater
+    provider.prices, provider.calls = prices.iloc[:50], []
+    data = updater.refresh(list(prices.columns), start_date=prices.index[0], end_date=next_day(prices, 49))
+
+    # one window from the last stored bar, which is fetched again
+    assert provider.calls == [(sorted(prices.columns), prices.index[39])]
+    assert store.manifest()['tickers']["T0"][1] == prices.index[49].date().isoformat()
+    np.testing.assert_allclose(stored_closes(data, "T0"), prices["T0"].iloc[:50].to_numpy(dtype=np.float32))
+
+
+def test_restated_history_is_fetched_again(updater, prices):
+    updater, provider, store = updater
+
+    # a 2:1 split adjusts every bar of T1 before the split
+    restated = prices.iloc[:50].copy()
+    restated.loc[restated.index[:45], "T1"] /= 2
+    provider.prices, provider.calls = restated, []
+    data = updater.refresh(list(prices.columns), start_date=prices.index[0], end_date=next_day(prices, 49))
+
+    assert provider.calls[-1] == (["T1"], prices.index[0])
+    np.testing.assert_allclose(stored_closes(data, "T1"), restated["T1"].to_numpy(dtype=np.float32))
+    np.testing.assert_allclose(stored_closes(data, "T2"), prices["T2"].iloc[:50].to_numpy(dtype=np.float32))
+    assert find_restated(store.read(), data) == []
+
+
+def test_plan_refresh_windows():
+    manifest = {'updated': "2000-01-01", 'start': "2022-01-03", 'tickers': {"A": ["2022-01-03", "2022-03-01"]}}
+    windows = plan_refresh(manifest, ["A", "B"], "2022-01-03", "2022-04-01")
+
+    assert windows == {(pd.Timestamp("2022-03-01"), pd.Timestamp("2022-04-01")): ["A"],
+                       (pd.Timestamp("2022-01-03"), pd.Timestamp("2022-04-01")): ["B"]}
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from backtest.walk_forward import walk_forward_backtest, rebalance_points
+
+
+def test_equal_weights_walk_forward(prices):
+    cash, cost = 1e6, 0.002
+    result = walk_forward_backtest(prices, "EQ", cash=cash, rebalance="M", train_window=60, cost=cost)
+
+    points = rebalance_points(prices.index, schedule="M", start=60)
+    assert result['shares'].index.equals(prices.index[points])
+    np.testing.assert_array_equal(result['shares'].to_numpy(), np.floor(result['shares'].to_numpy()))
+    np.testing.assert_allclose(result['weights'].to_numpy(), 1 / prices.shape[1])
+
+    # between rebalances the equity moves with the shares held
+    equity, shares = result['equity'], result['shares'].reindex(result['equity'].index).ffill()
+    moves = equity.diff().iloc[1:]
+    held = (prices.loc[equity.index].diff() * shares.shift()).sum(axis=1).iloc[1:]
+    holding = ~moves.index.isin(prices.index[points])
+    np.testing.assert_allclose(moves[holding], held[holding], rtol=1e-9, atol=1e-6)
+
+    # the first rebalance spends the cash, less the costs of buying
+    assert cash * (1 - 2 * cost) - prices.iloc[points[0]].sum() <= equity.iloc[0] <= cash
+    np.testing.assert_allclose(result['costs'].iloc[0], cost * result['turnover'].iloc[0] * cash)
+
+
+def test_no_weights_is_not_a_backtest(prices):
+    assert walk_forward_backtest(prices, "EQ", train_window=60, weights_fn=lambda df, **kwargs: (None, None)) is None
+    assert walk_forward_backtest(prices.iloc[:30], "EQ", train_window=60) is None
+
+
+def test_rebalance_points_are_first_trading_days():
+    dates = pd.bdate_range("2023-01-02", "2023-04-28")
+    points = rebalance_points(dates, schedule="M", start=5)
+
+    assert list(dates[points].strftime("%Y-%m-%d")) == ["2023-02-01", "2023-03-01", "2023-04-03"]
@@ -1,3 +1,9 @@
 import os
 
-LOG_FILE_PATH = os.path.join("logger", "log")
\ No newline at end of file
+# log directory, overridable so that benchmark and test runs do not log into the repository
+LOG_FILE_PATH = os.environ.get("ALPHA_TRACKER_LOG_PATH", os.path.join("logger", "log"))
+# indexes offered by the screener
+INDEXES = ['NIFTY_50', 'NIFTY_BANK', 'NASDAQ', 'SP500', 'FTSE250', 'FTSE100', 'DOW', 'IBOVESPA', 'NSE/BSE']
+
+# currency sign of the indexes outside India (default ₹)
+CURRENCIES = {'NASDAQ': '$', 'DOW': '$', 'SP500': '$', 'FTSE100': '£', 'FTSE250': '£', 'IBOVESPA': 'R$'}
@@ -0,0 +1,99 @@
+import sys
+import threading
+import pandas as pd
+
+from collections import OrderedDict
+from logger._logger import logger, get_exception_line_no
+
+logger_memory = logger.getLogger("memory_cache")
+
+
+def memory_footprint(value) -> int:
+    """
+    Approximate memory footprint in bytes of a cached value (DataFrames, Series, objects reporting their own
+    ``memory_usage()`` such as a ``PricePanel``, and containers of them).
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    elif isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    elif callable(getattr(value, "memory_usage", None)):
+        return int(value.memory_usage())
+    elif isinstance(value, dict):
+        return sum(memory_footprint(item) for item in value.values())
+    elif isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(memory_footprint(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class MemoryCache:
+
+    def __init__(self, max_bytes:int=2 * 1024 ** 3) -> None:
+        """
+        Initialize a MemoryCache instance.
+
+        An in-process LRU cache bounded by the memory footprint of its values. When the total footprint exceeds
+        ``max_bytes`` the least recently used entries are evicted. Every access holds a lock, so one cache can be
+        shared by several threads.
+
+        :param max_bytes: The memory budget of the cache in bytes.
+        :type max_bytes: int, optional
+
+        :return: None
+        """
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+
+    def __contains__(self, key:tuple) -> bool:
+        with self._lock:
+            return key in self._entries
+
+
+    def get(self, key:tuple):
+        """
+        Get a cached value and mark it as most recently used. Returns None on a miss.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+
+    def put(self, key:tuple, value) -> None:
+        """
+        Cache a value, evicting the least recently used entries to stay within the memory budget.
+        """
+        try:
+            size = memory_footprint(value)
+            with self._lock:
+                if key in self._entries:
+                    self._size -= self._entries.pop(key)[1]
+
+                self._entries[key] = (value, size)
+                self._size += size
+
+                while self._size > self._max_bytes and len(self._entries) > 1:
+                    evicted, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._size -= evicted_size
+                    logger_memory.info(f"Evicted {evicted}, freed = {evicted_size} bytes, used = {self._size} bytes")
+        except Exception as e:
+            logger_memory.info(f"problem {e} in put() at line no.={get_exception_line_no()}")
+
+
+    def keys(self) -> list:
+        """
+        A snapshot of the cached keys, least recently used first.
+        """
+        with self._lock:
+            return list(self._entries)
+
+
+    def memory_usage(self) -> int:
+        """
+        The memory currently held by the cache in bytes.
+        """
+        return self._size
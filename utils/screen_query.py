@@ -0,0 +1,210 @@
+import re
+import operator
+import numpy as np
+import pandas as pd
+
+from functools import lru_cache
+
+# short names accepted in screens and the stats column they refer to
+FIELDS = {"AR": "Annual Return", "AV": "Annual Volatility", "SR": "Sharpe Ratio", "MDD": "Maximum Drawdown",
+          "VAR": "VaR", "CVAR": "cVaR", "HP": "Highest Peak", "LT": "Lowest Trough", "CP": "Current Price",
+          "BETA": "Beta", "1PC": "1 {period} Change (%)", "DD": "Drawdown Duration (in {periods})",
+          "TTR": "Time to Recovery (in {periods})"}
+
+OPERATORS = {">": operator.gt, "<": operator.lt, ">=": operator.ge, "<=": operator.le, "=": operator.eq, "==": operator.eq, "!=": operator.ne}
+KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "TOP", "BOTTOM", "BY"}
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<legacy>[A-Za-z0-9]+_(?:>=|<=|==|!=|>|<|=)_-?\d+(?:\.\d+)?%?)    # old style AV_<_30
+      | (?P<op>>=|<=|==|!=|>|<|=)
+      | (?P<paren>[()])
+      | (?P<word>[A-Za-z0-9_]*[A-Za-z][A-Za-z0-9_]*)
+      | (?P<number>-?\d+(?:\.\d+)?)%?
+    )""", re.VERBOSE)
+
+
+def tokenize(text:str) -> list:
+    """
+    Split a screen into (kind, value) tokens. Old style ``AV_<_30`` filters are expanded into ``AV < 30``.
+    """
+    tokens, position, text = [], 0, text.strip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Unexpected character {text[position]!r} at position {position}")
+        position = match.end()
+
+        kind = match.lastgroup
+        if kind == "legacy":
+            field, op, value = match.group(kind).rstrip("%").split("_")
+            tokens += [("field", field.upper()), ("op", op), ("number", float(value))]
+        elif kind == "word" and match.group(kind).upper() in KEYWORDS:
+            tokens.append((match.group(kind).upper(), match.group(kind).upper()))
+        elif kind == "word":
+            tokens.append(("field", match.group(kind).upper()))
+        elif kind == "number":
+            tokens.append(("number", float(match.group(kind))))
+        else:
+            tokens.append((kind, match.group(kind)))
+
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent parser for screens:
+
+        screen     := [expr] [rank]
+        expr       := term (OR term)*
+        term       := factor ([AND] factor)*          adjacent conditions are AND-ed
+        factor     := NOT factor | '(' expr ')' | FIELD op NUMBER | FIELD BETWEEN NUMBER AND NUMBER
+        rank       := (TOP | BOTTOM) NUMBER BY FIELD
+    """
+
+    def __init__(self, tokens:list) -> None:
+        self._tokens = tokens
+        self._position = 0
+
+    def _peek(self) -> str:
+        return self._tokens[self._position][0] if self._position < len(self._tokens) else None
+
+    def _take(self, kind:str):
+        if self._peek() != kind:
+            found = self._tokens[self._position][1] if self._position < len(self._tokens) else "end of screen"
+            raise ValueError(f"Expected {kind} but found {found!r}")
+        self._position += 1
+        return self._tokens[self._position - 1][1]
+
+    def parse(self) -> tuple:
+        condition = self._expr() if self._peek() not in ("TOP", "BOTTOM", None) else None
+        rank = None
+        if self._peek() in ("TOP", "BOTTOM"):
+            direction = self._take(self._peek())
+            count = int(self._take("number"))
+            self._take("BY")
+            rank = (direction, count, self._take("field"))
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected {self._tokens[self._position][1]!r}")
+        return condition, rank
+
+    def _expr(self) -> tuple:
+        node = self._term()
+        while self._peek() == "OR":
+            self._take("OR")
+            node = ("or", node, self._term())
+        return node
+
+    def _starts_factor(self) -> bool:
+        return self._peek() in ("NOT", "field") or (self._peek() == "paren" and self._tokens[self._position][1] == "(")
+
+    def _term(self) -> tuple:
+        node = self._factor()
+        while self._peek() == "AND" or self._starts_factor():
+            if self._peek() == "AND":
+                self._take("AND")
+            node = ("and", node, self._factor())
+        return node
+
+    def _factor(self) -> tuple:
+        if self._peek() == "NOT":
+            self._take("NOT")
+            return ("not", self._factor())
+        if self._peek() == "paren":
+            if self._take("paren") != "(":
+                raise ValueError("Unexpected ')'")
+            node = self._expr()
+            if self._take("paren") != ")":
+                raise ValueError("Expected ')'")
+            return node
+
+        field = self._take("field")
+        if self._peek() == "BETWEEN":
+            self._take("BETWEEN")
+            low = self._take("number")
+            self._take("AND")
+            return ("between", field, low, self._take("number"))
+        return ("cmp", field, self._take("op"), self._take("number"))
+
+
+class Screen:
+
+    def __init__(self, text:str, frequency:str="M") -> None:
+        """
+        Initialize a Screen instance.
+
+        A screen is parsed once into a condition tree and an optional ranking; ``apply`` then evaluates the
+        whole condition as a single vectorised boolean mask over the stats table.
+
+        Examples: ``AR > 10 AND (SR >= 1 OR BETA < 0.8)``, ``AV between 10 and 25 top 20 by SR``,
+        ``AV_<_30 SR_>_1`` (old style, adjacent conditions are AND-ed).
+
+        :param text: The screen.
+        :type text: str
+
+        :param frequency: The frequency of the stats table, used to resolve the period based fields (e.g. 1PC).
+        :type frequency: str, optional
+
+        :return: None
+        """
+        mapper = {"D": "Day", "M": "Month", "W": "Week", "Q": "Quarter", "Y": "Year"}
+        self._fields = {key: name.format(period=mapper[frequency], periods=mapper[frequency] + "s") for key, name in FIELDS.items()}
+        self.text = text
+        self._condition, self._rank = _Parser(tokenize(text)).parse()
+
+        # validate all fields up front
+        for field in self._used_fields(self._condition) + ([self._rank[2]] if self._rank else []):
+            self._column(field)
+
+    def _column(self, field:str) -> str:
+        if field not in self._fields:
+            raise ValueError(f"Unknown field {field!r}, use one of {', '.join(self._fields)}")
+        return self._fields[field]
+
+    def _used_fields(self, node:tuple) -> list:
+        if node is None:
+            return []
+        if node[0] in ("cmp", "between"):
+            return [node[1]]
+        return [field for child in node[1:] for field in self._used_fields(child)]
+
+    def _mask(self, node:tuple, columns:dict) -> np.ndarray:
+        kind = node[0]
+        if kind == "cmp":
+            return OPERATORS[node[2]](columns[node[1]], node[3])
+        if kind == "between":
+            return (columns[node[1]] >= node[2]) & (columns[node[1]] <= node[3])
+        if kind == "and":
+            return self._mask(node[1], columns) & self._mask(node[2], columns)
+        if kind == "or":
+            return self._mask(node[1], columns) | self._mask(node[2], columns)
+        return ~self._mask(node[1], columns)
+
+    def apply(self, df:pd.DataFrame) -> pd.DataFrame:
+        """
+        Run the screen over a stats table (e.g. ``MarketScreener._filter_data``) and return the matching rows.
+        """
+        fields = set(self._used_fields(self._condition) + ([self._rank[2]] if self._rank else []))
+        # nullable Int64 columns (durations, "not recovered" is NA) turn NA into NaN, which no comparison accepts
+        columns = {field: pd.to_numeric(df[self._column(field)], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan) for field in fields}
+
+        with np.errstate(invalid="ignore"):
+            mask = self._mask(self._condition, columns) if self._condition is not None else np.ones(len(df), dtype=bool)
+
+        if self._rank is None:
+            return df[mask]
+
+        # ranking over the rows that passed the condition
+        direction, count, field = self._rank
+        values = np.where(mask, columns[field], np.nan)
+        order = np.argsort(-values if direction == "TOP" else values, kind="stable")
+        order = order[~np.isnan(values[order])][:count]
+        return df.iloc[order]
+
+
+@lru_cache(maxsize=128)
+def compile_screen(text:str, frequency:str="M") -> Screen:
+    """
+    Parse a screen once; the compiled screen is cached so saved screens can be re-run cheaply.
+    """
+    return Screen(text, frequency=frequency)
@@ -5,6 +5,7 @@ from typing import Optional
 from rich.table import Table
 from datetime import datetime
 from rich.console import Console
+from utils.screen_query import compile_screen
 from logger._logger import logger, get_exception_line_no
 
 logger_utils = logger.getLogger("utils")
@@ -46,111 +47,17 @@ def df_to_table(
 
 
 # Database filtering and screening
-def filter_database(_temp:pd.DataFrame, filters:list, frequency:str="M") -> pd.DataFrame:
+def filter_database(_temp:pd.DataFrame, filters, frequency:str="M") -> pd.DataFrame:
     """
-    Filters Dataframe based on given filtering criteria
+    Filters Dataframe based on given filtering criteria.
+
+    The criteria are a screen such as ``AR > 10 AND (SR >= 1 OR BETA < 0.8) top 20 by SR`` (see
+    ``utils.screen_query``), given as a string or as a list of words. Old style filters like ``AV_<_30``
+    are still accepted. The screen is compiled once and evaluated as a single vectorised mask.
     """
     try:
-        temp = _temp.copy()
-
-        # Mapper
-        mapper = {"D":"Day", "M":"Month", "W":"Week", "Q":"Quarter", "Y":"Year"}
-
-        # filtering temp dataframe
-        for filt in filters:
-            facts = filt.split("_")
-            
-            # check for annual volatility condition
-            if facts[0].upper() == "AV":
-                if facts[1]==">":
-                    temp = temp[temp['Annual Volatility']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['Annual Volatility']<float(facts[2])]
-                else:
-                    temp = temp[temp['Annual Volatility']==float(facts[2])]
-
-            # check for sharpe ratio
-            elif facts[0].upper() == "SR":
-                if facts[1]==">":
-                    temp = temp[temp['Sharpe Ratio']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['Sharpe Ratio']<float(facts[2])]
-                else:
-                    temp = temp[temp['Sharpe Ratio']==float(facts[2])]
-
-            # check for max drawdown
-            elif facts[0].upper() == "MDD":
-                if facts[1]==">":
-                    temp = temp[temp['Maximum Drawdown']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['Maximum Drawdown']<float(facts[2])]
-                else:
-                    temp = temp[temp['Maximum Drawdown']==float(facts[2])]
-
-            # check for conditional VaR
-            elif facts[0].upper() == "CVAR":
-                if facts[1]==">":
-                    temp = temp[temp['cVaR']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['cVaR']<float(facts[2])]
-                else:
-                    temp = temp[temp['cVaR']==float(facts[2])]
-
-            # check for VaR
-            elif facts[0].upper() == "VAR":
-                if facts[1]==">":
-                    temp = temp[temp['VaR']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['VaR']<float(facts[2])]
-                else:
-                    temp = temp[temp['VaR']==float(facts[2])]
-
-            # check for Annual Return
-            elif facts[0].upper() == "AR":
-                if facts[1]==">":
-                    temp = temp[temp['Annual Return']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['Annual Return']<float(facts[2])]
-                else:
-                    temp = temp[temp['Annual Return']==float(facts[2])]
-
-            # check for Highest Peak
-            elif facts[0].upper() == "HP":
-                if facts[1]==">":
-                    temp = temp[temp['Highest Peak']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['Highest Peak']<float(facts[2])]
-                else:
-                    temp = temp[temp['Highest Peak']==float(facts[2])]
-
-            # check for Lowest Trough
-            elif facts[0].upper() == "LT":
-                if facts[1]==">":
-                    temp = temp[temp['Lowest Trough']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['Lowest Trough']<float(facts[2])]
-                else:
-                    temp = temp[temp['Lowest Trough']==float(facts[2])]
-
-            # check for Current Price
-            elif facts[0].upper() == "CP":
-                if facts[1]==">":
-                    temp = temp[temp['Current Price']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp['Current Price']<float(facts[2])]
-                else:
-                    temp = temp[temp['Current Price']==float(facts[2])]
-            
-            # check for 1 Period Change
-            elif facts[0].upper() == "1PC":
-                if facts[1]==">":
-                    temp = temp[temp[f'1 {mapper[frequency]} Change (%)']>float(facts[2])]
-                elif facts[1]=="<":
-                    temp = temp[temp[f'1 {mapper[frequency]} Change (%)']<float(facts[2])]
-                else:
-                    temp = temp[temp[f'1 {mapper[frequency]} Change (%)']==float(facts[2])]
-
-        return temp
+        text = filters if isinstance(filters, str) else " ".join(filters)
+        return compile_screen(text, frequency).apply(_temp)
     except Exception as e:
         logger_utils.info(f"problem {e} filter_database() at line no.={get_exception_line_no()}")
 